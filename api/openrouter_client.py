@@ -0,0 +1,437 @@
+"""
+🔱 OpenRouter Client - Sacred Async Transport
+Shared keep-alive connection pool binding the Oracle to the OpenRouter realm
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional, AsyncIterator, Awaitable, Callable
+
+import aiohttp
+
+from ..config.settings import OracleConfig
+from .resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, backoff_delay
+
+_STREAM_END = object()  # Sentinel closing a bridged stream
+CHAT_COMPLETIONS = 'chat/completions'
+HEDGE_MIN_SAMPLES = 20  # Successful requests needed before the p95 is trusted
+
+class OpenRouterError(Exception):
+    """Raised when OpenRouter answers an invocation with a non-success status"""
+
+    def __init__(self, status: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"OpenRouter returned {status}: {message}")
+        self.status = status
+        self.retry_after = retry_after
+
+class OpenRouterClient:
+    """
+    🌐 Pooled async transport for OpenRouter chat completions
+
+    The aiohttp session lives on a dedicated transport loop so every caller,
+    whichever thread or event loop it runs on, shares one keep-alive pool
+    instead of paying a TLS handshake per code scroll.
+    """
+
+    def __init__(self):
+        self.config = OracleConfig()
+        self.logger = logging.getLogger(__name__)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._start_lock = threading.Lock()
+
+        self.latency = LatencyTracker()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+        self.metrics = {
+            'requests_sent': 0,
+            'requests_failed': 0,
+            'in_flight': 0,
+            'peak_in_flight': 0,
+            'retries': 0,
+            'retry_after_waits': 0,
+            'hedges_sent': 0,
+            'hedge_wins': 0,
+            'circuit_rejections': 0
+        }
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Sacred headers attached to every OpenRouter request"""
+        return {
+            'Authorization': f'Bearer {self.config.OPENROUTER_API_KEY}',
+            'Content-Type': 'application/json',
+            'HTTP-Referer': 'https://scriptoracle.com',  # Replace with actual domain
+            'X-Title': 'Script Oracle - Divine Debugger'
+        }
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        """Start the transport loop thread on first use"""
+        if self._loop is not None:
+            return self._loop
+
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._run_loop,
+                    args=(loop,),
+                    name="openrouter-transport",
+                    daemon=True
+                )
+                self._thread.start()
+                self._loop = loop
+                self.logger.info("✨ OpenRouter transport loop started")
+
+        return self._loop
+
+    def _run_loop(self, loop: asyncio.AbstractEventLoop):
+        """Transport thread body - owns the loop for the lifetime of the process"""
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Create the pooled session lazily (must run on the transport loop)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.OPENROUTER_POOL_SIZE,
+                limit_per_host=self.config.OPENROUTER_POOL_PER_HOST,
+                keepalive_timeout=self.config.OPENROUTER_KEEPALIVE_SECONDS,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.config.OPENROUTER_TIMEOUT)
+            )
+        return self._session
+
+    async def _submit(self, coro):
+        """Run a coroutine on the transport loop and await it from the caller's loop"""
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        return await asyncio.wrap_future(future)
+
+    async def _post_chat_completion(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST /chat/completions through the shared pool"""
+        session = self._get_session()
+        start_time = time.monotonic()
+
+        self.metrics['in_flight'] += 1
+        self.metrics['peak_in_flight'] = max(self.metrics['peak_in_flight'], self.metrics['in_flight'])
+        try:
+            async with session.post(
+                f"{self.config.OPENROUTER_BASE_URL}/{CHAT_COMPLETIONS}",
+                json=payload
+            ) as response:
+                if response.status >= 400:
+                    raise OpenRouterError(
+                        response.status,
+                        await response.text(),
+                        self._parse_retry_after(response.headers.get('Retry-After'))
+                    )
+
+                body = await response.json()
+                self.metrics['requests_sent'] += 1
+                self.latency.record((time.monotonic() - start_time) * 1000)
+                return body
+
+        except Exception:
+            self.metrics['requests_failed'] += 1
+            raise
+
+        finally:
+            self.metrics['in_flight'] -= 1
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given in seconds"""
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        """Circuit breaker of one endpoint"""
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers.setdefault(endpoint, CircuitBreaker(
+                endpoint,
+                failure_threshold=self.config.OPENROUTER_CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=self.config.OPENROUTER_CIRCUIT_RESET_SECONDS
+            ))
+        return breaker
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Rate limits, server errors, timeouts and dropped connections are worth retrying"""
+        if isinstance(error, OpenRouterError):
+            return error.status in (408, 429) or error.status >= 500
+        return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+    @classmethod
+    def is_unavailable(cls, error: Exception) -> bool:
+        """
+        Whether a failed call means the service is down rather than the request wrong
+
+        Timeouts, dropped connections, rate limits, server errors and an open
+        circuit qualify; any other 4xx (a bad key, a malformed payload) is
+        the caller's to fix and does not.
+        """
+        return isinstance(error, CircuitOpenError) or cls._is_retryable(error)
+
+    def _check_circuit(self, breaker: CircuitBreaker):
+        """Fail fast while the endpoint is degraded"""
+        try:
+            breaker.check()
+        except CircuitOpenError:
+            self.metrics['circuit_rejections'] += 1
+            raise
+
+    def _retry_delay(self, attempt: int, error: Exception) -> Optional[float]:
+        """Backoff before the next attempt, or None when the error should surface now"""
+        if not self._is_retryable(error) or attempt >= self.config.OPENROUTER_RETRY_MAX_ATTEMPTS - 1:
+            return None
+
+        retry_after = getattr(error, 'retry_after', None)
+        delay = backoff_delay(
+            attempt,
+            base_delay=self.config.OPENROUTER_RETRY_BASE_DELAY_MS / 1000,
+            max_delay=self.config.OPENROUTER_RETRY_MAX_DELAY_SECONDS,
+            retry_after=retry_after
+        )
+        if delay > self.config.OPENROUTER_RETRY_MAX_DELAY_SECONDS:
+            return None  # Retry-After asks for longer than we are willing to hold the caller
+
+        self.metrics['retries'] += 1
+        if retry_after is not None:
+            self.metrics['retry_after_waits'] += 1
+        self.logger.warning(f"⏳ OpenRouter attempt {attempt + 1} failed ({error}), retrying in {delay:.2f}s")
+        return delay
+
+    def _record_outcome(self, breaker: CircuitBreaker, error: Optional[Exception] = None):
+        """Only transient failures count against the circuit - a 400 means the endpoint is up"""
+        if error is not None and self._is_retryable(error):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    async def _with_retries(self, endpoint: str, attempt_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``attempt_fn`` behind the endpoint's circuit breaker with jittered backoff"""
+        breaker = self._breaker(endpoint)
+        attempt = 0
+
+        while True:
+            self._check_circuit(breaker)
+            try:
+                result = await attempt_fn()
+            except Exception as e:
+                self._record_outcome(breaker, e)
+                delay = self._retry_delay(attempt, e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # Cancelled mid-call - a half-open probe must not stay claimed forever
+                breaker.record_abandoned()
+                raise
+
+            self._record_outcome(breaker)
+            return result
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None when hedging is off or untrained"""
+        if not self.config.OPENROUTER_HEDGE_ENABLED or len(self.latency) < HEDGE_MIN_SAMPLES:
+            return None
+        return max(self.config.OPENROUTER_HEDGE_MIN_DELAY_MS, self.latency.percentile(0.95)) / 1000
+
+    async def _hedged_chat_completion(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send the request, and a duplicate if it outlives the p95 latency
+
+        Whichever copy succeeds first wins and the other is cancelled, which
+        trims the tail at the cost of a few extra requests.
+        """
+        hedge_delay = self._hedge_delay()
+        if hedge_delay is None:
+            return await self._post_chat_completion(payload)
+
+        primary = asyncio.ensure_future(self._post_chat_completion(payload))
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        self.metrics['hedges_sent'] += 1
+        hedge = asyncio.ensure_future(self._post_chat_completion(payload))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.metrics['hedge_wins'] += 1
+                        return task.result()
+            return primary.result()  # Both copies failed - surface the original error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def chat_completion(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """⚡ Send a chat completion request and return the decoded JSON body"""
+        return await self._submit(
+            self._with_retries(CHAT_COMPLETIONS, lambda: self._hedged_chat_completion(payload))
+        )
+
+    async def _stream_chat_completion(self, payload: Dict[str, Any], deliver: Callable[[Any], None]):
+        """POST a streaming completion and hand every SSE event to ``deliver``"""
+        session = self._get_session()
+
+        self.metrics['in_flight'] += 1
+        self.metrics['peak_in_flight'] = max(self.metrics['peak_in_flight'], self.metrics['in_flight'])
+        try:
+            # A stream may legitimately outlive OPENROUTER_TIMEOUT, so bound
+            # only the connect and the silence between chunks
+            async with session.post(
+                f"{self.config.OPENROUTER_BASE_URL}/{CHAT_COMPLETIONS}",
+                json={**payload, "stream": True},
+                timeout=aiohttp.ClientTimeout(
+                    total=None,
+                    sock_connect=self.config.OPENROUTER_TIMEOUT,
+                    sock_read=self.config.OPENROUTER_STREAM_IDLE_TIMEOUT
+                )
+            ) as response:
+                if response.status >= 400:
+                    raise OpenRouterError(
+                        response.status,
+                        await response.text(),
+                        self._parse_retry_after(response.headers.get('Retry-After'))
+                    )
+
+                async for raw_line in response.content:
+                    line = raw_line.decode('utf-8').strip()
+
+                    # Skip event separators and ': OPENROUTER PROCESSING' keep-alive comments
+                    if not line.startswith('data:'):
+                        continue
+
+                    data = line[len('data:'):].strip()
+                    if data == '[DONE]':
+                        break
+
+                    deliver(json.loads(data))
+
+                self.metrics['requests_sent'] += 1
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception as e:
+            self.metrics['requests_failed'] += 1
+            deliver(e)
+
+        finally:
+            self.metrics['in_flight'] -= 1
+            deliver(_STREAM_END)
+
+    async def stream_chat_completion(self, payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        ⚡ Stream a chat completion, yielding each decoded SSE event as it arrives
+
+        Failures before the first event are retried like ``chat_completion``;
+        once output has been yielded an error is surfaced instead, since a
+        retry would repeat text the caller already has.
+        """
+        breaker = self._breaker(CHAT_COMPLETIONS)
+        attempt = 0
+
+        while True:
+            self._check_circuit(breaker)
+            yielded = False
+            try:
+                async for event in self._bridge_stream(payload):
+                    yielded = True
+                    yield event
+            except Exception as e:
+                self._record_outcome(breaker, e)
+                delay = None if yielded else self._retry_delay(attempt, e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # Cancelled, or the consumer closed the stream early - events already
+                # received still show the endpoint is up
+                if yielded:
+                    breaker.record_success()
+                else:
+                    breaker.record_abandoned()
+                raise
+
+            self._record_outcome(breaker)
+            return
+
+    async def _bridge_stream(self, payload: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Run one streaming request on the transport loop and relay its events to the caller's loop"""
+        caller_loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+
+        def deliver(item):
+            try:
+                caller_loop.call_soon_threadsafe(events.put_nowait, item)
+            except RuntimeError:
+                pass  # Caller loop already closed - nobody is listening
+
+        producer = asyncio.run_coroutine_threadsafe(
+            self._stream_chat_completion(payload, deliver), self._ensure_started()
+        )
+
+        try:
+            while True:
+                item = await events.get()
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            producer.cancel()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get transport pool metrics"""
+        return {
+            **self.metrics,
+            'pool_size': self.config.OPENROUTER_POOL_SIZE,
+            'pool_per_host': self.config.OPENROUTER_POOL_PER_HOST,
+            'latency_p50_ms': self.latency.percentile(0.5),
+            'latency_p95_ms': self.latency.percentile(0.95),
+            'hedging_enabled': self.config.OPENROUTER_HEDGE_ENABLED,
+            'circuits': {endpoint: breaker.get_metrics() for endpoint, breaker in self._breakers.items()}
+        }
+
+    def close(self):
+        """Close the pooled session and stop the transport loop"""
+        if self._loop is None:
+            return
+
+        async def _close_session():
+            if self._session is not None and not self._session.closed:
+                await self._session.close()
+
+        asyncio.run_coroutine_threadsafe(_close_session(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop = None
+        self._thread = None
+        self._session = None
+
+# Global transport instance shared by every engine in the process
+openrouter_client = OpenRouterClient()
@@ -0,0 +1,145 @@
+"""
+🔱 Transport Resilience - Sacred Wards
+Jittered retry backoff, p95 latency tracking and circuit breaking for OpenRouter
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+class CircuitOpenError(Exception):
+    """Raised without touching the network while an endpoint's circuit is open"""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit open for {endpoint}, retrying in {retry_in:.1f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+class CircuitBreaker:
+    """
+    🛡️ Per-endpoint circuit breaker
+
+    ``failure_threshold`` consecutive failures open the circuit and calls fail
+    fast for ``reset_timeout`` seconds. After that one probe is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, endpoint: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+        self.metrics = {
+            'opens': 0,
+            'rejections': 0,
+            'failures': 0,
+            'successes': 0
+        }
+
+    def allow(self) -> bool:
+        """Whether a call may go out now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            self.metrics['rejections'] += 1
+            return False
+
+    def check(self):
+        """Raise CircuitOpenError unless a call may go out"""
+        if not self.allow():
+            raise CircuitOpenError(self.endpoint, self.retry_in())
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed"""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.metrics['successes'] += 1
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.metrics['failures'] += 1
+            self._consecutive_failures += 1
+            self._probe_in_flight = False
+
+            if self.state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.metrics['opens'] += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def record_abandoned(self):
+        """A call that ended without an outcome (cancelled, stream closed) - frees the probe, counts nothing"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.metrics,
+                'state': self.state,
+                'consecutive_failures': self._consecutive_failures
+            }
+
+class LatencyTracker:
+    """Rolling window of successful request latencies"""
+
+    def __init__(self, window: int = 200):
+        self._latencies_ms: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float):
+        with self._lock:
+            self._latencies_ms.append(latency_ms)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Latency at ``fraction`` (e.g. 0.95), or None without samples"""
+        with self._lock:
+            latencies = sorted(self._latencies_ms)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+    def __len__(self) -> int:
+        return len(self._latencies_ms)
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float,
+                  retry_after: Optional[float] = None) -> float:
+    """
+    Seconds to wait before retry ``attempt`` (0-based)
+
+    Full jitter over an exponential ceiling, so synchronized clients spread
+    out; a server-provided Retry-After is a floor, with jitter added on top.
+    """
+    delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+    if retry_after is not None:
+        delay = retry_after + random.uniform(0, base_delay)
+    return delay
@@ -127,7 +127,7 @@ class SupabaseClient:
             self.logger.error(f"💀 Invocation logging failed: {e}")
             return False
 
-    async def increment_usage_count(self, user_id: str) -> bool:
+    async def increment_usage_count(self, user_id: str, amount: int = 1) -> bool:
         """Increment user's sacred usage counter"""
         try:
             # Get current usage
@@ -139,7 +139,7 @@ class SupabaseClient:
 
             # Update count
             result = self.client.table('users').update({
-                'usage_count': current_count + 1,
+                'usage_count': current_count + amount,
                 'last_used': datetime.utcnow().isoformat()
             }).eq('id', user_id).execute()
 
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+🔱 Fix Index Benchmark - Recall and latency of near-duplicate retrieval
+
+Indexes the functions of this repository (plus distractors stitched from
+their lines to reach --entries rows), then queries with lightly edited
+versions of indexed units: a renamed identifier, changed literals, an
+added comment and re-indentation. Reports recall@1 (the edited unit retrieves its
+original) and search latency for the brute-force scan and the IVF index.
+
+    python benchmarks/fix_index_benchmark.py --entries 20000 --queries 500
+"""
+
+import argparse
+import ast
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# The repository is the script_oracle package - make it importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from script_oracle.core.fix_index import FixRetrievalIndex
+from script_oracle.core.scroll_chunker import ScrollChunker
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+GROUP = {'user_id': 'benchmark', 'task_type': 'optimize', 'model': 'benchmark', 'prompt_version': 'benchmark'}
+_IDENTIFIER = re.compile(r'\b[a-z_][a-z0-9_]{3,}\b')
+
+def collect_units(min_lines: int):
+    """Function and method sources from the repository's Python and JavaScript files"""
+    chunker = ScrollChunker()
+    units = []
+    for path in sorted(REPO_ROOT.rglob('*')):
+        if path.suffix not in ('.py', '.js') or 'benchmarks' in path.parts:
+            continue
+        try:
+            source = path.read_text(encoding='utf-8')
+            if path.suffix == '.py':
+                file_units = [ast.get_source_segment(source, node) for node in ast.walk(ast.parse(source))
+                              if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
+            else:
+                file_units = [unit.source for unit in chunker.split_units(source, path.suffix)[1]
+                              if unit.kind != 'module']
+        except (OSError, UnicodeDecodeError, SyntaxError):
+            continue
+        units.extend(unit for unit in file_units if unit and unit.count('\n') + 1 >= min_lines)
+    return list(dict.fromkeys(units))
+
+def distractor(units, rng: random.Random) -> str:
+    """A unit-shaped scroll stitched from lines of several units - similar vocabulary, no duplicate"""
+    lines = []
+    for source in rng.sample(units, 4):
+        source_lines = source.splitlines()
+        start = rng.randrange(len(source_lines))
+        lines.extend(source_lines[start:start + rng.randint(3, 10)])
+    return "\n".join(lines)
+
+def rename_identifiers(source: str, rng: random.Random, count: int) -> str:
+    """Rename ``count`` distinct identifiers throughout a unit"""
+    names = sorted(set(_IDENTIFIER.findall(source)))
+    for name in rng.sample(names, min(count, len(names))):
+        source = re.sub(rf'\b{name}\b', f"{name}_{rng.randrange(1000)}", source)
+    return source
+
+def edit_unit(source: str, rng: random.Random) -> str:
+    """A near-duplicate of a unit as a user might paste it again"""
+    source = rename_identifiers(source, rng, 1)
+    source = re.sub(r'\b\d+\b', lambda m: str(int(m.group()) + rng.randrange(1, 9)), source)
+    lines = source.splitlines()
+    lines.insert(rng.randrange(1, len(lines) + 1), "    # revisited")
+    return "\n".join(line.replace("    ", "  ") for line in lines)
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def run(args):
+    rng = random.Random(args.seed)
+    units = collect_units(args.min_lines)
+    print(f"🗂️ {len(units)} distinct units in the repository")
+
+    corpus = units[:args.entries]
+    while len(corpus) < args.entries:
+        corpus.append(distractor(units, rng))
+
+    with tempfile.TemporaryDirectory() as root:
+        index = FixRetrievalIndex(Path(root), dim=args.dim, ivf_min_entries=args.ivf_min_entries,
+                                  nprobe=args.nprobe)
+
+        start_time = time.perf_counter()
+        for row, source in enumerate(corpus):
+            index.append(source, {**GROUP, 'code_hash': str(row), 'result': ''})
+        append_seconds = time.perf_counter() - start_time
+        print(f"   Indexed {len(index)} entries in {append_seconds:.1f}s "
+              f"({append_seconds / len(index) * 1000:.2f}ms per append)")
+
+        reopened = time.perf_counter()
+        index = FixRetrievalIndex(Path(root), dim=args.dim, ivf_min_entries=args.ivf_min_entries,
+                                  nprobe=args.nprobe)
+        print(f"   Reloaded from disk in {(time.perf_counter() - reopened) * 1000:.0f}ms")
+
+        targets = rng.sample(range(len(units)), min(args.queries, len(units)))
+        queries = [(str(row), edit_unit(corpus[row], rng)) for row in targets]
+
+        # Searches scan brute force until the background training lands - train here instead
+        index.train_ivf()
+
+        for mode, exact in (('brute force', True), ('ivf', False)):
+            hits, similarities, latencies = 0, [], []
+            for expected, query in queries:
+                start_time = time.perf_counter()
+                match = index.search(query, **GROUP, exact=exact)
+                latencies.append((time.perf_counter() - start_time) * 1000)
+                if match is not None and match.entry['code_hash'] == expected:
+                    hits += 1
+                    similarities.append(match.similarity)
+
+            ivf_note = f", {index.get_metrics()['ivf_lists']} lists, nprobe {args.nprobe}" if not exact else ""
+            print(f"\n   {mode.title()}{ivf_note}:")
+            print(f"      recall@1: {hits / len(queries):.1%} over {len(queries)} edited queries")
+            if similarities:
+                print(f"      similarity of hits: p5 {percentile(similarities, 0.05):.3f}, "
+                      f"median {percentile(similarities, 0.5):.3f}")
+            print(f"      latency: p50 {percentile(latencies, 0.5):.2f}ms, p95 {percentile(latencies, 0.95):.2f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Fix index recall/latency benchmark")
+    parser.add_argument('--entries', type=int, default=20000, help="Index size")
+    parser.add_argument('--queries', type=int, default=300, help="Edited units to look up")
+    parser.add_argument('--dim', type=int, default=1024)
+    parser.add_argument('--ivf-min-entries', type=int, default=4096)
+    parser.add_argument('--nprobe', type=int, default=8)
+    parser.add_argument('--min-lines', type=int, default=5, help="Skip units shorter than this")
+    parser.add_argument('--seed', type=int, default=0)
+    run(parser.parse_args())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+🔱 Packet Creation Benchmark - Cost of classifying and sealing code scrolls
+
+Builds USER_ACTION code-analysis packets around Python scrolls of growing
+size - with and without the word "password" somewhere in the code - and
+times three ways of moving one through the data flow:
+
+    keyword scan - one in-process hop as it was: str(data).lower() searched
+                   for eight keywords, the whole payload encrypted on a hit
+                   and decrypted again by the worker
+    in memory    - one in-process hop now: DataPacket.create, nothing sealed
+    sealed       - DataPacket.create then seal(), the cost at a process,
+                   disk or network boundary: top-level keys checked against
+                   the flow type's SENSITIVE_FIELDS, only those encrypted
+
+    python benchmarks/packet_creation_benchmark.py --sizes 10 100 500 --repeat 50
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# The repository is the script_oracle package - make it importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from script_oracle.utils.data_packet import DataFlowType, DataPacket
+from script_oracle.utils.encryption import sacred_encryption
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LEGACY_KEYWORDS = [
+    'payment', 'transaction', 'email', 'password', 'api_key',
+    'personal_info', 'financial_data', 'user_data'
+]
+
+def repository_source() -> str:
+    """The repository's Python lines that mention none of the keywords"""
+    return "\n".join(
+        line for path in sorted(REPO_ROOT.rglob('*.py')) if 'benchmarks' not in path.parts
+        for line in path.read_text(encoding='utf-8', errors='ignore').splitlines()
+        if not any(keyword in line.lower() for keyword in LEGACY_KEYWORDS)
+    )
+
+def scroll(source: str, size_kb: int, mention_password: bool) -> str:
+    """``source`` repeated to ``size_kb``, keyword-free unless asked for"""
+    text = (source * (size_kb * 1024 // len(source) + 1))[:size_kb * 1024]
+    if mention_password:
+        text = "def check(password):\n    return bool(password)\n" + text
+    return text
+
+def keyword_scan_hop(data):
+    """create_packet and _process_packet as they were: stringify, scan, encrypt everything on a hit, decrypt"""
+    if any(keyword in str(data).lower() for keyword in LEGACY_KEYWORDS):
+        sacred_encryption.decrypt_data(sacred_encryption.encrypt_data(data))
+        return True
+    return False
+
+def in_memory_hop(data):
+    return DataPacket.create(DataFlowType.USER_ACTION, "gui", data).encrypted
+
+def sealed(data):
+    return DataPacket.create(DataFlowType.USER_ACTION, "gui", data).seal()['encrypted']
+
+def time_ms(move, data, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        encrypted = move(dict(data))
+    return (time.perf_counter() - started) * 1000 / repeat, encrypted
+
+def main():
+    parser = argparse.ArgumentParser(description="Packet creation cost benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 500], help="Scroll sizes in KB")
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    source = repository_source()
+    print("📊 Mean cost per packet (encrypted? in brackets)")
+    print(f"   {'scroll':>8} {'password':>9} {'keyword scan':>18} {'in memory':>18} {'sealed':>18}")
+    for size_kb in args.sizes:
+        for mention_password in (False, True):
+            data = {
+                'user_id': 'benchmark',
+                'action_type': 'code_analysis',
+                'code_content': scroll(source, size_kb, mention_password),
+                'task_type': 'optimize',
+                'file_extension': '.py',
+                'stream': False,
+                'filename': 'scroll.py'
+            }
+            row = [time_ms(move, data, args.repeat) for move in (keyword_scan_hop, in_memory_hop, sealed)]
+            print(f"   {size_kb:>6}KB {'yes' if mention_password else 'no':>9} " + " ".join(
+                f"{elapsed:>10.3f}ms [{'yes' if encrypted else 'no':>3}]" for elapsed, encrypted in row
+            ))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+🔱 Packet Scheduler Benchmark - Latency per priority class under mixed load
+
+Sends a Poisson stream of critical, high and normal packets (5% / 20% / 75%
+by default) to handlers that sleep for an exponential service time, then
+reports send-to-done latency per class for two layouts with the same total
+capacity:
+
+    dedicated - the old layout: one FIFO queue and one worker per priority,
+                each with a third of the slots
+    weighted  - one PacketScheduler shared by a worker pool
+
+    python benchmarks/packet_scheduler_benchmark.py --rate 900 --duration 3
+    python benchmarks/packet_scheduler_benchmark.py --rate 1400 --duration 10   # sustained overload
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+# The repository is the script_oracle package - make it importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from script_oracle.utils.packet_scheduler import PacketScheduler, PacketWorkerPool
+
+NAMES = {2: 'critical', 1: 'high', 0: 'normal'}
+WEIGHTS = {2: 8.0, 1: 4.0, 0: 1.0}
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def arrivals(args, rng: random.Random):
+    """(offset seconds, priority, service seconds) for the whole run"""
+    mix = [(2, args.critical), (1, args.high), (0, 1.0 - args.critical - args.high)]
+    schedule, offset = [], 0.0
+    while True:
+        offset += rng.expovariate(args.rate)
+        if offset >= args.duration:
+            return schedule
+        priority = rng.choices([priority for priority, _ in mix], [share for _, share in mix])[0]
+        schedule.append((offset, priority, rng.expovariate(1000 / args.service_ms)))
+
+def run(layout: str, schedule, args):
+    latencies = {priority: [] for priority in NAMES}
+    done = threading.Event()
+    remaining = [len(schedule)]
+    lock = threading.Lock()
+
+    async def handler(item):
+        priority, sent_at, service = item
+        await asyncio.sleep(service)
+        latencies[priority].append((time.monotonic() - sent_at) * 1000)
+        with lock:
+            remaining[0] -= 1
+            if not remaining[0]:
+                done.set()
+
+    slots = args.workers * args.concurrency
+    if layout == 'dedicated':
+        schedulers = {priority: PacketScheduler({priority: 1.0}, aging_seconds=float('inf'))
+                      for priority in NAMES}
+        for priority, scheduler in schedulers.items():
+            PacketWorkerPool(scheduler, handler, workers=1, concurrency=max(1, slots // 3)).start()
+        put = lambda item: schedulers[item[0]].put(item, item[0])
+    else:
+        scheduler = PacketScheduler(WEIGHTS, aging_seconds=args.aging_ms / 1000, names=NAMES,
+                                    aging_interval=args.aging_interval)
+        PacketWorkerPool(scheduler, handler, workers=args.workers, concurrency=args.concurrency).start()
+        put = lambda item: scheduler.put(item, item[0])
+
+    started = time.monotonic()
+    for offset, priority, service in schedule:
+        delay = started + offset - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        put((priority, time.monotonic(), service))
+    done.wait()
+    elapsed = time.monotonic() - started
+
+    print(f"\n   {layout}: all {len(schedule)} packets done in {elapsed:.2f}s")
+    for priority, name in NAMES.items():
+        values = latencies[priority]
+        if values:
+            print(f"      {name:<8} n={len(values):<5} p50 {percentile(values, 0.5):8.1f}ms  "
+                  f"p95 {percentile(values, 0.95):8.1f}ms  max {max(values):8.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Data flow scheduler latency benchmark")
+    parser.add_argument('--rate', type=float, default=900, help="Packets per second")
+    parser.add_argument('--duration', type=float, default=3.0, help="Seconds of arrivals")
+    parser.add_argument('--critical', type=float, default=0.05, help="Share of critical packets")
+    parser.add_argument('--high', type=float, default=0.20, help="Share of high packets")
+    parser.add_argument('--service-ms', type=float, default=10.0, help="Mean handler time")
+    parser.add_argument('--workers', type=int, default=3)
+    parser.add_argument('--concurrency', type=int, default=3, help="Slots per worker")
+    parser.add_argument('--aging-ms', type=float, default=2000)
+    parser.add_argument('--aging-interval', type=int, default=4, help="At most one aged dequeue per this many")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    schedule = arrivals(args, random.Random(args.seed))
+    capacity = args.workers * args.concurrency * 1000 / args.service_ms
+    print(f"📊 {len(schedule)} packets at {args.rate:.0f}/s against ~{capacity:.0f}/s of capacity")
+    for layout in ('dedicated', 'weighted'):
+        run(layout, schedule, args)
+
+if __name__ == '__main__':
+    main()
@@ -25,6 +25,19 @@ class OracleConfig:
     OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY', 'your-openrouter-key')
     OPENROUTER_BASE_URL = 'https://openrouter.ai/api/v1'
     DEEPSEEK_MODEL = 'deepseek/deepseek-r1:free'
+    OPENROUTER_TIMEOUT = float(os.getenv('OPENROUTER_TIMEOUT', '30'))
+    OPENROUTER_STREAM_IDLE_TIMEOUT = float(os.getenv('OPENROUTER_STREAM_IDLE_TIMEOUT', '60'))  # Max gap between SSE chunks
+    OPENROUTER_POOL_SIZE = int(os.getenv('OPENROUTER_POOL_SIZE', '100'))  # Total open connections
+    OPENROUTER_POOL_PER_HOST = int(os.getenv('OPENROUTER_POOL_PER_HOST', '32'))
+    OPENROUTER_KEEPALIVE_SECONDS = float(os.getenv('OPENROUTER_KEEPALIVE_SECONDS', '60'))
+    STREAM_FLUSH_INTERVAL_MS = int(os.getenv('STREAM_FLUSH_INTERVAL_MS', '50'))  # Delta coalescing window
+    OPENROUTER_RETRY_MAX_ATTEMPTS = int(os.getenv('OPENROUTER_RETRY_MAX_ATTEMPTS', '3'))
+    OPENROUTER_RETRY_BASE_DELAY_MS = float(os.getenv('OPENROUTER_RETRY_BASE_DELAY_MS', '250'))
+    OPENROUTER_RETRY_MAX_DELAY_SECONDS = float(os.getenv('OPENROUTER_RETRY_MAX_DELAY_SECONDS', '10'))  # Longer Retry-After fails over
+    OPENROUTER_HEDGE_ENABLED = os.getenv('OPENROUTER_HEDGE_ENABLED', 'False').lower() == 'true'
+    OPENROUTER_HEDGE_MIN_DELAY_MS = float(os.getenv('OPENROUTER_HEDGE_MIN_DELAY_MS', '500'))  # Floor under the p95 hedge delay
+    OPENROUTER_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('OPENROUTER_CIRCUIT_FAILURE_THRESHOLD', '5'))
+    OPENROUTER_CIRCUIT_RESET_SECONDS = float(os.getenv('OPENROUTER_CIRCUIT_RESET_SECONDS', '30'))
 
     # PayPal Configuration (SANDBOX - change to LIVE for production)
     PAYPAL_MODE = os.getenv('PAYPAL_MODE', 'sandbox')  # 'sandbox' or 'live'
@@ -40,6 +53,110 @@ class OracleConfig:
     VERSION = "1.0.0"
     DEBUG_MODE = os.getenv('DEBUG_MODE', 'True').lower() == 'true'
 
+    # Data Flow Configuration
+    DATA_FLOW_WORKERS = int(os.getenv('DATA_FLOW_WORKERS', '3'))  # Worker threads, one event loop each
+    DATA_FLOW_WORKER_CONCURRENCY = int(os.getenv('DATA_FLOW_WORKER_CONCURRENCY', '16'))  # Packets in flight per worker loop
+    DATA_FLOW_PRIORITY_WEIGHTS = {  # Dequeue share per priority class when all are backlogged
+        2: float(os.getenv('DATA_FLOW_WEIGHT_CRITICAL', '8')),
+        1: float(os.getenv('DATA_FLOW_WEIGHT_HIGH', '4')),
+        0: float(os.getenv('DATA_FLOW_WEIGHT_NORMAL', '1'))
+    }
+    DATA_FLOW_AGING_MS = int(os.getenv('DATA_FLOW_AGING_MS', '2000'))  # Waited this long - may jump the weighted order
+    DATA_FLOW_AGING_INTERVAL = int(os.getenv('DATA_FLOW_AGING_INTERVAL', '4'))  # ...but at most once per this many dequeues
+    DATA_FLOW_QUEUE_CAPACITY = {  # Queued packets per priority class before new user actions are pushed back (0 = unbounded)
+        2: int(os.getenv('DATA_FLOW_CAPACITY_CRITICAL', '1000')),
+        1: int(os.getenv('DATA_FLOW_CAPACITY_HIGH', '2000')),
+        0: int(os.getenv('DATA_FLOW_CAPACITY_NORMAL', '5000'))
+    }
+    DATA_FLOW_BACKPRESSURE = os.getenv('DATA_FLOW_BACKPRESSURE', 'reject').lower()  # 'reject' or 'wait' when a class is full
+    DATA_FLOW_SEND_TIMEOUT_MS = int(os.getenv('DATA_FLOW_SEND_TIMEOUT_MS', '1000'))  # Longest a waiting send holds on
+
+    # Large Scroll Chunking Configuration
+    CHUNKING_THRESHOLD_TOKENS = int(os.getenv('CHUNKING_THRESHOLD_TOKENS', '6000'))  # Split scrolls above this
+    CHUNK_TOKEN_BUDGET = int(os.getenv('CHUNK_TOKEN_BUDGET', '3000'))
+    CHUNK_MAX_CONCURRENCY = int(os.getenv('CHUNK_MAX_CONCURRENCY', '4'))
+
+    # Incremental Re-analysis Configuration
+    INCREMENTAL_ANALYSIS_ENABLED = os.getenv('INCREMENTAL_ANALYSIS_ENABLED', 'True').lower() == 'true'
+    INCREMENTAL_MIN_TOKENS = int(os.getenv('INCREMENTAL_MIN_TOKENS', '1500'))  # Smaller files are re-analysed whole
+    INCREMENTAL_CHUNK_TOKEN_BUDGET = int(os.getenv('INCREMENTAL_CHUNK_TOKEN_BUDGET', '1500'))
+    INCREMENTAL_BOUNDARY_MODULUS = int(os.getenv('INCREMENTAL_BOUNDARY_MODULUS', '4'))  # ~1 in N units starts a section
+
+    # Local Model Configuration
+    XGBOOST_NTHREAD = int(os.getenv('XGBOOST_NTHREAD', '1'))  # Threads per predict_proba call
+    PYTORCH_MAX_BATCH_SIZE = int(os.getenv('PYTORCH_MAX_BATCH_SIZE', '32'))
+    PYTORCH_MAX_WAIT_MS = float(os.getenv('PYTORCH_MAX_WAIT_MS', '5'))  # Wait to fill a micro-batch
+    # Worker processes for feature extraction - 0 vectorizes in-process
+    PROCESS_POOL_WORKERS = int(os.getenv('PROCESS_POOL_WORKERS', str(max(0, (os.cpu_count() or 1) - 1))))
+    PROCESS_POOL_MIN_BATCH_BYTES = int(os.getenv('PROCESS_POOL_MIN_BATCH_BYTES', '16384'))  # Smaller stays in-process
+    PROCESS_POOL_START_METHOD = os.getenv('PROCESS_POOL_START_METHOD', 'spawn')
+    # torch thread pools per engine process - 0 keeps torch's default (all cores)
+    PYTORCH_NUM_THREADS = int(os.getenv('PYTORCH_NUM_THREADS', '0'))
+    PYTORCH_INTEROP_THREADS = int(os.getenv('PYTORCH_INTEROP_THREADS', '0'))
+    # Opt-in dynamic int8 quantization, served only within the accuracy budget on the held-out set
+    PYTORCH_QUANTIZE = os.getenv('PYTORCH_QUANTIZE', 'False').lower() == 'true'
+    PYTORCH_QUANTIZATION_MAX_DELTA = float(os.getenv('PYTORCH_QUANTIZATION_MAX_DELTA', '0.01'))
+    # Models to build at startup, e.g. "xgboost,pytorch" - empty means load on first use
+    ENGINE_WARMUP_MODELS = [m.strip() for m in os.getenv('ENGINE_WARMUP_MODELS', '').split(',') if m.strip()]
+    ENGINE_WARMUP_BACKGROUND = os.getenv('ENGINE_WARMUP_BACKGROUND', 'True').lower() == 'true'
+    MODEL_MANIFEST_POLL_SECONDS = float(os.getenv('MODEL_MANIFEST_POLL_SECONDS', '30'))  # 0 disables hot reload
+
+    # Concurrent invocations allowed per model (0 = uncapped)
+    MODEL_CONCURRENCY_LIMITS = {
+        'deepseek': int(os.getenv('MODEL_CONCURRENCY_DEEPSEEK', '8')),
+        'xgboost': int(os.getenv('MODEL_CONCURRENCY_XGBOOST', '4')),
+        'pytorch': int(os.getenv('MODEL_CONCURRENCY_PYTORCH', '4'))
+    }
+
+    # Project Batch Analysis Configuration
+    PROJECT_EXTENSIONS = [e.strip() for e in os.getenv('PROJECT_EXTENSIONS', '.py,.js,.jsx,.mjs,.ts,.tsx').split(',')
+                          if e.strip()]
+    PROJECT_MAX_CONCURRENT_FILES = int(os.getenv('PROJECT_MAX_CONCURRENT_FILES', '8'))
+    PROJECT_MAX_FILES = int(os.getenv('PROJECT_MAX_FILES', '5000'))
+    PROJECT_SKIP_DIRS = [d.strip() for d in os.getenv(
+        'PROJECT_SKIP_DIRS', 'node_modules,__pycache__,venv,env,build,dist,site-packages').split(',') if d.strip()]
+
+    # Prompt Compaction Configuration
+    PROMPT_COMPACTION_ENABLED = os.getenv('PROMPT_COMPACTION_ENABLED', 'True').lower() == 'true'
+    PROMPT_COMPACTION_TABLE_MIN_LINES = int(os.getenv('PROMPT_COMPACTION_TABLE_MIN_LINES', '12'))  # Data runs to elide
+    PROMPT_COMPACTION_MAX_LINE_CHARS = int(os.getenv('PROMPT_COMPACTION_MAX_LINE_CHARS', '1000'))
+
+    # Static Analysis Configuration - deterministic cleanse without a model
+    STATIC_ANALYSIS_ENABLED = os.getenv('STATIC_ANALYSIS_ENABLED', 'True').lower() == 'true'
+    STATIC_INSPECTION_CACHE_ENTRIES = int(os.getenv('STATIC_INSPECTION_CACHE_ENTRIES', '1024'))  # Per-file inspect reports
+
+    # Local-First Cascade Configuration
+    CASCADE_ENABLED = os.getenv('CASCADE_ENABLED', 'True').lower() == 'true'
+    # Tasks that try the local models first, and the confidence needed to skip DeepSeek -
+    # only tasks a local model can answer (optimize and explain always need DeepSeek)
+    CASCADE_CONFIDENCE_THRESHOLDS = {
+        'cleanse': float(os.getenv('CASCADE_THRESHOLD_CLEANSE', '0.8')),
+        'inspect': float(os.getenv('CASCADE_THRESHOLD_INSPECT', '0.8'))
+    }
+
+    # Adaptive Router Configuration
+    ROUTER_LATENCY_SLO_MS = float(os.getenv('ROUTER_LATENCY_SLO_MS', '8000'))  # p95 budget per invocation
+    ROUTER_CONFIDENCE_FLOOR = float(os.getenv('ROUTER_CONFIDENCE_FLOOR', '0.6'))
+    ROUTER_MAX_FAILURE_RATE = float(os.getenv('ROUTER_MAX_FAILURE_RATE', '0.2'))
+    ROUTER_WINDOW = int(os.getenv('ROUTER_WINDOW', '200'))  # Rolling observations per model/task/size
+    ROUTER_MIN_SAMPLES = int(os.getenv('ROUTER_MIN_SAMPLES', '5'))
+    ROUTER_EXPLORE_RATE = float(os.getenv('ROUTER_EXPLORE_RATE', '0.05'))
+    ROUTER_LOCAL_COST = float(os.getenv('ROUTER_LOCAL_COST', '0.01'))  # Relative cost of a local call
+    ROUTER_DEEPSEEK_COST_PER_1K_TOKENS = float(os.getenv('ROUTER_DEEPSEEK_COST_PER_1K_TOKENS', '1.0'))
+
+    # Result Cache Configuration
+    RESULT_CACHE_ENABLED = os.getenv('RESULT_CACHE_ENABLED', 'True').lower() == 'true'
+    RESULT_CACHE_MAX_ENTRIES = int(os.getenv('RESULT_CACHE_MAX_ENTRIES', '512'))  # In-memory LRU size
+    RESULT_CACHE_MAX_DISK_MB = int(os.getenv('RESULT_CACHE_MAX_DISK_MB', '256'))
+    RESULT_CACHE_TTL_SECONDS = float(os.getenv('RESULT_CACHE_TTL_SECONDS', '86400'))  # 0 disables expiry
+
+    # Fix Retrieval Index Configuration
+    FIX_INDEX_ENABLED = os.getenv('FIX_INDEX_ENABLED', 'True').lower() == 'true'
+    FIX_INDEX_DIM = int(os.getenv('FIX_INDEX_DIM', '1024'))  # Hashed n-gram embedding width
+    FIX_INDEX_SEED_SIMILARITY = float(os.getenv('FIX_INDEX_SEED_SIMILARITY', '0.85'))  # Show a near match as provisional
+    FIX_INDEX_IVF_MIN_ENTRIES = int(os.getenv('FIX_INDEX_IVF_MIN_ENTRIES', '4096'))  # Brute force below this
+    FIX_INDEX_NPROBE = int(os.getenv('FIX_INDEX_NPROBE', '8'))
+
     # Tier System Configuration
     TIER_LIMITS = {
         "Bronze": {
@@ -73,6 +190,10 @@ class OracleConfig:
     BASE_DIR = Path(__file__).parent.parent
     ASSETS_DIR = BASE_DIR / 'assets'
     LOGS_DIR = BASE_DIR / 'logs'
+    CACHE_DIR = BASE_DIR / 'cache'
+    MODELS_DIR = BASE_DIR / 'models'
+    PYTORCH_QUANTIZATION_HOLDOUT = Path(os.getenv('PYTORCH_QUANTIZATION_HOLDOUT',
+                                                  str(MODELS_DIR / 'pytorch_holdout.npz')))
 
     # Ensure directories exist
     LOGS_DIR.mkdir(exist_ok=True)
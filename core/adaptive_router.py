@@ -0,0 +1,273 @@
+"""
+🔱 Adaptive Router - Sacred Pathfinder
+Chooses the cheapest model that meets the latency SLO and confidence floor
+"""
+
+import logging
+import random
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .scroll_chunker import estimate_tokens
+
+# Upper token bounds of each size bucket; anything larger is "xlarge"
+SIZE_BUCKETS = (('small', 250), ('medium', 1500), ('large', 6000))
+
+# Models able to answer each task type - DeepSeek answers everything
+TASK_CANDIDATES = {
+    'cleanse': ('static', 'xgboost', 'deepseek'),
+    'inspect': ('static', 'pytorch', 'deepseek')
+}
+LOCAL_MODELS = frozenset({'static', 'xgboost', 'pytorch'})
+# Models whose answer is exact - when one is picked there is nothing to learn by exploring
+DETERMINISTIC_MODELS = frozenset({'static'})
+
+# Tokens a DeepSeek call spends beyond the scroll itself (system prompt + answer)
+DEEPSEEK_OVERHEAD_TOKENS = 600
+
+def size_bucket(code_content: str) -> str:
+    """Size bucket of a scroll by estimated tokens"""
+    tokens = estimate_tokens(code_content)
+    for name, upper in SIZE_BUCKETS:
+        if tokens <= upper:
+            return name
+    return 'xlarge'
+
+def heuristic_route(code_content: str, task_type: str) -> str:
+    """The original fixed routing rule, used until statistics exist"""
+    code_length = len(code_content)
+
+    if task_type in ["explain", "optimize"] and code_length > 500:
+        return "deepseek"  # Complex analysis needs DeepSeek
+    elif task_type == "cleanse":
+        return "static"    # Import analysis is exact from the scope tables
+    elif task_type == "inspect":
+        return "static"    # Variable analysis from the symbol tables
+    else:
+        return "deepseek"  # Default to DeepSeek for general tasks
+
+@dataclass
+class _Observation:
+    latency_ms: float
+    ok: bool
+    tokens: int
+    confidence: float
+
+@dataclass
+class RouteDecision:
+    """One routing choice and the statistics it was based on"""
+    model: str
+    task_type: str
+    size_bucket: str
+    reason: str
+    heuristic_model: str
+    estimated_cost: float
+    heuristic_estimated_cost: float
+    candidates: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form for InvocationResult.metadata['router']"""
+        return {
+            'model': self.model,
+            'task_type': self.task_type,
+            'size_bucket': self.size_bucket,
+            'reason': self.reason,
+            'heuristic_model': self.heuristic_model,
+            'estimated_cost': self.estimated_cost,
+            'heuristic_estimated_cost': self.heuristic_estimated_cost,
+            'candidates': self.candidates
+        }
+
+class AdaptiveRouter:
+    """
+    🧭 Feedback-driven model selection
+
+    Every invocation is recorded against (model, task type, size bucket) in
+    a rolling window. A candidate is eligible once it has ``min_samples``
+    observations whose p95 latency is within the SLO, failure rate within
+    bounds and mean confidence at or above the floor; the cheapest eligible
+    candidate wins. Without enough evidence the heuristic choice is kept
+    (or an untried candidate, once the heuristic choice is proven out of
+    bounds), and a small exploration rate sends a call to one of the other
+    candidates - including ones already judged out of bounds - so every
+    candidate's statistics stay fresh and a recovered model can win again.
+    A deterministic pick (the static analyser) is never explored away from.
+    """
+
+    def __init__(self, latency_slo_ms: float = 8000.0, confidence_floor: float = 0.6,
+                 max_failure_rate: float = 0.2, window: int = 200, min_samples: int = 5,
+                 explore_rate: float = 0.05, local_cost: float = 0.01,
+                 deepseek_cost_per_1k_tokens: float = 1.0):
+        self.logger = logging.getLogger(__name__)
+        self.latency_slo_ms = latency_slo_ms
+        self.confidence_floor = confidence_floor
+        self.max_failure_rate = max_failure_rate
+        self.window = window
+        self.min_samples = min_samples
+        self.explore_rate = explore_rate
+        self.local_cost = local_cost
+        self.deepseek_cost_per_1k_tokens = deepseek_cost_per_1k_tokens
+
+        self._observations: Dict[Tuple[str, str, str], deque] = {}
+        self._lock = threading.Lock()
+        self.metrics = {
+            'decisions': 0,
+            'overrides': 0,
+            'explorations': 0,
+            'escalations': 0,
+            'estimated_cost': 0.0,
+            'heuristic_estimated_cost': 0.0
+        }
+        self._decisions_by_model: Dict[str, int] = {}
+
+    def decide(self, code_content: str, task_type: str) -> RouteDecision:
+        """Pick a model for one scroll"""
+        bucket = size_bucket(code_content)
+        scroll_tokens = estimate_tokens(code_content)
+        heuristic_model = heuristic_route(code_content, task_type)
+        candidates = TASK_CANDIDATES.get(task_type, (heuristic_model,))
+
+        with self._lock:
+            stats = {model: self._stats(model, task_type, bucket, scroll_tokens) for model in candidates}
+
+        eligible = [model for model in candidates if stats[model]['eligible']]
+        unproven = [model for model in candidates if stats[model]['samples'] < self.min_samples]
+
+        if eligible:
+            model = min(eligible, key=lambda m: stats[m]['estimated_cost'])
+            reason = 'cheapest_within_slo'
+        elif heuristic_model in unproven:
+            model, reason = heuristic_model, 'insufficient_data'
+        elif unproven:
+            # The heuristic choice is proven out of bounds - gather evidence on the others
+            model = min(unproven, key=lambda m: stats[m]['estimated_cost'])
+            reason = 'heuristic_outside_slo'
+        else:
+            model, reason = heuristic_model, 'no_candidate_within_slo'
+
+        # Any other candidate, proven or not, so one that fell out of bounds
+        # gets a fresh window and can win its way back once it recovers.
+        # An exact answer is never traded for a guess.
+        others = [candidate for candidate in candidates if candidate != model]
+        if others and model not in DETERMINISTIC_MODELS and random.random() < self.explore_rate:
+            model, reason = random.choice(others), 'explore'
+
+        return self._count(RouteDecision(
+            model=model,
+            task_type=task_type,
+            size_bucket=bucket,
+            reason=reason,
+            heuristic_model=heuristic_model,
+            estimated_cost=stats[model]['estimated_cost'],
+            heuristic_estimated_cost=stats[heuristic_model]['estimated_cost']
+            if heuristic_model in stats else self._estimated_cost(heuristic_model, scroll_tokens, None),
+            candidates=stats
+        ))
+
+    def escalate(self, code_content: str, task_type: str) -> RouteDecision:
+        """DeepSeek for a scroll the local cascade was not confident about - no other candidate is considered"""
+        bucket = size_bucket(code_content)
+        scroll_tokens = estimate_tokens(code_content)
+        heuristic_model = heuristic_route(code_content, task_type)
+
+        with self._lock:
+            stats = {'deepseek': self._stats('deepseek', task_type, bucket, scroll_tokens)}
+
+        return self._count(RouteDecision(
+            model='deepseek',
+            task_type=task_type,
+            size_bucket=bucket,
+            reason='cascade_escalation',
+            heuristic_model=heuristic_model,
+            estimated_cost=stats['deepseek']['estimated_cost'],
+            heuristic_estimated_cost=self._estimated_cost(heuristic_model, scroll_tokens, None),
+            candidates=stats
+        ))
+
+    def _count(self, decision: RouteDecision) -> RouteDecision:
+        """Add one decision to the metrics"""
+        model, reason = decision.model, decision.reason
+        with self._lock:
+            self.metrics['decisions'] += 1
+            self.metrics['overrides'] += model != decision.heuristic_model
+            self.metrics['explorations'] += reason == 'explore'
+            self.metrics['escalations'] += reason == 'cascade_escalation'
+            self.metrics['estimated_cost'] += decision.estimated_cost
+            self.metrics['heuristic_estimated_cost'] += decision.heuristic_estimated_cost
+            self._decisions_by_model[model] = self._decisions_by_model.get(model, 0) + 1
+
+        return decision
+
+    def record(self, model: str, task_type: str, bucket: str, latency_ms: float,
+               ok: bool, tokens: int = 0, confidence: float = 0.0):
+        """Add one invocation outcome to the rolling window"""
+        key = (model, task_type, bucket)
+        with self._lock:
+            window = self._observations.get(key)
+            if window is None:
+                window = self._observations[key] = deque(maxlen=self.window)
+            window.append(_Observation(latency_ms, ok, tokens, confidence))
+
+    def _stats(self, model: str, task_type: str, bucket: str, scroll_tokens: int) -> Dict[str, Any]:
+        """Rolling statistics of one candidate (caller holds the lock)"""
+        observations: List[_Observation] = list(self._observations.get((model, task_type, bucket), ()))
+        samples = len(observations)
+        successes = [o for o in observations if o.ok]
+
+        latencies = sorted(o.latency_ms for o in observations)
+        p95_latency = latencies[min(samples - 1, int(samples * 0.95))] if samples else None
+        failure_rate = 1.0 - len(successes) / samples if samples else None
+        mean_confidence = sum(o.confidence for o in successes) / len(successes) if successes else None
+        mean_tokens = sum(o.tokens for o in successes) / len(successes) if successes else None
+
+        eligible = (
+            samples >= self.min_samples
+            and p95_latency <= self.latency_slo_ms
+            and failure_rate <= self.max_failure_rate
+            and mean_confidence is not None
+            and mean_confidence >= self.confidence_floor
+        )
+
+        return {
+            'samples': samples,
+            'p95_latency_ms': p95_latency,
+            'failure_rate': failure_rate,
+            'mean_confidence': mean_confidence,
+            'mean_tokens': mean_tokens,
+            'estimated_cost': self._estimated_cost(model, scroll_tokens, mean_tokens),
+            'eligible': eligible
+        }
+
+    def _estimated_cost(self, model: str, scroll_tokens: int, mean_tokens: Optional[float]) -> float:
+        """Expected cost of one call in relative units"""
+        if model in LOCAL_MODELS:
+            return self.local_cost
+
+        tokens = mean_tokens if mean_tokens else scroll_tokens + DEEPSEEK_OVERHEAD_TOKENS
+        return tokens / 1000 * self.deepseek_cost_per_1k_tokens
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Decision counts, estimated savings and per-candidate statistics"""
+        with self._lock:
+            statistics = {}
+            for (model, task_type, bucket), window in self._observations.items():
+                observations = list(window)
+                successes = [o for o in observations if o.ok]
+                latencies = sorted(o.latency_ms for o in observations)
+                statistics[f"{model}/{task_type}/{bucket}"] = {
+                    'samples': len(observations),
+                    'p95_latency_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                    'failure_rate': 1.0 - len(successes) / len(observations),
+                    'mean_tokens': sum(o.tokens for o in successes) / len(successes) if successes else 0.0
+                }
+
+            return {
+                **self.metrics,
+                'estimated_savings': self.metrics['heuristic_estimated_cost'] - self.metrics['estimated_cost'],
+                'decisions_by_model': dict(self._decisions_by_model),
+                'latency_slo_ms': self.latency_slo_ms,
+                'confidence_floor': self.confidence_floor,
+                'statistics': statistics
+            }
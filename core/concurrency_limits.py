@@ -0,0 +1,101 @@
+"""
+🔱 Concurrency Limits - Sacred Gatekeepers
+Per-model caps on concurrent invocations, shared across every event loop in the process
+"""
+
+import asyncio
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+
+class ModelConcurrencyLimiter:
+    """
+    🚦 Per-model invocation slots
+
+    Engine callers run on several event loops (one per DataFlowManager
+    worker, plus batch runs), so an asyncio.Semaphore - bound to a single
+    loop - cannot be shared. Slots are counted under a thread lock instead
+    and handed first-come first-served to waiters on any loop. A limit of
+    0 leaves a model uncapped.
+    """
+
+    def __init__(self, limits: Dict[str, int]):
+        self.limits = dict(limits)
+        self._lock = threading.Lock()
+        self._active: Dict[str, int] = {model: 0 for model in self.limits}
+        self._waiters: Dict[str, deque] = {model: deque() for model in self.limits}
+        self._peak: Dict[str, int] = {model: 0 for model in self.limits}
+        self._waits: Dict[str, int] = {model: 0 for model in self.limits}
+
+    @asynccontextmanager
+    async def slot(self, model: str):
+        """Hold one of ``model``'s slots for the duration of the block"""
+        if self.limits.get(model, 0) <= 0:
+            yield
+            return
+
+        await self._acquire(model)
+        try:
+            yield
+        finally:
+            self._release(model)
+
+    async def _acquire(self, model: str):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._active[model] < self.limits[model] and not self._waiters[model]:
+                self._take(model)
+                return
+            waiter = loop.create_future()
+            self._waiters[model].append((loop, waiter))
+            self._waits[model] += 1
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                queued = (loop, waiter) in self._waiters[model]
+                if queued:
+                    self._waiters[model].remove((loop, waiter))
+            # A slot already granted to a cancelled waiter is passed on
+            if not queued and waiter.done() and not waiter.cancelled():
+                self._release(model)
+            raise
+
+    def _take(self, model: str):
+        """Count one more active slot (caller holds the lock)"""
+        self._active[model] += 1
+        self._peak[model] = max(self._peak[model], self._active[model])
+
+    def _release(self, model: str):
+        """Hand the slot to the oldest waiter, or free it"""
+        with self._lock:
+            if not self._waiters[model]:
+                self._active[model] -= 1
+                return
+            loop, waiter = self._waiters[model].popleft()
+
+        def grant():
+            if waiter.done():
+                self._release(model)  # The waiter was cancelled meanwhile
+            else:
+                waiter.set_result(None)
+
+        try:
+            loop.call_soon_threadsafe(grant)
+        except RuntimeError:
+            self._release(model)  # The waiter's loop is closed
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                model: {
+                    'limit': self.limits[model],
+                    'active': self._active[model],
+                    'waiting': len(self._waiters[model]),
+                    'peak': self._peak[model],
+                    'waits': self._waits[model]
+                }
+                for model in self.limits
+            }
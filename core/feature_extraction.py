@@ -0,0 +1,253 @@
+"""
+🔱 Feature Extraction - Sacred Scroll Vectorizer
+Turns source code into fixed-width NumPy feature matrices for the local models
+"""
+
+import ast
+import re
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .scroll_chunker import PYTHON_EXTENSIONS
+
+# Fixed node vocabulary - an explicit list keeps the feature width identical
+# across Python versions, so trained models stay loadable
+AST_NODE_TYPES = (
+    'Module', 'FunctionDef', 'AsyncFunctionDef', 'ClassDef', 'Return', 'Delete',
+    'Assign', 'AugAssign', 'AnnAssign', 'For', 'AsyncFor', 'While', 'If', 'With',
+    'AsyncWith', 'Raise', 'Try', 'Assert', 'Import', 'ImportFrom', 'Global',
+    'Nonlocal', 'Expr', 'Pass', 'Break', 'Continue', 'BoolOp', 'NamedExpr', 'BinOp',
+    'UnaryOp', 'Lambda', 'IfExp', 'Dict', 'Set', 'ListComp', 'SetComp', 'DictComp',
+    'GeneratorExp', 'Await', 'Yield', 'YieldFrom', 'Compare', 'Call', 'FormattedValue',
+    'JoinedStr', 'Constant', 'Attribute', 'Subscript', 'Starred', 'Name', 'List',
+    'Tuple', 'Slice', 'ExceptHandler', 'arguments', 'arg', 'keyword', 'alias',
+    'comprehension', 'Match'
+)
+_NODE_INDEX = {name: i for i, name in enumerate(AST_NODE_TYPES)}
+
+IMPORT_FEATURES = (
+    'import_statements', 'imported_names', 'from_imports', 'star_imports',
+    'relative_imports', 'duplicate_imports', 'unreferenced_imports'
+)
+STRUCTURE_FEATURES = (
+    'lines', 'blank_lines', 'comment_lines', 'mean_line_length', 'max_nesting_depth',
+    'cyclomatic_complexity', 'max_function_complexity', 'functions', 'classes', 'parsed'
+)
+
+# Node classes that open a new nesting level / add a decision point
+_FUNCTION_TYPES = frozenset({ast.FunctionDef, ast.AsyncFunctionDef})
+_NESTING_TYPES = frozenset({ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.For, ast.AsyncFor,
+                            ast.While, ast.If, ast.With, ast.AsyncWith, ast.Try})
+_DECISION_TYPES = frozenset({ast.If, ast.For, ast.AsyncFor, ast.While, ast.IfExp, ast.ExceptHandler,
+                             ast.Assert, ast.comprehension})
+
+_TOKEN_PATTERN = re.compile(r'[A-Za-z_$][\w$]*|\d+|\S')
+
+class ScrollFeatureExtractor:
+    """
+    🧬 Fixed-width feature vectors for code scrolls
+
+    Layout: log-scaled AST node histogram, import statistics, structural
+    metrics (nesting, cyclomatic complexity, size) and hashed token bigrams.
+    Non-Python scrolls leave the AST sections at zero and rely on the
+    language-neutral structural and n-gram features.
+    """
+
+    def __init__(self, hash_buckets: int = 256):
+        self.hash_buckets = hash_buckets
+        self.feature_names = (
+            [f"node_{name}" for name in AST_NODE_TYPES]
+            + list(IMPORT_FEATURES)
+            + list(STRUCTURE_FEATURES)
+            + [f"ngram_{i}" for i in range(hash_buckets)]
+        )
+
+    @property
+    def width(self) -> int:
+        return len(self.feature_names)
+
+    def extract(self, code_content: str, file_extension: str = ".py") -> np.ndarray:
+        """Feature vector for a single scroll"""
+        vector = np.zeros(self.width, dtype=np.float32)
+
+        node_offset = 0
+        import_offset = node_offset + len(AST_NODE_TYPES)
+        structure_offset = import_offset + len(IMPORT_FEATURES)
+        ngram_offset = structure_offset + len(STRUCTURE_FEATURES)
+
+        lines = code_content.splitlines()
+        stripped = [line.strip() for line in lines]
+        comment_prefix = '#' if file_extension.lower() in PYTHON_EXTENSIONS else '//'
+
+        structure = dict.fromkeys(STRUCTURE_FEATURES, 0.0)
+        structure['lines'] = len(lines)
+        structure['blank_lines'] = sum(1 for line in stripped if not line)
+        structure['comment_lines'] = sum(1 for line in stripped if line.startswith(comment_prefix))
+        structure['mean_line_length'] = (sum(len(line) for line in lines) / len(lines)) if lines else 0.0
+
+        tree = None
+        if file_extension.lower() in PYTHON_EXTENSIONS:
+            try:
+                tree = ast.parse(code_content)
+            except (SyntaxError, ValueError):
+                tree = None
+
+        if tree is not None:
+            structure['parsed'] = 1.0
+            histogram, imports, tree_structure = self._tree_stats(tree)
+            vector[node_offset:import_offset] = np.log1p(histogram)
+            vector[import_offset:structure_offset] = [imports[name] for name in IMPORT_FEATURES]
+            structure.update(tree_structure)
+        else:
+            structure['max_nesting_depth'] = self._brace_depth(code_content)
+
+        vector[structure_offset:ngram_offset] = [structure[name] for name in STRUCTURE_FEATURES]
+        vector[ngram_offset:] = self._ngram_hashes(code_content)
+        return vector
+
+    def transform(self, code_contents: Sequence[str],
+                  file_extensions: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Feature matrix (n_scrolls x width) for a batch of scrolls"""
+        if file_extensions is None:
+            file_extensions = [".py"] * len(code_contents)
+
+        matrix = np.zeros((len(code_contents), self.width), dtype=np.float32)
+        for row, (code_content, extension) in enumerate(zip(code_contents, file_extensions)):
+            matrix[row] = self.extract(code_content, extension)
+        return matrix
+
+    def describe(self, vector: np.ndarray) -> Dict[str, float]:
+        """Named import and structure features of a vector (for result payloads)"""
+        start = len(AST_NODE_TYPES)
+        names = IMPORT_FEATURES + STRUCTURE_FEATURES
+        return {name: float(vector[start + i]) for i, name in enumerate(names)}
+
+    @staticmethod
+    def _tree_stats(tree: ast.AST):
+        """Node histogram, import and structure statistics in a single AST pass"""
+        histogram = [0] * len(AST_NODE_TYPES)
+        imports = dict.fromkeys(IMPORT_FEATURES, 0.0)
+        structure = {'functions': 0, 'classes': 0, 'max_nesting_depth': 0,
+                     'cyclomatic_complexity': 1, 'max_function_complexity': 0}
+
+        bound_names: List[str] = []
+        # What each alias imports and binds - `import os` and `import os.path` both bind `os` but are not duplicates
+        imported: List[Tuple] = []
+        referenced = set()
+        function_complexity: List[int] = []
+
+        # (node, nesting depth, index of the innermost enclosing function or -1)
+        stack = [(tree, 0, -1)]
+        while stack:
+            node, depth, function = stack.pop()
+            node_type = type(node)
+
+            index = _NODE_INDEX.get(node_type.__name__)
+            if index is not None:
+                histogram[index] += 1
+
+            decisions = 0
+            if node_type is ast.Name:
+                referenced.add(node.id)
+            elif node_type is ast.Attribute:
+                root = node.value
+                while type(root) is ast.Attribute:
+                    root = root.value
+                if type(root) is ast.Name:
+                    referenced.add(root.id)
+            elif node_type in _FUNCTION_TYPES:
+                structure['functions'] += 1
+                function_complexity.append(1)
+                function = len(function_complexity) - 1
+            elif node_type is ast.ClassDef:
+                structure['classes'] += 1
+            elif node_type in _DECISION_TYPES:
+                decisions = 1
+            elif node_type is ast.BoolOp:
+                decisions = len(node.values) - 1
+            elif node_type is ast.Import or node_type is ast.ImportFrom:
+                imports['import_statements'] += 1
+                if node_type is ast.ImportFrom:
+                    imports['from_imports'] += 1
+                    imports['relative_imports'] += node.level > 0
+                for alias in node.names:
+                    if alias.name == '*':
+                        imports['star_imports'] += 1
+                        continue
+                    imports['imported_names'] += 1
+                    bound_names.append((alias.asname or alias.name).split('.')[0])
+                    source = (node.module, node.level) if node_type is ast.ImportFrom else None
+                    imported.append((source, alias.name, alias.asname))
+
+            if decisions:
+                structure['cyclomatic_complexity'] += decisions
+                if function >= 0:
+                    function_complexity[function] += decisions
+
+            child_depth = depth + 1 if node_type in _NESTING_TYPES else depth
+            structure['max_nesting_depth'] = max(structure['max_nesting_depth'], child_depth)
+            stack.extend((child, child_depth, function) for child in ast.iter_child_nodes(node))
+
+        structure['max_function_complexity'] = max(function_complexity, default=0)
+        imports['duplicate_imports'] = len(imported) - len(set(imported))
+        imports['unreferenced_imports'] = sum(1 for name in set(bound_names) if name not in referenced)
+
+        return np.asarray(histogram, dtype=np.float32), imports, {name: float(value) for name, value in structure.items()}
+
+    @staticmethod
+    def _brace_depth(code_content: str) -> float:
+        """Maximum brace nesting for languages without an AST here"""
+        depth = max_depth = 0
+        for char in code_content:
+            if char == '{':
+                depth += 1
+                max_depth = max(max_depth, depth)
+            elif char == '}':
+                depth = max(0, depth - 1)
+        return float(max_depth)
+
+    def _ngram_hashes(self, code_content: str) -> np.ndarray:
+        """Normalised histogram of hashed token bigrams"""
+        buckets = np.zeros(self.hash_buckets, dtype=np.float32)
+        tokens = _TOKEN_PATTERN.findall(code_content)
+        if len(tokens) < 2:
+            return buckets
+
+        # crc32 rather than hash() - Python's string hash is salted per process
+        indices = [zlib.crc32(f"{a} {b}".encode('utf-8')) % self.hash_buckets
+                   for a, b in zip(tokens, tokens[1:])]
+        np.add.at(buckets, indices, 1.0)
+        return buckets / (len(tokens) - 1)
+
+class ScrollEncoder:
+    """
+    🧠 Dense input encoding for the PyTorch CodeAnalysisModel
+
+    Reuses the scroll features, sizing the n-gram block so the vector is
+    exactly ``input_dim`` wide, and log-scales the raw counts so no single
+    feature dominates the first Linear layer.
+    """
+
+    def __init__(self, input_dim: int = 1000):
+        fixed_width = len(AST_NODE_TYPES) + len(IMPORT_FEATURES) + len(STRUCTURE_FEATURES)
+        if input_dim <= fixed_width:
+            raise ValueError(f"input_dim must exceed {fixed_width} fixed features")
+
+        self.input_dim = input_dim
+        self.extractor = ScrollFeatureExtractor(hash_buckets=input_dim - fixed_width)
+        self._count_slice = slice(len(AST_NODE_TYPES), fixed_width)
+
+    def encode(self, code_content: str, file_extension: str = ".py") -> np.ndarray:
+        """Encode one scroll as an ``input_dim`` float32 vector"""
+        vector = self.extractor.extract(code_content, file_extension)
+        vector[self._count_slice] = np.log1p(vector[self._count_slice])
+        return vector
+
+    def encode_batch(self, code_contents: Sequence[str],
+                     file_extensions: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Encode a batch of scrolls as an (n_scrolls x input_dim) matrix"""
+        matrix = self.extractor.transform(code_contents, file_extensions)
+        matrix[:, self._count_slice] = np.log1p(matrix[:, self._count_slice])
+        return matrix
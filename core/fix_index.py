@@ -0,0 +1,401 @@
+"""
+🔱 Fix Index - Sacred Archive of Past Answers
+Hashed n-gram embeddings of analysed scrolls with brute-force or IVF search
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+INDEX_FORMAT_VERSION = 2  # 2: entries are grouped per user and carry a fingerprint
+
+# Comments, string literals, numbers, identifiers and single symbols, in match priority order
+_NORMALIZE_PATTERN = re.compile(
+    r'(?P<comment>#[^\n]*|//[^\n]*|/\*.*?\*/)'
+    r'|(?P<string>""".*?"""|\'\'\'.*?\'\'\'|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*`)'
+    r'|(?P<number>\b\d[\w.]*)'
+    r'|(?P<word>[A-Za-z_$][\w$]*)'
+    r'|(?P<symbol>\S)',
+    re.DOTALL
+)
+NGRAM_SIZES = (1, 2, 3)
+
+def normalize_tokens(code_content: str, keep_literals: bool = False) -> List[str]:
+    """Token stream with comments dropped and, unless ``keep_literals``, literals reduced to placeholders"""
+    tokens = []
+    for match in _NORMALIZE_PATTERN.finditer(code_content):
+        kind = match.lastgroup
+        if kind == 'comment':
+            continue
+        if kind == 'string' and not keep_literals:
+            tokens.append('<str>')
+        elif kind == 'number' and not keep_literals:
+            tokens.append('<num>')
+        else:
+            tokens.append(match.group())
+    return tokens
+
+def fingerprint_scroll(code_content: str) -> str:
+    """
+    Digest of a scroll's tokens with literals kept
+
+    Equal only for scrolls that differ in comments and whitespace alone -
+    the one case where a stored answer is served as it is.
+    """
+    return hashlib.sha256("\x1f".join(normalize_tokens(code_content, keep_literals=True)).encode('utf-8')).hexdigest()
+
+def embed_scroll(code_content: str, dim: int) -> np.ndarray:
+    """
+    Unit-length hashed n-gram embedding of a scroll
+
+    Token 1- to 3-grams are hashed (crc32, stable across processes) into
+    ``dim`` signed buckets with sublinear term frequency, so cosine
+    similarity is a plain dot product.
+    """
+    tokens = normalize_tokens(code_content)
+    vector = np.zeros(dim, dtype=np.float32)
+    counts: Dict[int, int] = {}
+    for n in NGRAM_SIZES:
+        for i in range(len(tokens) - n + 1):
+            digest = zlib.crc32("\x1f".join(tokens[i:i + n]).encode('utf-8'))
+            counts[digest] = counts.get(digest, 0) + 1
+
+    if not counts:
+        return vector
+
+    digests = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    weights = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+    signs = np.where((digests >> 31) & 1, -1.0, 1.0).astype(np.float32)
+    np.add.at(vector, digests % dim, signs * weights)
+
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+@dataclass
+class FixMatch:
+    """One past answer retrieved for a scroll"""
+    similarity: float
+    entry: Dict[str, Any]
+
+class FixRetrievalIndex:
+    """
+    🗂️ On-disk nearest-neighbour index of accepted answers
+
+    Layout::
+
+        cache/fix_index/meta.json       dimension and format version
+        cache/fix_index/vectors.f32     row-major float32 embeddings, append-only
+        cache/fix_index/entries.jsonl   one JSON entry per row, append-only
+
+    Appends write the vector first and the entry second; on load both files
+    are trimmed to the rows they have in common, so a crash mid-append loses
+    at most that append. Entries only ever match scrolls of the same user,
+    task, model and prompt version.
+
+    ``lookup`` finds an entry by fingerprint; ``search`` finds the nearest
+    embedding. Below ``ivf_min_entries`` rows every search is an exact
+    brute-force scan; above it an inverted-file index (k-means coarse
+    quantizer, ``nprobe`` lists per query) is trained on a background thread
+    once the index first crosses the threshold and again once it has
+    doubled. Searches scan brute force until the lists are ready and never
+    wait on a training run.
+    """
+
+    def __init__(self, root: Path, dim: int = 1024, ivf_min_entries: int = 4096,
+                 nprobe: int = 8, kmeans_iterations: int = 10):
+        self.logger = logging.getLogger(__name__)
+        self.root = Path(root)
+        self.dim = dim
+        self.ivf_min_entries = ivf_min_entries
+        self.nprobe = nprobe
+        self.kmeans_iterations = kmeans_iterations
+
+        self.meta_path = self.root / 'meta.json'
+        self.vectors_path = self.root / 'vectors.f32'
+        self.entries_path = self.root / 'entries.jsonl'
+
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._size = 0
+        self._offsets: List[int] = []  # byte offset of each row's entry in entries.jsonl
+        self._groups = np.zeros(0, dtype=np.int32)
+        self._group_ids: Dict[Tuple[str, str, str, str], int] = {}
+        self._fingerprints: Dict[Tuple[int, str], int] = {}  # (group, fingerprint) -> row
+
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._ivf_trained_size = 0
+        self._ivf_unassigned_from = 0
+        self._training = False
+
+        self._lock = threading.Lock()
+        self._search_latencies_ms: deque = deque(maxlen=1000)
+        self.metrics = {
+            'searches': 0,
+            'matches': 0,
+            'appends': 0,
+            'ivf_trainings': 0
+        }
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _load(self):
+        """Read existing rows, trimming any torn append"""
+        if self.meta_path.exists():
+            meta = json.loads(self.meta_path.read_text(encoding='utf-8'))
+            if meta.get('dim') != self.dim or meta.get('format') != INDEX_FORMAT_VERSION:
+                self.logger.warning(f"⚠️ Fix index at {self.root} has another layout - starting a new one")
+                self.vectors_path.unlink(missing_ok=True)
+                self.entries_path.unlink(missing_ok=True)
+        self.meta_path.write_text(json.dumps({'dim': self.dim, 'format': INDEX_FORMAT_VERSION}), encoding='utf-8')
+
+        entries = []
+        if self.entries_path.exists():
+            offset = 0
+            with open(self.entries_path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    entries.append((offset, json.loads(line)))
+                    offset += len(line)
+            if offset != self.entries_path.stat().st_size:
+                os.truncate(self.entries_path, offset)
+
+        vectors = np.zeros((0, self.dim), dtype=np.float32)
+        if self.vectors_path.exists():
+            rows = self.vectors_path.stat().st_size // (self.dim * 4)
+            vectors = np.fromfile(self.vectors_path, dtype=np.float32, count=rows * self.dim).reshape(rows, self.dim)
+
+        size = min(len(entries), len(vectors))
+        if self.vectors_path.exists() and self.vectors_path.stat().st_size != size * self.dim * 4:
+            os.truncate(self.vectors_path, size * self.dim * 4)
+        if size < len(entries):
+            os.truncate(self.entries_path, entries[size][0])
+
+        self._reserve(size)
+        self._vectors[:size] = vectors[:size]
+        self._size = size
+        for row, (offset, entry) in enumerate(entries[:size]):
+            self._offsets.append(offset)
+            group = self._group_id(entry)
+            self._groups[row] = group
+            self._fingerprints[(group, entry['fingerprint'])] = row
+
+        if size:
+            self.logger.info(f"🗂️ Loaded fix index with {size} entries")
+            self._schedule_training()
+
+    def _reserve(self, rows: int):
+        """Grow the in-memory arrays geometrically"""
+        if rows <= len(self._vectors):
+            return
+        capacity = max(rows, 2 * len(self._vectors), 256)
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        groups = np.full(capacity, -1, dtype=np.int32)
+        groups[:self._size] = self._groups[:self._size]
+        self._vectors, self._groups = vectors, groups
+
+    def _group_id(self, entry: Dict[str, Any]) -> int:
+        group = (entry['user_id'], entry['task_type'], entry['model'], entry['prompt_version'])
+        if group not in self._group_ids:
+            self._group_ids[group] = len(self._group_ids)
+        return self._group_ids[group]
+
+    def append(self, code_content: str, entry: Dict[str, Any]) -> bool:
+        """
+        Add one accepted answer
+
+        ``entry`` needs user_id, task_type, model, prompt_version and
+        code_hash; its fingerprint is added here, and any other fields
+        (result, confidence, ...) come back with a match. Returns False when
+        a scroll with the same fingerprint is already indexed for the group.
+        """
+        vector = embed_scroll(code_content, self.dim)
+        entry = {**entry, 'fingerprint': fingerprint_scroll(code_content)}
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8')
+
+        with self._lock:
+            group = self._group_id(entry)
+            if (group, entry['fingerprint']) in self._fingerprints:
+                return False
+
+            with open(self.vectors_path, 'ab') as f:
+                f.write(vector.tobytes())
+            with open(self.entries_path, 'ab') as f:
+                offset = f.tell()
+                f.write(line)
+
+            self._reserve(self._size + 1)
+            self._vectors[self._size] = vector
+            self._groups[self._size] = group
+            self._offsets.append(offset)
+            self._fingerprints[(group, entry['fingerprint'])] = self._size
+            self._size += 1
+            self.metrics['appends'] += 1
+
+        self._schedule_training()
+        return True
+
+    def lookup(self, code_content: str, user_id: str, task_type: str, model: str,
+               prompt_version: str) -> Optional[FixMatch]:
+        """The past answer for this very scroll - same tokens and literals, comments and layout aside"""
+        fingerprint = fingerprint_scroll(code_content)
+        with self._lock:
+            group = self._group_ids.get((user_id, task_type, model, prompt_version))
+            row = self._fingerprints.get((group, fingerprint))
+            if row is None:
+                return None
+            self.metrics['matches'] += 1
+            return FixMatch(similarity=1.0, entry=self._read_entry(row))
+
+    def search(self, code_content: str, user_id: str, task_type: str, model: str, prompt_version: str,
+               min_similarity: float = 0.0, exact: bool = False) -> Optional[FixMatch]:
+        """Most similar past answer in the same group, if any reaches ``min_similarity``"""
+        start_time = time.perf_counter()
+        query = embed_scroll(code_content, self.dim)
+
+        with self._lock:
+            group = self._group_ids.get((user_id, task_type, model, prompt_version))
+            best_row, best_score = None, -1.0
+
+            if group is not None and self._size:
+                rows = None if exact else self._probe_rows(query)
+                if rows is None:
+                    scores = self._vectors[:self._size] @ query
+                    scores[self._groups[:self._size] != group] = -1.0
+                    row = int(np.argmax(scores))
+                    best_row, best_score = row, float(scores[row])
+                else:
+                    rows = rows[self._groups[rows] == group]
+                    if len(rows):
+                        scores = self._vectors[rows] @ query
+                        position = int(np.argmax(scores))
+                        best_row, best_score = int(rows[position]), float(scores[position])
+
+            match = None
+            if best_row is not None and best_score >= max(min_similarity, 0.0):
+                match = FixMatch(similarity=best_score, entry=self._read_entry(best_row))
+                self.metrics['matches'] += 1
+
+            self.metrics['searches'] += 1
+            self._search_latencies_ms.append((time.perf_counter() - start_time) * 1000)
+            return match
+
+    def _read_entry(self, row: int) -> Dict[str, Any]:
+        with open(self.entries_path, 'rb') as f:
+            f.seek(self._offsets[row])
+            return json.loads(f.readline())
+
+    def _probe_rows(self, query: np.ndarray) -> Optional[np.ndarray]:
+        """Candidate rows from the ``nprobe`` nearest IVF lists, or None for a brute-force scan"""
+        if self._size < self.ivf_min_entries or self._centroids is None:
+            return None
+
+        if self._ivf_unassigned_from < self._size:
+            self._assign_to_lists(self._ivf_unassigned_from, self._size)
+
+        nearest = np.argsort(self._centroids @ query)[::-1][:self.nprobe]
+        return np.concatenate([self._lists[i] for i in nearest])
+
+    def _schedule_training(self):
+        """Start a background IVF training run when the index needs one and none is running"""
+        with self._lock:
+            due = (self._size >= self.ivf_min_entries and not self._training
+                   and (self._centroids is None or self._size >= 2 * self._ivf_trained_size))
+            if not due:
+                return
+            self._training = True
+
+        threading.Thread(target=self.train_ivf, name="fix-index-ivf", daemon=True).start()
+
+    def train_ivf(self):
+        """
+        Spherical k-means over (a sample of) the rows, then rebuild the inverted lists
+
+        Runs on a snapshot of the rows outside the lock - rows are append-only,
+        so the snapshot stays valid - and only swaps the new lists in under it.
+        """
+        with self._lock:
+            self._training = True
+            size = self._size
+            vectors = self._vectors[:size]
+
+        try:
+            self._train_ivf(vectors, size)
+        finally:
+            with self._lock:
+                self._training = False
+        # The index may have doubled again while this run was going
+        self._schedule_training()
+
+    def _train_ivf(self, vectors: np.ndarray, size: int):
+        start_time = time.perf_counter()
+        n_lists = max(1, int(math.sqrt(size)))
+        rng = np.random.default_rng(0)
+
+        sample = vectors[rng.choice(size, size=min(size, n_lists * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+        for _ in range(self.kmeans_iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for i in range(n_lists):
+                members = sample[assignment == i]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    centroids[i] = centroid / norm if norm else centroid
+
+        lists = self._build_lists(vectors, centroids, 0)
+
+        with self._lock:
+            # Rows appended meanwhile are assigned by the next search
+            self._centroids = centroids
+            self._lists = lists
+            self._ivf_trained_size = size
+            self._ivf_unassigned_from = size
+            self.metrics['ivf_trainings'] += 1
+        self.logger.info(
+            f"🗂️ Trained fix index IVF: {n_lists} lists over {size} entries "
+            f"in {time.perf_counter() - start_time:.2f}s"
+        )
+
+    @staticmethod
+    def _build_lists(vectors: np.ndarray, centroids: np.ndarray, first_row: int) -> List[np.ndarray]:
+        """Inverted lists of ``vectors`` (rows numbered from ``first_row``) by nearest centroid"""
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        rows = np.arange(first_row, first_row + len(vectors), dtype=np.int64)
+        return [rows[assignment == i] for i in range(len(centroids))]
+
+    def _assign_to_lists(self, start: int, end: int):
+        """Append rows [start, end) to their nearest inverted list (caller holds the lock)"""
+        for i, rows in enumerate(self._build_lists(self._vectors[start:end], self._centroids, start)):
+            if len(rows):
+                self._lists[i] = np.concatenate([self._lists[i], rows])
+        self._ivf_unassigned_from = end
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Size, search counts and search latency percentiles"""
+        with self._lock:
+            latencies = sorted(self._search_latencies_ms)
+            return {
+                **self.metrics,
+                'entries': self._size,
+                'ivf_lists': len(self._lists) if self._centroids is not None else 0,
+                'search_p50_ms': latencies[len(latencies) // 2] if latencies else None,
+                'search_p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None
+            }
@@ -3,21 +3,48 @@
 Binds XGBoost, PyTorch, and DeepSeek-R1 in divine harmony
 """
 
-import torch
-import xgboost as xgb
-import requests
+import numpy as np
+import asyncio
 import json
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Any, AsyncIterator, Callable, Sequence, Tuple
+from dataclasses import dataclass, field, replace
 from enum import Enum
 
 from ..config.settings import OracleConfig
+from ..api.openrouter_client import openrouter_client
+from ..api.resilience import CircuitOpenError
+from .result_cache import ScrollResultCache
+from .scroll_chunker import ScrollChunker, ScrollChunk, estimate_tokens
+from .feature_extraction import ScrollFeatureExtractor, ScrollEncoder
+from .inference_batcher import MicroBatcher
+from .model_store import ModelArtifactStore
+from .adaptive_router import AdaptiveRouter, RouteDecision, LOCAL_MODELS, TASK_CANDIDATES
+from .prompt_compactor import PromptCompactor, COMPACTOR_VERSION
+from .incremental_analysis import ScrollRevisionTracker
+from .fix_index import FixRetrievalIndex
+from .process_pool import ScrollProcessPool
+from .concurrency_limits import ModelConcurrencyLimiter
+from .static_analysis import ImportAnalyzer, IMPORT_ANALYZER_VERSION
+from .variable_inspection import VariableInspector, VARIABLE_INSPECTOR_VERSION
+from .quantization import configure_torch_threads, quantize_dynamic_int8, accuracy_delta, load_holdout, save_holdout
+
+# Variable-inspection patterns scored by the CodeAnalysisModel output layer
+INSPECTION_LABELS = (
+    'clean', 'unused_variable', 'shadowed_builtin', 'global_mutation', 'loop_closure',
+    'type_inconsistency', 'naming_convention', 'scope_too_wide', 'redundant_assignment',
+    'magic_number'
+)
 
 class ModelType(Enum):
     XGBOOST = "xgboost"
     PYTORCH = "pytorch"  
     DEEPSEEK = "deepseek"
+    STATIC = "static"
 
 @dataclass
 class InvocationResult:
@@ -28,37 +55,300 @@ class InvocationResult:
     execution_time: float
     metadata: Dict[str, Any]
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary"""
+        return {
+            'model_type': self.model_type.value,
+            'result': self.result,
+            'confidence': self.confidence,
+            'execution_time': self.execution_time,
+            'metadata': dict(self.metadata)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'InvocationResult':
+        """Rebuild a result from its dictionary form"""
+        return cls(
+            model_type=ModelType(data['model_type']),
+            result=data['result'],
+            confidence=data['confidence'],
+            execution_time=data['execution_time'],
+            metadata=dict(data.get('metadata', {}))
+        )
+
+@dataclass
+class _InFlightInvocation:
+    """Shared slot for callers awaiting the same invocation"""
+    future: Future = field(default_factory=Future)
+    followers: int = 0
+
 class HybridEngineCore:
     """
     🌟 The Divine Orchestrator - Routes invocations to appropriate sacred models
     """
 
     def __init__(self):
+        self.created_at = time.time()
         self.logger = logging.getLogger(__name__)
         self.config = OracleConfig()
-        self.models = {}
-        self._initialize_models()
 
-    def _initialize_models(self):
-        """Initialize all sacred models"""
-        try:
-            # Initialize XGBoost for code classification
-            self.models['xgboost'] = self._init_xgboost()
+        # Local models are built on first use - torch and xgboost are only
+        # imported by deployments that actually route to them
+        self.models: Dict[ModelType, Any] = {}
+        self.model_load_seconds: Dict[str, float] = {}
+        self.model_versions: Dict[str, Optional[str]] = {}
+        self.pytorch_quantization: Optional[Dict[str, Any]] = None
+        self._pytorch_fp32_model = None
+        self._model_locks = {model_type: threading.Lock() for model_type in ModelType}
+        self._model_initializers = {
+            ModelType.XGBOOST: self._init_xgboost,
+            ModelType.PYTORCH: self._init_pytorch
+        }
+
+        # Persisted artifacts - a manifest change swaps models without a restart
+        self.model_store = ModelArtifactStore(self.config.MODELS_DIR)
+        self._manifest_mtime = self.model_store.manifest_mtime()
+        self._manifest_checked_at = time.monotonic()
+        self._reload_lock = threading.Lock()
+        self.transport = openrouter_client
+        self.router = AdaptiveRouter(
+            latency_slo_ms=self.config.ROUTER_LATENCY_SLO_MS,
+            confidence_floor=self.config.ROUTER_CONFIDENCE_FLOOR,
+            max_failure_rate=self.config.ROUTER_MAX_FAILURE_RATE,
+            window=self.config.ROUTER_WINDOW,
+            min_samples=self.config.ROUTER_MIN_SAMPLES,
+            explore_rate=self.config.ROUTER_EXPLORE_RATE,
+            local_cost=self.config.ROUTER_LOCAL_COST,
+            deepseek_cost_per_1k_tokens=self.config.ROUTER_DEEPSEEK_COST_PER_1K_TOKENS
+        )
+        self.prompt_compactor = None
+        if self.config.PROMPT_COMPACTION_ENABLED:
+            self.prompt_compactor = PromptCompactor(
+                table_min_lines=self.config.PROMPT_COMPACTION_TABLE_MIN_LINES,
+                max_line_chars=self.config.PROMPT_COMPACTION_MAX_LINE_CHARS
+            )
+        self.import_analyzer = None
+        self.variable_inspector = None
+        if self.config.STATIC_ANALYSIS_ENABLED:
+            self.import_analyzer = ImportAnalyzer()
+            self.variable_inspector = VariableInspector(cache_entries=self.config.STATIC_INSPECTION_CACHE_ENTRIES)
+        self.feature_extractor = ScrollFeatureExtractor()
+        self.scroll_encoder = ScrollEncoder(input_dim=1000)
+
+        # CPU-bound vectorizing runs in warm worker processes, outside the GIL. The
+        # workers are spawned by the first batch big enough to use them, so CLI runs
+        # and small scrolls never pay for the pool
+        self.analysis_pool = ScrollProcessPool(
+            workers=self.config.PROCESS_POOL_WORKERS,
+            encoder_dim=self.scroll_encoder.input_dim,
+            min_batch_bytes=self.config.PROCESS_POOL_MIN_BATCH_BYTES,
+            start_method=self.config.PROCESS_POOL_START_METHOD
+        )
+        self.pytorch_batcher = MicroBatcher(
+            self._pytorch_forward,
+            max_batch_size=self.config.PYTORCH_MAX_BATCH_SIZE,
+            max_wait_ms=self.config.PYTORCH_MAX_WAIT_MS,
+            name="pytorch"
+        )
+        self.result_cache = None
+        if self.config.RESULT_CACHE_ENABLED:
+            self.result_cache = ScrollResultCache(
+                cache_dir=self.config.CACHE_DIR / 'scrolls',
+                max_entries=self.config.RESULT_CACHE_MAX_ENTRIES,
+                max_disk_bytes=self.config.RESULT_CACHE_MAX_DISK_MB * 1024 * 1024,
+                ttl_seconds=self.config.RESULT_CACHE_TTL_SECONDS
+            )
 
-            # Initialize PyTorch for pattern recognition
-            self.models['pytorch'] = self._init_pytorch()
+        self.revision_tracker = None
+        if self.config.INCREMENTAL_ANALYSIS_ENABLED:
+            self.revision_tracker = ScrollRevisionTracker(
+                ScrollResultCache(
+                    cache_dir=self.config.CACHE_DIR / 'revisions',
+                    max_entries=self.config.RESULT_CACHE_MAX_ENTRIES,
+                    max_disk_bytes=self.config.RESULT_CACHE_MAX_DISK_MB * 1024 * 1024,
+                    ttl_seconds=self.config.RESULT_CACHE_TTL_SECONDS
+                ),
+                token_budget=self.config.INCREMENTAL_CHUNK_TOKEN_BUDGET,
+                boundary_modulus=self.config.INCREMENTAL_BOUNDARY_MODULUS
+            )
 
-            # DeepSeek-R1 ready for API calls
-            self.models['deepseek'] = True
+        self.fix_index = None
+        if self.config.FIX_INDEX_ENABLED:
+            self.fix_index = FixRetrievalIndex(
+                self.config.CACHE_DIR / 'fix_index',
+                dim=self.config.FIX_INDEX_DIM,
+                ivf_min_entries=self.config.FIX_INDEX_IVF_MIN_ENTRIES,
+                nprobe=self.config.FIX_INDEX_NPROBE
+            )
 
-            self.logger.info("✨ All sacred models initialized successfully")
+        # Per-model caps on concurrent invocations, across every caller's event loop
+        self.model_limiter = ModelConcurrencyLimiter(self.config.MODEL_CONCURRENCY_LIMITS)
 
-        except Exception as e:
-            self.logger.error(f"💀 Model initialization failed: {e}")
-            raise
+        # Single-flight registry - workers run on separate threads and loops,
+        # so callers share a thread-safe Future rather than an asyncio one
+        self._in_flight: Dict[Tuple[str, str, str], _InFlightInvocation] = {}
+        self._in_flight_lock = threading.Lock()
+
+        self.metrics = {
+            'invocations': 0,
+            'coalesced_requests': 0,
+            'local_fallbacks': 0,
+            'prompt_tokens_saved': 0,
+            'incremental_tokens_avoided': 0,
+            'fix_index_answers': 0,
+            'fix_index_seeds': 0
+        }
+
+        self.ready_at = time.time()
+        self.logger.info(f"✨ Hybrid engine ready in {self.ready_at - self.created_at:.3f}s")
+
+        if self.config.ENGINE_WARMUP_MODELS:
+            self.warm_up(
+                [ModelType(name) for name in self.config.ENGINE_WARMUP_MODELS],
+                background=self.config.ENGINE_WARMUP_BACKGROUND
+            )
+
+    def _get_model(self, model_type: ModelType):
+        """Return a local model, building it (and importing its framework) on first use"""
+        self._check_model_manifest()
+
+        model = self.models.get(model_type)
+        if model is not None:
+            return model
+
+        with self._model_locks[model_type]:
+            if model_type not in self.models:
+                start_time = time.time()
+                try:
+                    self.models[model_type] = self._model_initializers[model_type]()
+                except Exception as e:
+                    self.logger.error(f"💀 {model_type.value} initialization failed: {e}")
+                    raise
+
+                self.model_load_seconds[model_type.value] = time.time() - start_time
+                self.logger.info(
+                    f"✨ {model_type.value} model loaded in {self.model_load_seconds[model_type.value]:.3f}s"
+                )
+
+        return self.models[model_type]
+
+    def reload_models(self, model_types: Optional[Sequence[ModelType]] = None) -> Dict[str, Optional[str]]:
+        """
+        🔄 Rebuild loaded local models from their active artifacts
+
+        The replacement is built off to the side and swapped in with a single
+        assignment, so in-flight requests finish on the model they started with.
+        """
+        targets = [m for m in (model_types or list(self.models)) if m in self._model_initializers]
+
+        with self._reload_lock:
+            for model_type in targets:
+                start_time = time.time()
+                try:
+                    model = self._model_initializers[model_type]()
+                except Exception as e:
+                    self.logger.error(f"💀 {model_type.value} reload failed, keeping current model: {e}")
+                    continue
+
+                with self._model_locks[model_type]:
+                    self.models[model_type] = model
+                self.model_load_seconds[model_type.value] = time.time() - start_time
+                self.logger.info(
+                    f"🔄 {model_type.value} reloaded at version {self.model_versions.get(model_type.value)}"
+                )
+
+        return {model_type.value: self.model_versions.get(model_type.value) for model_type in targets}
+
+    def switch_model_version(self, model_type: ModelType, version: str) -> Optional[str]:
+        """Activate an artifact version and swap it in if the model is loaded"""
+        self.model_store.activate(model_type.value, version)
+        self._manifest_mtime = self.model_store.manifest_mtime()
+
+        if model_type in self.models:
+            self.reload_models([model_type])
+        return self.model_versions.get(model_type.value)
+
+    def save_model(self, model_type: ModelType, version: Optional[str] = None,
+                   activate: bool = True) -> Dict[str, Any]:
+        """💾 Persist the current local model as a new artifact version"""
+        model = self._get_model(model_type)
+        if model_type == ModelType.XGBOOST:
+            entry = self.model_store.save_xgboost(model, version, activate)
+        elif model_type == ModelType.PYTORCH:
+            # A quantized model is derived at load time - the artifact keeps fp32 weights
+            entry = self.model_store.save_pytorch(self._pytorch_fp32_model or model, version, activate)
+        else:
+            raise ValueError(f"{model_type.value} has no local artifact")
+
+        if activate:
+            self.model_versions[model_type.value] = entry['version']
+        self._manifest_mtime = self.model_store.manifest_mtime()
+        return entry
+
+    def save_pytorch_holdout(self, code_contents: Sequence[str], labels: Optional[Sequence[str]] = None,
+                             file_extensions: Optional[Sequence[str]] = None):
+        """
+        📏 Encode scrolls as the held-out set for the quantization check
+
+        ``labels`` are INSPECTION_LABELS names; without them the check
+        measures agreement with the fp32 model's own predictions.
+        """
+        file_extensions = file_extensions or [".py"] * len(code_contents)
+        inputs = np.stack([
+            self.scroll_encoder.encode(code_content, file_extension)
+            for code_content, file_extension in zip(code_contents, file_extensions)
+        ])
+        label_indices = np.array([INSPECTION_LABELS.index(label) for label in labels]) if labels else None
+        save_holdout(self.config.PYTORCH_QUANTIZATION_HOLDOUT, inputs, label_indices)
+
+    def _check_model_manifest(self):
+        """Reload models whose active version changed on disk (throttled)"""
+        interval = self.config.MODEL_MANIFEST_POLL_SECONDS
+        now = time.monotonic()
+        if interval <= 0 or now - self._manifest_checked_at < interval:
+            return
+        self._manifest_checked_at = now
+
+        mtime = self.model_store.manifest_mtime()
+        if mtime == self._manifest_mtime:
+            return
+        self._manifest_mtime = mtime
+
+        manifest = self.model_store.read_manifest()['models']
+        stale = [
+            model_type for model_type in list(self.models)
+            if manifest.get(model_type.value, {}).get('active') != self.model_versions.get(model_type.value)
+        ]
+        if stale:
+            # Reload off the request path; callers keep using the current model meanwhile
+            threading.Thread(
+                target=self.reload_models, args=(stale,), name="model-reload", daemon=True
+            ).start()
+
+    def warm_up(self, model_types: Optional[Sequence[ModelType]] = None, background: bool = True):
+        """
+        🔥 Build local models ahead of the first request
+
+        DeepSeek needs no warm-up; unknown or remote model types are skipped.
+        """
+        targets = [m for m in (model_types or list(self._model_initializers)) if m in self._model_initializers]
+
+        def load_all():
+            for model_type in targets:
+                try:
+                    self._get_model(model_type)
+                except Exception:
+                    pass  # Already logged; the request path will retry
+
+        if background:
+            threading.Thread(target=load_all, name="engine-warmup", daemon=True).start()
+        else:
+            load_all()
 
     def _init_xgboost(self):
         """Initialize XGBoost for code optimization classification"""
+        import xgboost as xgb
+
         # Pre-trained or custom model for code pattern classification
         model = xgb.XGBClassifier(
             n_estimators=100,
@@ -66,14 +356,20 @@ class HybridEngineCore:
             learning_rate=0.1,
             subsample=0.8,
             colsample_bytree=0.8,
-            random_state=42
+            random_state=42,
+            n_jobs=self.config.XGBOOST_NTHREAD
         )
+        self.model_versions[ModelType.XGBOOST.value] = self.model_store.load_xgboost(model)
+        if self._is_fitted(model):
+            model.set_params(n_jobs=self.config.XGBOOST_NTHREAD)
         return model
 
     def _init_pytorch(self):
         """Initialize PyTorch for deep code analysis"""
+        import torch
+
         class CodeAnalysisModel(torch.nn.Module):
-            def __init__(self, input_dim=1000, hidden_dim=512, output_dim=10):
+            def __init__(self, input_dim=1000, hidden_dim=512, output_dim=len(INSPECTION_LABELS)):
                 super().__init__()
                 self.encoder = torch.nn.Sequential(
                     torch.nn.Linear(input_dim, hidden_dim),
@@ -87,10 +383,56 @@ class HybridEngineCore:
             def forward(self, x):
                 return self.encoder(x)
 
+        configure_torch_threads(self.config.PYTORCH_NUM_THREADS, self.config.PYTORCH_INTEROP_THREADS)
+
         model = CodeAnalysisModel()
+        self.model_versions[ModelType.PYTORCH.value] = self.model_store.load_pytorch(model)
         model.eval()  # Set to evaluation mode
+        self._pytorch_fp32_model = model
+
+        if self.config.PYTORCH_QUANTIZE:
+            return self._quantize_pytorch(model)
         return model
 
+    def _quantize_pytorch(self, model):
+        """
+        ⚖️ int8 copy of the inspection model, if it stays within the accuracy budget
+
+        The quantized model is only served when its accuracy delta against
+        fp32 on the held-out set is at most PYTORCH_QUANTIZATION_MAX_DELTA;
+        otherwise (or without a held-out set) the fp32 model is kept.
+        """
+        version = self.model_versions.get(ModelType.PYTORCH.value)
+        holdout = load_holdout(self.config.PYTORCH_QUANTIZATION_HOLDOUT)
+        if holdout is None:
+            self.logger.warning(
+                f"⚠️ No held-out set at {self.config.PYTORCH_QUANTIZATION_HOLDOUT} - serving fp32 PyTorch model"
+            )
+            self.pytorch_quantization = {'applied': False, 'version': version, 'reason': 'no_holdout_set'}
+            return model
+
+        quantized = quantize_dynamic_int8(model)
+        report = accuracy_delta(model, quantized, *holdout)
+        report.update(
+            version=version,
+            max_accuracy_delta=self.config.PYTORCH_QUANTIZATION_MAX_DELTA,
+            applied=report['accuracy_delta'] <= self.config.PYTORCH_QUANTIZATION_MAX_DELTA
+        )
+        self.pytorch_quantization = report
+
+        if not report['applied']:
+            self.logger.warning(
+                f"⚠️ int8 PyTorch model loses {report['accuracy_delta']:.2%} accuracy "
+                f"(budget {self.config.PYTORCH_QUANTIZATION_MAX_DELTA:.2%}) - serving fp32"
+            )
+            return model
+
+        self.logger.info(
+            f"⚖️ Serving int8 PyTorch model: accuracy delta {report['accuracy_delta']:.2%}, "
+            f"held-out pass {report['fp32_ms']:.1f}ms fp32 -> {report['int8_ms']:.1f}ms int8"
+        )
+        return quantized
+
     async def invoke_deepseek(self, prompt: str, task_type: str = "general") -> InvocationResult:
         """
         🧙‍♂️ Invoke DeepSeek-R1 via OpenRouter for divine wisdom
@@ -99,35 +441,10 @@ class HybridEngineCore:
         start_time = time.time()
 
         try:
-            headers = {
-                'Authorization': f'Bearer {self.config.OPENROUTER_API_KEY}',
-                'Content-Type': 'application/json',
-                'HTTP-Referer': 'https://scriptoracle.com',  # Replace with actual domain
-                'X-Title': 'Script Oracle - Divine Debugger'
-            }
-
-            # Craft the sacred prompt based on task type
-            system_prompt = self._craft_system_prompt(task_type)
-
-            payload = {
-                "model": self.config.DEEPSEEK_MODEL,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.7,
-                "max_tokens": 2000
-            }
-
-            response = requests.post(
-                f"{self.config.OPENROUTER_BASE_URL}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
+            payload = self._build_deepseek_payload(prompt, task_type)
 
-            response.raise_for_status()
-            result = response.json()
+            # Non-blocking call through the shared keep-alive pool
+            result = await self.transport.chat_completion(payload)
 
             execution_time = time.time() - start_time
 
@@ -150,9 +467,94 @@ class HybridEngineCore:
                 result=f"Invocation failed: {str(e)}",
                 confidence=0.0,
                 execution_time=time.time() - start_time,
-                metadata={"error": str(e)}
+                metadata={"error": str(e), "circuit_open": isinstance(e, CircuitOpenError),
+                          "unavailable": self.transport.is_unavailable(e)}
             )
 
+    async def stream_deepseek(self, prompt: str, task_type: str = "general") -> AsyncIterator[InvocationResult]:
+        """
+        🌊 Stream DeepSeek-R1 output as partial results
+
+        Yields one result per content delta (``metadata['done']`` False) and a
+        final result carrying the full text, usage and timing.
+        """
+        import time
+        start_time = time.time()
+
+        chunks: List[str] = []
+        tokens_used = 0
+        first_token_time = None
+
+        try:
+            payload = self._build_deepseek_payload(prompt, task_type)
+
+            async for event in self.transport.stream_chat_completion(payload):
+                if event.get('usage'):
+                    tokens_used = event['usage'].get('total_tokens', tokens_used)
+
+                choices = event.get('choices') or [{}]
+                delta = choices[0].get('delta', {}).get('content')
+                if not delta:
+                    continue
+
+                if first_token_time is None:
+                    first_token_time = time.time() - start_time
+
+                chunks.append(delta)
+                yield InvocationResult(
+                    model_type=ModelType.DEEPSEEK,
+                    result=delta,
+                    confidence=0.95,
+                    execution_time=time.time() - start_time,
+                    metadata={
+                        "task_type": task_type,
+                        "stream": True,
+                        "done": False,
+                        "delta_index": len(chunks) - 1
+                    }
+                )
+
+            yield InvocationResult(
+                model_type=ModelType.DEEPSEEK,
+                result="".join(chunks),
+                confidence=0.95,
+                execution_time=time.time() - start_time,
+                metadata={
+                    "task_type": task_type,
+                    "tokens_used": tokens_used,
+                    "model": self.config.DEEPSEEK_MODEL,
+                    "stream": True,
+                    "done": True,
+                    "time_to_first_token": first_token_time
+                }
+            )
+
+        except Exception as e:
+            self.logger.error(f"💀 DeepSeek stream failed: {e}")
+            yield InvocationResult(
+                model_type=ModelType.DEEPSEEK,
+                result=f"Invocation failed: {str(e)}",
+                confidence=0.0,
+                execution_time=time.time() - start_time,
+                metadata={"error": str(e), "circuit_open": isinstance(e, CircuitOpenError),
+                          "unavailable": self.transport.is_unavailable(e), "stream": True, "done": True}
+            )
+
+    def _build_deepseek_payload(self, prompt: str, task_type: str) -> Dict[str, Any]:
+        """Build the chat completion payload for a DeepSeek invocation"""
+        # Craft the sacred prompt based on task type
+        system_prompt = self._craft_system_prompt(task_type)
+
+        return {
+            "model": self.config.DEEPSEEK_MODEL,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.7,
+            "max_tokens": 2000
+        }
+
     def _craft_system_prompt(self, task_type: str) -> str:
         """Craft sacred system prompts based on invocation type"""
         prompts = {
@@ -198,67 +600,942 @@ class HybridEngineCore:
     def route_invocation(self, code_content: str, task_type: str, file_extension: str = ".py") -> str:
         """
         🎯 Sacred routing logic - determines which model to invoke
-        """
-        # Simple routing based on task type and code complexity
-        code_length = len(code_content)
 
-        if task_type in ["explain", "optimize"] and code_length > 500:
-            return "deepseek"  # Complex analysis needs DeepSeek
-        elif task_type == "cleanse":
-            return "xgboost"   # Import analysis good for XGBoost
-        elif task_type == "inspect":
-            return "pytorch"   # Variable analysis for PyTorch
-        else:
-            return "deepseek"  # Default to DeepSeek for general tasks
+        Delegates to the adaptive router, which starts from the fixed
+        task/length rule and moves to the cheapest model meeting the latency
+        SLO and confidence floor as statistics accumulate.
+        """
+        return self.router.decide(code_content, task_type).model
 
-    async def process_code_scroll(self, code_content: str, task_type: str, file_extension: str = ".py") -> InvocationResult:
+    async def process_code_scroll(self, code_content: str, task_type: str, file_extension: str = ".py",
+                                  on_local_result: Optional[Callable[[InvocationResult], None]] = None,
+                                  user_id: Optional[str] = None, filename: Optional[str] = None) -> InvocationResult:
         """
         ⚡ Main invocation method - processes code through appropriate sacred model
+
+        For cascade tasks the local models answer first; when their confidence
+        falls short the local answer is handed to ``on_local_result`` as a
+        provisional result while DeepSeek is consulted. Before DeepSeek is
+        called, the user's own past answers are checked: one for the same
+        scroll (comments and layout aside) is served from the fix index, a
+        merely similar one is handed over as a provisional result. Large scrolls with a
+        ``filename`` are tracked per user, and re-uploads only send the changed
+        sections to DeepSeek.
+        """
+        cache_key = self._cache_key(code_content, task_type, file_extension)
+        cached_result = self._lookup_cached_result(cache_key)
+        if cached_result is not None:
+            self.logger.info(f"📜 Serving cached {task_type} invocation")
+            return cached_result
+
+        # Identical scrolls already in flight - streamed or not - share one invocation
+        flight_key = self._flight_key(code_content, task_type, file_extension)
+        flight, is_leader = self._join_flight(flight_key)
+        if not is_leader:
+            self.logger.info(f"🔗 Coalescing {task_type} invocation with one already in flight")
+            shared_result = await self._await_flight(flight)
+            return replace(shared_result, metadata={**shared_result.metadata, 'coalesced': True})
+
+        try:
+            self.metrics['invocations'] += 1
+            result = await self._cascade_invocation(code_content, task_type, file_extension, on_local_result,
+                                                    self._scroll_identity(user_id, filename), user_id)
+            self._store_cached_result(cache_key, result)
+            self._index_fix(code_content, task_type, result, user_id)
+
+        except BaseException as e:
+            self._finish_flight(flight_key, flight, error=e)
+            raise
+
+        self._finish_flight(flight_key, flight, result=result)
+        return result
+
+    def _flight_key(self, code_content: str, task_type: str, file_extension: str) -> Tuple[str, ...]:
+        return (self._code_hash(code_content), file_extension.lower(), task_type, self.config.DEEPSEEK_MODEL)
+
+    def _join_flight(self, flight_key: Tuple[str, ...]) -> Tuple[_InFlightInvocation, bool]:
+        """The invocation in flight for a key and whether the caller leads it (runs it) or follows"""
+        with self._in_flight_lock:
+            flight = self._in_flight.get(flight_key)
+            if flight is None:
+                flight = _InFlightInvocation()
+                self._in_flight[flight_key] = flight
+                return flight, True
+            flight.followers += 1
+            self.metrics['coalesced_requests'] += 1
+            return flight, False
+
+    @staticmethod
+    async def _await_flight(flight: _InFlightInvocation) -> InvocationResult:
+        """Wait for a flight's outcome - a follower that goes away leaves it running for the rest"""
+        return await asyncio.shield(asyncio.wrap_future(flight.future))
+
+    def _finish_flight(self, flight_key: Tuple[str, ...], flight: _InFlightInvocation,
+                       result: Optional[InvocationResult] = None, error: Optional[BaseException] = None):
+        """Close a flight and hand its outcome to the followers - a second call is a no-op"""
+        # Close the slot before publishing so the follower count is final
+        with self._in_flight_lock:
+            if self._in_flight.get(flight_key) is flight:
+                del self._in_flight[flight_key]
+        if flight.future.done():
+            return
+
+        if result is None:
+            if isinstance(error, GeneratorExit):
+                error = RuntimeError("The leading stream was closed before it finished")
+            flight.future.set_exception(error)
+            return
+
+        result.metadata['coalesced'] = False
+        result.metadata['coalesced_count'] = flight.followers
+        flight.future.set_result(result)
+
+    async def stream_code_scroll(self, code_content: str, task_type: str, file_extension: str = ".py",
+                                 user_id: Optional[str] = None,
+                                 filename: Optional[str] = None) -> AsyncIterator[InvocationResult]:
+        """
+        🌊 Streaming variant of process_code_scroll
+
+        DeepSeek-routed scrolls yield partial results as tokens arrive; cached
+        and local-model answers are yielded once, already complete. A scroll
+        already in flight is not streamed twice - the caller gets the shared
+        result once it is done.
+        """
+        cache_key = self._cache_key(code_content, task_type, file_extension)
+        cached_result = self._lookup_cached_result(cache_key)
+        if cached_result is not None:
+            cached_result.metadata['done'] = True
+            yield cached_result
+            return
+
+        flight_key = self._flight_key(code_content, task_type, file_extension)
+        flight, is_leader = self._join_flight(flight_key)
+        if not is_leader:
+            self.logger.info(f"🔗 Coalescing streamed {task_type} invocation with one already in flight")
+            shared_result = await self._await_flight(flight)
+            yield replace(shared_result, metadata={**shared_result.metadata, 'coalesced': True, 'done': True})
+            return
+
+        try:
+            self.metrics['invocations'] += 1
+            async for partial in self._stream_invocation(code_content, task_type, file_extension,
+                                                         cache_key, self._scroll_identity(user_id, filename), user_id):
+                if partial.metadata.get('done'):
+                    # Followers are released before the final partial reaches the consumer
+                    self._finish_flight(flight_key, flight, result=partial)
+                yield partial
+        except BaseException as e:
+            self._finish_flight(flight_key, flight, error=e)
+            raise
+
+    async def _stream_invocation(self, code_content: str, task_type: str, file_extension: str,
+                                 cache_key: str, identity: Optional[Tuple[str, str]],
+                                 user_id: Optional[str]) -> AsyncIterator[InvocationResult]:
+        """
+        Local cascade, the fix index, then DeepSeek streamed (or dispatched
+        whole) - the leader's side of stream_code_scroll
+        """
+        local_result = None
+        decision = self.router.decide(code_content, task_type)
+        if self._cascade_threshold(task_type) is not None and decision.model in LOCAL_MODELS:
+            local_result, accepted = await self._run_local_cascade(code_content, task_type, file_extension, decision)
+            if accepted:
+                self._store_cached_result(cache_key, local_result)
+                local_result.metadata['done'] = True
+                yield local_result
+                return
+            if local_result is not None:
+                yield replace(local_result, metadata={**local_result.metadata, 'provisional': True, 'done': False})
+            decision = self.router.escalate(code_content, task_type)
+
+        if decision.model == "deepseek":
+            retrieved, seed = self._retrieve_fix(code_content, task_type, user_id)
+            if retrieved is not None:
+                self._attach_escalation(retrieved, local_result)
+                retrieved.metadata['done'] = True
+                yield retrieved
+                return
+            if seed is not None:
+                seed.metadata['done'] = False
+                yield seed
+
+        prompt, compaction = self._compact_prompt(code_content, task_type, file_extension)
+        if (decision.model != "deepseek" or self._needs_chunking(prompt)
+                or self._tracks_revisions(code_content, task_type, identity)):
+            result = await self._dispatch_invocation(code_content, task_type, file_extension, decision, identity)
+            self._attach_escalation(result, local_result)
+            self._store_cached_result(cache_key, result)
+            self._index_fix(code_content, task_type, result, user_id)
+            result.metadata['done'] = True
+            yield result
+            return
+
+        self.logger.info(f"🌊 Streaming {task_type} invocation from deepseek")
+
+        async with self.model_limiter.slot("deepseek"):
+            start_time = time.perf_counter()
+            async for partial in self.stream_deepseek(prompt, task_type):
+                if partial.metadata.get('done'):
+                    self._attach_compaction(partial, compaction)
+                    self._record_route(decision, partial, time.perf_counter() - start_time)
+                    if self._is_failed_deepseek(partial):
+                        partial = await self._local_fallback(code_content, task_type, file_extension, partial)
+                        partial.metadata['done'] = True
+                    else:
+                        self._open_revision_record(code_content, task_type, identity, partial)
+                    self._attach_escalation(partial, local_result)
+                    self._store_cached_result(cache_key, partial)
+                    self._index_fix(code_content, task_type, partial, user_id)
+                yield partial
+
+    def _cascade_threshold(self, task_type: str) -> Optional[float]:
+        """
+        Local confidence needed to skip DeepSeek, or None when the task does not cascade
+
+        Only tasks a local model can answer cascade - a threshold configured
+        for any other task could never be met, so it is ignored.
+        """
+        if not self.config.CASCADE_ENABLED or task_type not in TASK_CANDIDATES:
+            return None
+        return self.config.CASCADE_CONFIDENCE_THRESHOLDS.get(task_type)
+
+    async def _cascade_invocation(self, code_content: str, task_type: str, file_extension: str,
+                                  on_local_result: Optional[Callable[[InvocationResult], None]] = None,
+                                  identity: Optional[Tuple[str, str]] = None,
+                                  user_id: Optional[str] = None) -> InvocationResult:
+        """
+        🪜 Local models first, DeepSeek only when they are not confident enough
+
+        The router still picks the model; when it picks a local one for a
+        task that cascades, an answer below the threshold goes to DeepSeek.
+        A DeepSeek call is preceded by a look at the user's fix index.
+        """
+        local_result = None
+        decision = self.router.decide(code_content, task_type)
+        if self._cascade_threshold(task_type) is not None and decision.model in LOCAL_MODELS:
+            local_result, accepted = await self._run_local_cascade(code_content, task_type, file_extension, decision)
+            if accepted:
+                return local_result
+            if local_result is not None:
+                self._offer_provisional(on_local_result,
+                                        replace(local_result, metadata={**local_result.metadata, 'provisional': True}))
+            decision = self.router.escalate(code_content, task_type)
+
+        if decision.model == "deepseek":
+            retrieved, seed = self._retrieve_fix(code_content, task_type, user_id)
+            if retrieved is not None:
+                self._attach_escalation(retrieved, local_result)
+                return retrieved
+            if seed is not None:
+                self._offer_provisional(on_local_result, seed)
+
+        result = await self._dispatch_invocation(code_content, task_type, file_extension, decision, identity)
+        self._attach_escalation(result, local_result)
+        return result
+
+    def _offer_provisional(self, on_local_result: Optional[Callable[[InvocationResult], None]],
+                           result: InvocationResult):
+        """Hand a provisional result to the caller's callback, if there is one"""
+        if on_local_result is None:
+            return
+        try:
+            on_local_result(result)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Provisional result callback failed: {e}")
+
+    async def _run_local_cascade(self, code_content: str, task_type: str, file_extension: str,
+                                 decision: RouteDecision) -> Tuple[Optional[InvocationResult], bool]:
+        """Run the routed local model and decide whether its answer is good enough"""
+        threshold = self._cascade_threshold(task_type)
+
+        try:
+            local_result = await self._dispatch_invocation(code_content, task_type, file_extension, decision)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Local cascade pass failed, escalating to DeepSeek: {e}")
+            return None, False
+
+        confidence = local_result.confidence
+        accepted = confidence >= threshold
+
+        local_result.metadata['cascade'] = {
+            "stage": "local",
+            "accepted": accepted,
+            "threshold": threshold,
+            "model_confidence": {local_result.model_type.value: confidence}
+        }
+
+        self.logger.info(
+            f"🪜 Local {task_type} confidence {confidence:.2f} "
+            f"{'meets' if accepted else 'is below'} the {threshold:.2f} threshold"
+        )
+        return local_result, accepted
+
+    async def _local_pass(self, code_content: str, task_type: str, file_extension: str) -> InvocationResult:
+        """Both local models merged into one answer, as confident as the weaker of the two"""
+        start_time = time.time()
+
+        # Both vectorize in the process pool concurrently; PyTorch then queues on the micro-batcher
+        local_results = await asyncio.gather(
+            self._invoke_xgboost(code_content, task_type, file_extension),
+            self._invoke_pytorch(code_content, task_type, file_extension)
+        )
+        return InvocationResult(
+            model_type=max(local_results, key=lambda r: r.confidence).model_type,
+            result="\n\n".join(r.result for r in local_results),
+            confidence=min(r.confidence for r in local_results),
+            execution_time=time.time() - start_time,
+            metadata={
+                "task_type": task_type,
+                "model_confidence": {r.model_type.value: r.confidence for r in local_results}
+            }
+        )
+
+    async def _local_fallback(self, code_content: str, task_type: str, file_extension: str,
+                              failed_result: InvocationResult) -> InvocationResult:
+        """
+        🛟 Answer with the local models when DeepSeek is unavailable
+
+        Only for timeouts, dropped connections, 429s and 5xx, after the
+        transport has retried; an open circuit fails straight through to
+        here without touching the network.
         """
-        model_choice = self.route_invocation(code_content, task_type, file_extension)
+        error = failed_result.metadata.get('error', 'unknown error')
+        self.logger.warning(f"🛟 DeepSeek unavailable ({error}), answering {task_type} locally")
 
-        self.logger.info(f"🔮 Routing {task_type} invocation to {model_choice}")
+        try:
+            if task_type == "cleanse":
+                result = (self._invoke_static(code_content, task_type, file_extension)
+                          or await self._invoke_xgboost(code_content, task_type, file_extension))
+            elif task_type == "inspect":
+                result = (self._invoke_static(code_content, task_type, file_extension)
+                          or await self._invoke_pytorch(code_content, task_type, file_extension))
+            else:
+                result = await self._local_pass(code_content, task_type, file_extension)
+        except Exception as e:
+            self.logger.error(f"💀 Local fallback failed: {e}")
+            return failed_result
 
+        self.metrics['local_fallbacks'] += 1
+        result.metadata['fallback'] = {
+            'from': ModelType.DEEPSEEK.value,
+            'error': error,
+            'circuit_open': failed_result.metadata.get('circuit_open', False)
+        }
+        return result
+
+    @staticmethod
+    def _is_failed_deepseek(result: InvocationResult) -> bool:
+        """
+        Whether a DeepSeek result carries no answer because DeepSeek is unavailable
+
+        Client errors (bad key, rejected payload) are not - they reach the
+        caller as they are instead of being papered over by a local answer.
+        """
+        return (result.model_type == ModelType.DEEPSEEK and result.confidence == 0.0
+                and bool(result.metadata.get('unavailable')))
+
+    @staticmethod
+    def _attach_escalation(result: InvocationResult, local_result: Optional[InvocationResult]):
+        """Record on an escalated result what the local pass concluded"""
+        if local_result is None:
+            return
+        result.metadata['cascade'] = {
+            **local_result.metadata['cascade'],
+            'stage': 'escalated',
+            'local_confidence': local_result.confidence
+        }
+
+    async def _dispatch_invocation(self, code_content: str, task_type: str, file_extension: str,
+                                   decision: Optional[RouteDecision] = None,
+                                   identity: Optional[Tuple[str, str]] = None) -> InvocationResult:
+        """Route the scroll to a model, invoke it and feed the outcome back to the router"""
+        decision = decision or self.router.decide(code_content, task_type)
+
+        self.logger.info(f"🔮 Routing {task_type} invocation to {decision.model} ({decision.reason})")
+
+        start_time = time.perf_counter()
+        try:
+            async with self.model_limiter.slot(decision.model):
+                result = await self._invoke_model(decision.model, code_content, task_type, file_extension, identity)
+        except Exception:
+            self.router.record(decision.model, task_type, decision.size_bucket,
+                               (time.perf_counter() - start_time) * 1000, ok=False)
+            raise
+
+        self._record_route(decision, result, time.perf_counter() - start_time)
+        if self._is_failed_deepseek(result):
+            fallback = await self._local_fallback(code_content, task_type, file_extension, result)
+            fallback.metadata.setdefault('router', result.metadata.get('router'))
+            return fallback
+        return result
+
+    def _record_route(self, decision: RouteDecision, result: InvocationResult, elapsed: float):
+        """Feed an invocation outcome to the router and attach the decision for auditing"""
+        ok = result.confidence > 0.0 and 'error' not in result.metadata and not result.metadata.get('failed_chunks')
+        self.router.record(
+            decision.model, decision.task_type, decision.size_bucket, elapsed * 1000,
+            ok=ok, tokens=result.metadata.get('tokens_used', 0), confidence=result.confidence
+        )
+        result.metadata['router'] = decision.to_dict()
+
+    async def _invoke_model(self, model_choice: str, code_content: str, task_type: str,
+                            file_extension: str, identity: Optional[Tuple[str, str]] = None) -> InvocationResult:
+        """Invoke one model by name"""
         if model_choice == "deepseek":
-            return await self.invoke_deepseek(code_content, task_type)
+            if self._tracks_revisions(code_content, task_type, identity):
+                return await self._invoke_deepseek_incremental(code_content, task_type, file_extension, identity)
+            prompt, compaction = self._compact_prompt(code_content, task_type, file_extension)
+            if self._needs_chunking(prompt):
+                result = await self._invoke_deepseek_chunked(code_content, task_type, file_extension)
+            else:
+                result = await self.invoke_deepseek(prompt, task_type)
+                self._attach_compaction(result, compaction)
+            self._open_revision_record(code_content, task_type, identity, result)
+            return result
+        elif model_choice == "static":
+            result = self._invoke_static(code_content, task_type, file_extension)
+            if result is None:
+                # Unsupported language or a scroll that does not parse
+                fallback = self._invoke_pytorch if task_type == "inspect" else self._invoke_xgboost
+                return await fallback(code_content, task_type, file_extension)
+            return result
         elif model_choice == "xgboost":
-            return self._invoke_xgboost(code_content, task_type)
+            return await self._invoke_xgboost(code_content, task_type, file_extension)
         elif model_choice == "pytorch":
-            return self._invoke_pytorch(code_content, task_type)
+            return await self._invoke_pytorch(code_content, task_type, file_extension)
         else:
             # Fallback to DeepSeek
             return await self.invoke_deepseek(code_content, task_type)
 
-    def _invoke_xgboost(self, code_content: str, task_type: str) -> InvocationResult:
-        """Invoke XGBoost for classification tasks"""
+    def _compact_prompt(self, code_content: str, task_type: str,
+                        file_extension: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        🗜️ Compacted DeepSeek prompt for a scroll, and a report of what it saved
+
+        The raw scroll is kept whenever compaction would not make it smaller.
+        """
+        if self.prompt_compactor is None:
+            return code_content, None
+
+        compacted = self.prompt_compactor.compact(code_content, task_type, file_extension)
+        prompt = compacted.render_prompt()
+        prompt_tokens = estimate_tokens(prompt)
+        applied = prompt_tokens < compacted.original_tokens
+
+        report = {
+            'applied': applied,
+            'original_tokens': compacted.original_tokens,
+            'prompt_tokens': prompt_tokens if applied else compacted.original_tokens,
+            'tokens_saved': compacted.original_tokens - prompt_tokens if applied else 0,
+            **compacted.stats
+        }
+        return (prompt if applied else code_content), report
+
+    def _attach_compaction(self, result: InvocationResult, compaction: Optional[Dict[str, Any]]):
+        """Report prompt compaction savings on a result"""
+        if compaction is None:
+            return
+        result.metadata['compaction'] = compaction
+        result.metadata['tokens_saved'] = compaction['tokens_saved']
+        self.metrics['prompt_tokens_saved'] += compaction['tokens_saved']
+
+    def _needs_chunking(self, code_content: str) -> bool:
+        """Whether a scroll is too large for a single DeepSeek prompt"""
+        return estimate_tokens(code_content) > self.config.CHUNKING_THRESHOLD_TOKENS
+
+    async def _invoke_deepseek_chunked(self, code_content: str, task_type: str, file_extension: str) -> InvocationResult:
+        """
+        ✂️ Analyse a large scroll chunk by chunk with bounded fan-out
+        """
         import time
         start_time = time.time()
 
-        # Simplified XGBoost invocation for code classification
-        # In production, this would use feature extraction and trained models
-        result = f"XGBoost analysis for {task_type}: Code processed successfully"
+        chunks = ScrollChunker(self.config.CHUNK_TOKEN_BUDGET).split(code_content, file_extension)
+
+        self.logger.info(f"✂️ Split {task_type} scroll into {len(chunks)} chunks")
+
+        chunk_results, compaction = await self._analyse_chunks(code_content, task_type, file_extension, chunks)
+        result = self._merge_chunk_results(chunks, chunk_results, task_type, time.time() - start_time)
+        self._attach_compaction(result, compaction)
+        return result
+
+    async def _analyse_chunks(self, code_content: str, task_type: str, file_extension: str,
+                              chunks: List[ScrollChunk]) -> Tuple[List[InvocationResult], Optional[Dict[str, Any]]]:
+        """Send chunks to DeepSeek with bounded fan-out, compacting each prompt"""
+        total_lines = len(code_content.splitlines())
+        semaphore = asyncio.Semaphore(self.config.CHUNK_MAX_CONCURRENCY)
+
+        plan = (self.prompt_compactor.plan(code_content, task_type, file_extension)
+                if self.prompt_compactor is not None else None)
+        compaction = {'applied': plan is not None, 'original_tokens': 0, 'prompt_tokens': 0, 'tokens_saved': 0}
+        if plan is not None:
+            compaction.update(plan.stats)
+
+        def render(chunk: ScrollChunk) -> str:
+            prompt = chunk.render_prompt(total_lines)
+            compaction['original_tokens'] += estimate_tokens(prompt)
+            if plan is not None:
+                compacted_prompt = chunk.render_prompt(total_lines, compaction=plan)
+                if estimate_tokens(compacted_prompt) < estimate_tokens(prompt):
+                    prompt = compacted_prompt
+            compaction['prompt_tokens'] += estimate_tokens(prompt)
+            return prompt
+
+        prompts = [render(chunk) for chunk in chunks]
+        compaction['tokens_saved'] = compaction['original_tokens'] - compaction['prompt_tokens']
+
+        async def analyse(prompt: str) -> InvocationResult:
+            async with semaphore:
+                return await self.invoke_deepseek(prompt, task_type)
+
+        chunk_results = await asyncio.gather(*(analyse(prompt) for prompt in prompts))
+        return list(chunk_results), (compaction if plan is not None else None)
+
+    async def _invoke_deepseek_incremental(self, code_content: str, task_type: str, file_extension: str,
+                                           identity: Tuple[str, str]) -> InvocationResult:
+        """
+        🧬 Re-analyse only the sections of a tracked scroll that changed since its last upload
+        """
+        start_time = time.time()
+        filename = identity[1]
+        record_key = self._revision_record_key(task_type, identity)
+        plan = self.revision_tracker.plan(code_content, file_extension, task_type, record_key)
+
+        self.logger.info(
+            f"🧬 {filename}: reusing {len(plan.reused)} of {len(plan.chunks)} sections, "
+            f"analysing {len(plan.pending)}"
+        )
+
+        fresh_results, compaction = await self._analyse_chunks(code_content, task_type, file_extension, plan.pending)
+        fresh = {chunk.index: result for chunk, result in zip(plan.pending, fresh_results)}
+
+        chunk_results = []
+        for chunk in plan.chunks:
+            if chunk.index in fresh:
+                chunk_results.append(fresh[chunk.index])
+                continue
+            section = plan.reused[chunk.index]
+            chunk_results.append(InvocationResult(
+                model_type=ModelType.DEEPSEEK,
+                result=self.revision_tracker.shifted_result(section, chunk),
+                confidence=section['confidence'],
+                execution_time=0.0,
+                metadata={"task_type": task_type, "reused": True}
+            ))
+
+        self.revision_tracker.remember(plan, {
+            chunk.index: (result.result, result.confidence)
+            for chunk, result in zip(plan.chunks, chunk_results)
+            if result.confidence > 0.0 and 'error' not in result.metadata
+        })
+
+        result = self._merge_chunk_results(plan.chunks, chunk_results, task_type, time.time() - start_time)
+        reused_tokens = sum(chunk.tokens for chunk in plan.chunks if chunk.index in plan.reused)
+        result.metadata['incremental'] = {
+            'filename': filename,
+            'previous_revision': plan.previous_revision,
+            'sections': len(plan.chunks),
+            'reused_sections': len(plan.reused),
+            'analysed_sections': len(plan.pending),
+            'reused_lines': sum(chunk.end_line - chunk.start_line + 1
+                                for chunk in plan.chunks if chunk.index in plan.reused),
+            'tokens_avoided': reused_tokens
+        }
+        self.metrics['incremental_tokens_avoided'] += reused_tokens
+        self._attach_compaction(result, compaction)
+        return result
+
+    @staticmethod
+    def _scroll_identity(user_id: Optional[str], filename: Optional[str]) -> Optional[Tuple[str, str]]:
+        """(user, file) a scroll's revisions are tracked under, or None for anonymous pastes"""
+        return (user_id or 'anonymous', filename) if filename else None
+
+    def _revision_record_key(self, task_type: str, identity: Tuple[str, str]) -> str:
+        """Revision tracker key of one user's file for one task"""
+        user_id, filename = identity
+        return self.revision_tracker.record_key(user_id, filename, task_type, self._prompt_version(task_type))
+
+    def _is_revision_candidate(self, code_content: str, identity: Optional[Tuple[str, str]]) -> bool:
+        return (identity is not None and self.revision_tracker is not None
+                and estimate_tokens(code_content) >= self.config.INCREMENTAL_MIN_TOKENS)
+
+    def _tracks_revisions(self, code_content: str, task_type: str, identity: Optional[Tuple[str, str]]) -> bool:
+        """
+        Whether a scroll goes through incremental re-analysis
+
+        Only a re-upload of a file already on record does - a first upload
+        takes the normal path (streamed, or chunked past CHUNKING_THRESHOLD).
+        """
+        return (self._is_revision_candidate(code_content, identity)
+                and self.revision_tracker.has_record(self._revision_record_key(task_type, identity)))
+
+    def _open_revision_record(self, code_content: str, task_type: str,
+                              identity: Optional[Tuple[str, str]], result: InvocationResult):
+        """Put a file on record after its first successful analysis, so its next upload goes incremental"""
+        if (not self._is_revision_candidate(code_content, identity)
+                or result.confidence <= 0.0 or 'error' in result.metadata):
+            return
+        record_key = self._revision_record_key(task_type, identity)
+        if not self.revision_tracker.has_record(record_key):
+            self.revision_tracker.open_record(record_key)
+
+    def _merge_chunk_results(self, chunks: List[ScrollChunk], chunk_results: List[InvocationResult],
+                             task_type: str, execution_time: float) -> InvocationResult:
+        """Merge per-chunk findings into one result ordered by source line"""
+        sections = []
+        line_map = []
+        weighted_confidence = 0.0
+        total_weight = 0
+        tokens_used = 0
+        failed_chunks = 0
+
+        for chunk, result in sorted(zip(chunks, chunk_results), key=lambda pair: pair[0].start_line):
+            names = ", ".join(chunk.unit_names[:3]) + ("…" if len(chunk.unit_names) > 3 else "")
+            sections.append(f"### Lines {chunk.start_line}-{chunk.end_line} ({names})\n{result.result}")
+
+            failed = 'error' in result.metadata
+            failed_chunks += failed
+            weighted_confidence += result.confidence * chunk.tokens
+            total_weight += chunk.tokens
+            tokens_used += result.metadata.get('tokens_used', 0)
+
+            line_map.append({
+                'chunk': chunk.index,
+                'start_line': chunk.start_line,
+                'end_line': chunk.end_line,
+                'units': chunk.unit_names,
+                'confidence': result.confidence,
+                'failed': failed
+            })
+
+        metadata = {
+            "task_type": task_type,
+            "tokens_used": tokens_used,
+            "model": self.config.DEEPSEEK_MODEL,
+            "chunked": True,
+            "chunk_count": len(chunks),
+            "failed_chunks": failed_chunks,
+            "line_map": line_map
+        }
+        if failed_chunks == len(chunks):
+            metadata["error"] = "All chunk invocations failed"
+            metadata["unavailable"] = all(result.metadata.get('unavailable') for result in chunk_results)
 
         return InvocationResult(
-            model_type=ModelType.XGBOOST,
-            result=result,
-            confidence=0.85,
+            model_type=ModelType.DEEPSEEK,
+            result="\n\n".join(sections),
+            confidence=weighted_confidence / total_weight if total_weight else 0.0,
+            execution_time=execution_time,
+            metadata=metadata
+        )
+
+    def _prompt_version(self, task_type: str) -> str:
+        """Short fingerprint of the system prompt so prompt edits invalidate the cache"""
+        prompt = self._craft_system_prompt(task_type)
+        if self.prompt_compactor is not None:
+            prompt += f"\ncompaction:{COMPACTOR_VERSION}"
+        if task_type == "cleanse" and self.import_analyzer is not None:
+            prompt += f"\nstatic:{IMPORT_ANALYZER_VERSION}"
+        elif task_type == "inspect" and self.variable_inspector is not None:
+            prompt += f"\nstatic:{VARIABLE_INSPECTOR_VERSION}"
+        return hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:12]
+
+    @staticmethod
+    def _code_hash(code_content: str) -> str:
+        """Stable hash of a scroll's contents"""
+        return hashlib.sha256(code_content.encode('utf-8')).hexdigest()
+
+    def _cache_key(self, code_content: str, task_type: str, file_extension: str = ".py") -> str:
+        """Content address for a scroll invocation"""
+        return ScrollResultCache.make_key(
+            code_content, task_type, self.config.DEEPSEEK_MODEL, self._prompt_version(task_type), file_extension
+        )
+
+    def _lookup_cached_result(self, cache_key: str) -> Optional[InvocationResult]:
+        """Return a cached result marked as a hit, if one exists"""
+        if self.result_cache is None:
+            return None
+
+        import time
+        start_time = time.time()
+
+        payload = self.result_cache.get(cache_key)
+        if payload is None:
+            return None
+
+        result = InvocationResult.from_dict(payload)
+        result.metadata['cache'] = 'hit'
+        result.metadata['original_execution_time'] = result.execution_time
+        result.execution_time = time.time() - start_time
+        return result
+
+    def _store_cached_result(self, cache_key: str, result: InvocationResult):
+        """Cache successful results only - failures must be retried, exploratory answers must not stick"""
+        if self.result_cache is None:
+            return
+
+        result.metadata['cache'] = 'miss'
+        explored = (result.metadata.get('router') or {}).get('reason') == 'explore'
+        if (result.confidence > 0.0 and 'error' not in result.metadata and 'fallback' not in result.metadata
+                and 'retrieved' not in result.metadata and not result.metadata.get('failed_chunks')
+                and not explored):
+            self.result_cache.put(cache_key, result.to_dict())
+
+    def _retrieve_fix(self, code_content: str, task_type: str,
+                      user_id: Optional[str]) -> Tuple[Optional[InvocationResult], Optional[InvocationResult]]:
+        """
+        🗂️ The user's own past answer for this scroll or a near-duplicate
+
+        Returns (answer, seed): an answer to serve as-is only when a past
+        scroll has the same tokens and literals (comments and layout aside),
+        otherwise a provisional seed when the nearest past scroll reaches
+        FIX_INDEX_SEED_SIMILARITY. A seed is never returned as the result.
+        Anonymous scrolls are not looked up.
+        """
+        if self.fix_index is None or user_id is None:
+            return None, None
+
+        start_time = time.time()
+        group = (user_id, task_type, self.config.DEEPSEEK_MODEL, self._prompt_version(task_type))
+        match = self.fix_index.lookup(code_content, *group)
+        reuse = match is not None
+        if match is None:
+            match = self.fix_index.search(code_content, *group,
+                                          min_similarity=self.config.FIX_INDEX_SEED_SIMILARITY)
+        if match is None:
+            return None, None
+
+        entry = match.entry
+        result = InvocationResult(
+            model_type=ModelType(entry['model_type']),
+            result=entry['result'],
+            confidence=entry['confidence'] * match.similarity,
             execution_time=time.time() - start_time,
-            metadata={"task_type": task_type}
+            metadata={
+                "task_type": task_type,
+                "retrieved": {
+                    'similarity': round(match.similarity, 4),
+                    'source_hash': entry['code_hash'],
+                    'indexed_at': entry['stored_at']
+                }
+            }
+        )
+
+        if reuse:
+            self.metrics['fix_index_answers'] += 1
+            self.logger.info(f"🗂️ Serving {task_type} answer from a past fix of the same scroll")
+            return result, None
+
+        self.metrics['fix_index_seeds'] += 1
+        result.metadata['provisional'] = True
+        return None, result
+
+    def _index_fix(self, code_content: str, task_type: str, result: InvocationResult, user_id: Optional[str]):
+        """Add an accepted DeepSeek answer to the user's part of the fix index"""
+        if (self.fix_index is None or user_id is None or result.model_type != ModelType.DEEPSEEK
+                or result.confidence <= 0.0 or 'error' in result.metadata or 'fallback' in result.metadata
+                or 'retrieved' in result.metadata or result.metadata.get('failed_chunks')):
+            return
+
+        try:
+            self.fix_index.append(code_content, {
+                'user_id': user_id,
+                'task_type': task_type,
+                'model': self.config.DEEPSEEK_MODEL,
+                'prompt_version': self._prompt_version(task_type),
+                'code_hash': self._code_hash(code_content),
+                'model_type': result.model_type.value,
+                'result': result.result,
+                'confidence': result.confidence,
+                'stored_at': time.time()
+            })
+        except OSError as e:
+            self.logger.warning(f"⚠️ Fix index append failed: {e}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get engine-level performance metrics"""
+        with self._in_flight_lock:
+            in_flight = len(self._in_flight)
+
+        return {
+            **self.metrics,
+            'engine_ready_seconds': self.ready_at - self.created_at,
+            'loaded_models': sorted(model_type.value for model_type in self.models),
+            'model_load_seconds': dict(self.model_load_seconds),
+            'model_versions': dict(self.model_versions),
+            'pytorch_quantization': self.pytorch_quantization,
+            'in_flight_invocations': in_flight,
+            'transport': self.transport.get_metrics(),
+            'pytorch_batcher': self.pytorch_batcher.get_metrics(),
+            'analysis_pool': self.analysis_pool.get_metrics(),
+            'variable_inspector': self.variable_inspector.get_metrics() if self.variable_inspector else None,
+            'result_cache': self.result_cache.get_metrics() if self.result_cache else None,
+            'fix_index': self.fix_index.get_metrics() if self.fix_index else None,
+            'router': self.router.get_metrics(),
+            'model_concurrency': self.model_limiter.get_metrics()
+        }
+
+    def _invoke_static(self, code_content: str, task_type: str, file_extension: str = ".py") -> Optional[InvocationResult]:
+        """
+        🧹 Deterministic cleanse or inspect - no model, no network
+
+        Returns None when static analysis is disabled, the task has no static
+        analyser, the language is not supported or the scroll does not parse.
+        """
+        analyzer = {"cleanse": self.import_analyzer, "inspect": self.variable_inspector}.get(task_type)
+        if analyzer is None:
+            return None
+
+        report = analyzer.analyze(code_content, file_extension)
+        if report is None:
+            return None
+
+        return InvocationResult(
+            model_type=ModelType.STATIC,
+            result=analyzer.render(report),
+            confidence=report.confidence,
+            execution_time=report.elapsed_ms / 1000,
+            metadata={
+                "task_type": task_type,
+                "language": report.language,
+                "findings": [finding.to_dict() for finding in report.findings],
+                "finding_counts": report.counts(),
+                "static_cache": "hit" if report.cached else "miss"
+            }
         )
 
-    def _invoke_pytorch(self, code_content: str, task_type: str) -> InvocationResult:
-        """Invoke PyTorch for deep analysis"""
+    async def _invoke_xgboost(self, code_content: str, task_type: str, file_extension: str = ".py") -> InvocationResult:
+        """Invoke XGBoost for classification tasks"""
+        return (await self.score_scrolls([code_content], task_type, [file_extension]))[0]
+
+    async def score_scrolls(self, code_contents: Sequence[str], task_type: str = "cleanse",
+                            file_extensions: Optional[Sequence[str]] = None) -> List[InvocationResult]:
+        """
+        🧮 Score a batch of scrolls with one predict_proba call
+
+        Features are extracted across the process pool, so a large batch
+        scales with cores.
+        """
         import time
         start_time = time.time()
 
-        # Simplified PyTorch invocation for pattern recognition
-        # In production, this would use embeddings and neural networks
-        result = f"PyTorch analysis for {task_type}: Patterns identified in code"
+        features = await self.analysis_pool.vectorize('features', code_contents, file_extensions)
+        probabilities, scoring = self._cleanse_probabilities(features)
+        execution_time = time.time() - start_time
+
+        results = []
+        for row, probability in zip(features, probabilities):
+            summary = self.feature_extractor.describe(row)
+            probability = float(probability)
+
+            results.append(InvocationResult(
+                model_type=ModelType.XGBOOST,
+                result=self._format_cleanse_summary(probability, summary),
+                confidence=max(probability, 1.0 - probability),
+                execution_time=execution_time / len(code_contents),
+                metadata={
+                    "task_type": task_type,
+                    "cleanse_probability": probability,
+                    "scoring": scoring,
+                    "batch_size": len(code_contents),
+                    "features": summary
+                }
+            ))
+
+        return results
+
+    def _cleanse_probabilities(self, features: np.ndarray) -> Tuple[np.ndarray, str]:
+        """Probability that each scroll needs import cleansing"""
+        model = self._get_model(ModelType.XGBOOST)
+        if self._is_fitted(model):
+            return model.predict_proba(features)[:, 1], "model"
+
+        # Untrained classifier - fall back to a vectorized heuristic on the import features
+        names = self.feature_extractor.feature_names
+        column = {name: features[:, names.index(name)] for name in (
+            'unreferenced_imports', 'duplicate_imports', 'star_imports', 'imported_names'
+        )}
+        logits = (-2.0
+                  + 1.5 * column['unreferenced_imports']
+                  + 1.0 * column['duplicate_imports']
+                  + 1.0 * column['star_imports']
+                  + 0.02 * column['imported_names'])
+        return 1.0 / (1.0 + np.exp(-logits)), "heuristic"
+
+    @staticmethod
+    def _is_fitted(model) -> bool:
+        """Whether an XGBoost classifier has a trained booster"""
+        try:
+            model.get_booster()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _format_cleanse_summary(probability: float, summary: Dict[str, float]) -> str:
+        """Human-readable cleanse verdict"""
+        lines = [f"🔮 Import purity check: {probability:.0%} likely to need cleansing"]
+        if summary['unreferenced_imports']:
+            lines.append(f"• {int(summary['unreferenced_imports'])} imported name(s) never referenced")
+        if summary['duplicate_imports']:
+            lines.append(f"• {int(summary['duplicate_imports'])} duplicate import(s)")
+        if summary['star_imports']:
+            lines.append(f"• {int(summary['star_imports'])} star import(s)")
+        lines.append(
+            f"• {int(summary['import_statements'])} import statement(s), "
+            f"cyclomatic complexity {int(summary['cyclomatic_complexity'])}, "
+            f"max nesting depth {int(summary['max_nesting_depth'])}"
+        )
+        return "\n".join(lines)
+
+    async def _invoke_pytorch(self, code_content: str, task_type: str, file_extension: str = ".py") -> InvocationResult:
+        """
+        Invoke PyTorch for deep analysis through the micro-batching queue
+
+        Without a saved checkpoint the network's weights are random, so its
+        label ranking means nothing - no patterns are reported and the
+        result carries zero confidence so the cascade and router look elsewhere.
+        """
+        import time
+        start_time = time.time()
+
+        if not self._has_checkpoint(ModelType.PYTORCH):
+            return InvocationResult(
+                model_type=ModelType.PYTORCH,
+                result="👁️ No trained inspection model is loaded - pattern findings are unavailable",
+                confidence=0.0,
+                execution_time=time.time() - start_time,
+                metadata={"task_type": task_type, "top_patterns": {}, "untrained": True}
+            )
+
+        features = (await self.analysis_pool.vectorize('encode', [code_content], [file_extension]))[0]
+        probabilities = await self.pytorch_batcher.infer(features)
+
+        ranked = np.argsort(probabilities)[::-1][:3]
+        top_patterns = {INSPECTION_LABELS[i]: float(probabilities[i]) for i in ranked}
+
+        lines = ["👁️ Variable inspection patterns:"]
+        lines.extend(f"• {label.replace('_', ' ')}: {p:.0%}" for label, p in top_patterns.items())
 
         return InvocationResult(
             model_type=ModelType.PYTORCH,
-            result=result,
-            confidence=0.80,
+            result="\n".join(lines),
+            confidence=float(probabilities[ranked[0]]),
             execution_time=time.time() - start_time,
-            metadata={"task_type": task_type}
+            metadata={"task_type": task_type, "top_patterns": top_patterns}
         )
+
+    def _has_checkpoint(self, model_type: ModelType) -> bool:
+        """Whether a local model's weights come from a saved artifact rather than random initialisation"""
+        if model_type in self.models:
+            return self.model_versions.get(model_type.value) is not None
+        return self.model_store.active_version(model_type.value) is not None
+
+    def _pytorch_forward(self, inputs: np.ndarray) -> np.ndarray:
+        """One batched forward pass - runs on the micro-batcher thread"""
+        import torch
+
+        model = self._get_model(ModelType.PYTORCH)
+        with torch.inference_mode():
+            logits = model(torch.from_numpy(inputs))
+            return torch.softmax(logits, dim=1).numpy()
@@ -0,0 +1,150 @@
+"""
+🔱 Incremental Analysis - Sacred Memory of Scroll Revisions
+Re-analyses only the parts of a re-uploaded scroll that changed
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Tuple
+
+from .result_cache import ScrollResultCache
+from .scroll_chunker import ScrollChunker, ScrollChunk
+
+# Tasks whose findings depend on the shared imports/globals, not just the unit itself
+CONTEXT_SENSITIVE_TASKS = frozenset({'cleanse'})
+MAX_REFERENCED_DEFINITIONS = 20
+
+_IDENTIFIER = re.compile(r'[A-Za-z_$][\w$]*')
+_SIGNATURE = re.compile(r'^\s*(?:export\s+)?(?:async\s+)?(?:def|class|function)\b')
+_LINE_REFERENCE = re.compile(r'\b(lines?\s+|L)(\d+)(?:(\s*[-–]\s*)(\d+))?', re.IGNORECASE)
+
+@dataclass
+class RevisionPlan:
+    """How one upload of a tracked scroll splits into reused and pending sections"""
+    record_key: str
+    chunks: List[ScrollChunk]
+    section_keys: List[str]
+    reused: Dict[int, Dict[str, Any]] = field(default_factory=dict)  # chunk index -> stored section
+    pending: List[ScrollChunk] = field(default_factory=list)  # chunks to analyse, with dependency context
+    previous_revision: bool = False
+
+class ScrollRevisionTracker:
+    """
+    🧬 Per-user, per-file record of section findings
+
+    A tracked scroll is split with content-defined chunk boundaries, and each
+    chunk is identified by the digests of its units. On re-upload, chunks
+    whose units are unchanged reuse their stored findings (line references
+    shifted to the new positions); only the rest go back to DeepSeek, along
+    with the signatures of the definitions they reference.
+    """
+
+    def __init__(self, store: ScrollResultCache, token_budget: int = 1500, boundary_modulus: int = 4):
+        self.store = store
+        self.chunker = ScrollChunker(token_budget)
+        self.boundary_modulus = boundary_modulus
+
+    @staticmethod
+    def record_key(user_id: str, filename: str, task_type: str, prompt_version: str) -> str:
+        """Storage key of one user's file for one task"""
+        material = f"{user_id}|{filename}|{task_type}|{prompt_version}"
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def has_record(self, record_key: str) -> bool:
+        """Whether an earlier revision of this file was analysed"""
+        return self.store.get(record_key) is not None
+
+    def open_record(self, record_key: str):
+        """Put a file on record with no sections yet, so its next upload is planned section by section"""
+        self.store.put(record_key, {'sections': {}})
+
+    def plan(self, code_content: str, file_extension: str, task_type: str, record_key: str) -> RevisionPlan:
+        """Match the new revision's chunks against the stored sections"""
+        chunks = self.chunker.split(code_content, file_extension, boundary_modulus=self.boundary_modulus)
+        record = self.store.get(record_key)
+        sections = record['sections'] if record else {}
+
+        plan = RevisionPlan(
+            record_key=record_key,
+            chunks=chunks,
+            section_keys=[self._section_key(chunk, task_type) for chunk in chunks],
+            previous_revision=record is not None
+        )
+
+        _, units = self.chunker.split_units(code_content, file_extension)
+        for chunk, key in zip(chunks, plan.section_keys):
+            stored = sections.get(key)
+            if stored is not None:
+                plan.reused[chunk.index] = stored
+            else:
+                plan.pending.append(self._with_dependencies(chunk, units))
+
+        return plan
+
+    def remember(self, plan: RevisionPlan, findings: Dict[int, Tuple[str, float]]):
+        """Store this revision's sections; chunks without findings are analysed again next time"""
+        sections = {}
+        for chunk, key in zip(plan.chunks, plan.section_keys):
+            if chunk.index not in findings:
+                continue
+            result, confidence = findings[chunk.index]
+            sections[key] = {
+                'start_line': chunk.start_line,
+                'end_line': chunk.end_line,
+                'result': result,
+                'confidence': confidence
+            }
+        self.store.put(plan.record_key, {'sections': sections})
+
+    @staticmethod
+    def shifted_result(section: Dict[str, Any], chunk: ScrollChunk) -> str:
+        """Stored findings with line references moved to the chunk's new position"""
+        delta = chunk.start_line - section['start_line']
+        if delta == 0:
+            return section['result']
+
+        def shift(number: str) -> str:
+            value = int(number)
+            if section['start_line'] <= value <= section['end_line']:
+                value += delta
+            return str(value)
+
+        def substitute(match):
+            text = match.group(1) + shift(match.group(2))
+            if match.group(4):
+                text += match.group(3) + shift(match.group(4))
+            return text
+
+        return _LINE_REFERENCE.sub(substitute, section['result'])
+
+    @staticmethod
+    def _section_key(chunk: ScrollChunk, task_type: str) -> str:
+        """Identity of a chunk's content, independent of its position"""
+        parts = [unit.digest for unit in chunk.units] + [chunk.prefix]
+        if task_type in CONTEXT_SENSITIVE_TASKS:
+            parts.append(chunk.context)
+        return hashlib.sha256("|".join(parts).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _with_dependencies(chunk: ScrollChunk, units) -> ScrollChunk:
+        """Add the signatures of definitions elsewhere in the file that the chunk references"""
+        names = set()
+        for unit in chunk.units:
+            names.update(_IDENTIFIER.findall(unit.source))
+
+        own = {(unit.start_line, unit.end_line) for unit in chunk.units}
+        signatures = [
+            next((line.strip() for line in unit.source.splitlines() if _SIGNATURE.match(line)),
+                 unit.source.splitlines()[0].strip())
+            for unit in units
+            if unit.kind in ('function', 'class') and unit.name in names
+            and (unit.start_line, unit.end_line) not in own
+            and not any(start <= unit.start_line and unit.end_line <= end for start, end in own)
+        ][:MAX_REFERENCED_DEFINITIONS]
+
+        if not signatures:
+            return chunk
+
+        referenced = "Definitions referenced from elsewhere in the file:\n" + "\n".join(signatures)
+        return replace(chunk, context=f"{chunk.context}\n\n{referenced}" if chunk.context else referenced)
@@ -0,0 +1,157 @@
+"""
+🔱 Inference Batcher - Sacred Gathering of Invocations
+Dynamic micro-batching so concurrent local-model requests share one forward pass
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+@dataclass
+class _BatchItem:
+    """One pending inference request"""
+    features: np.ndarray
+    future: Future = field(default_factory=Future)
+
+class MicroBatcher:
+    """
+    📦 Collects concurrent requests into batched inference calls
+
+    A single worker thread takes the first waiting request, keeps gathering
+    until ``max_batch_size`` requests are queued or ``max_wait_ms`` has passed,
+    then runs ``infer_fn`` once on the stacked inputs. Callers on any thread
+    or event loop receive their own output row.
+    """
+
+    def __init__(self, infer_fn: Callable[[np.ndarray], np.ndarray],
+                 max_batch_size: int = 32, max_wait_ms: float = 5.0, name: str = "batcher"):
+        self.logger = logging.getLogger(__name__)
+        self.infer_fn = infer_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+
+        self._queue: "queue.Queue[_BatchItem]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+
+        self._batch_sizes: Counter = Counter()
+        self._batch_latencies_ms: deque = deque(maxlen=1000)
+        self.metrics = {
+            'requests': 0,
+            'batches': 0,
+            'failed_batches': 0
+        }
+
+    def _ensure_started(self):
+        """Start the batching thread on first use"""
+        if self._thread is not None:
+            return
+
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"{self.name}-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, features: np.ndarray) -> Future:
+        """Queue one input row and return a Future for its output row"""
+        self._ensure_started()
+        item = _BatchItem(features)
+        self._queue.put(item)
+        return item.future
+
+    async def infer(self, features: np.ndarray) -> np.ndarray:
+        """Await the output row for one input row"""
+        return await asyncio.wrap_future(self.submit(features))
+
+    def _collect_batch(self) -> List[_BatchItem]:
+        """Block for the first request, then gather more until full or the wait expires"""
+        batch = []
+        while not batch:
+            self._claim(self._queue.get(), batch)
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                self._claim(self._queue.get(timeout=remaining), batch)
+            except queue.Empty:
+                break
+
+        return batch
+
+    @staticmethod
+    def _claim(item: _BatchItem, batch: List[_BatchItem]):
+        """Add a request to the batch unless its caller already cancelled it"""
+        if item.future.set_running_or_notify_cancel():
+            batch.append(item)
+
+    def _deliver(self, item: _BatchItem, output: Any = None, error: Optional[BaseException] = None):
+        """Resolve one caller's Future - a failed delivery must not end the batching thread"""
+        try:
+            if error is not None:
+                item.future.set_exception(error)
+            else:
+                item.future.set_result(output)
+        except Exception as e:
+            self.logger.warning(f"⚠️ {self.name} could not deliver a batch result: {e}")
+
+    def _run(self):
+        """Batching thread body"""
+        while True:
+            batch = self._collect_batch()
+            start_time = time.perf_counter()
+
+            try:
+                outputs = self.infer_fn(np.stack([item.features for item in batch]))
+            except Exception as e:
+                self.logger.error(f"💀 {self.name} batch of {len(batch)} failed: {e}")
+                with self._metrics_lock:
+                    self.metrics['failed_batches'] += 1
+                for item in batch:
+                    self._deliver(item, error=e)
+                continue
+
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            with self._metrics_lock:
+                self.metrics['requests'] += len(batch)
+                self.metrics['batches'] += 1
+                self._batch_sizes[len(batch)] += 1
+                self._batch_latencies_ms.append(latency_ms)
+
+            for item, output in zip(batch, outputs):
+                self._deliver(item, output)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Batch-size histogram and per-batch latency for throughput tuning"""
+        with self._metrics_lock:
+            latencies = sorted(self._batch_latencies_ms)
+            batches = self.metrics['batches']
+
+            return {
+                **self.metrics,
+                'queue_depth': self._queue.qsize(),
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000,
+                'mean_batch_size': self.metrics['requests'] / batches if batches else 0.0,
+                'batch_size_histogram': dict(sorted(self._batch_sizes.items())),
+                'batch_latency_ms': {
+                    'mean': sum(latencies) / len(latencies) if latencies else 0.0,
+                    'p50': latencies[len(latencies) // 2] if latencies else 0.0,
+                    'p95': latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+                    'max': latencies[-1] if latencies else 0.0
+                }
+            }
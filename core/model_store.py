@@ -0,0 +1,197 @@
+"""
+🔱 Model Store - Sacred Artifact Vault
+Versioned on-disk XGBoost and PyTorch artifacts, loaded without extra copies
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Artifact file formats per model family
+ARTIFACT_FORMATS = {
+    'xgboost': 'ubj',          # XGBoost's binary UBJSON model format
+    'pytorch': 'state_dict'    # torch.save of the module's state_dict
+}
+ARTIFACT_SUFFIXES = {'ubj': '.ubj', 'state_dict': '.pt'}
+
+class ModelArtifactStore:
+    """
+    🗄️ Versioned model artifacts under one directory
+
+    Layout::
+
+        models/manifest.json
+        models/xgboost/<version>.ubj
+        models/pytorch/<version>.pt
+
+    The manifest records every version (file, size, sha256, created_at) and
+    the active version per model. It is rewritten atomically, so a reader in
+    another process always sees either the old or the new manifest; engines
+    poll it to pick up a newly activated version.
+    """
+
+    def __init__(self, root: Path):
+        self.logger = logging.getLogger(__name__)
+        self.root = Path(root)
+        self.manifest_path = self.root / 'manifest.json'
+        self._lock = threading.Lock()
+
+    def read_manifest(self) -> Dict[str, Any]:
+        """Current manifest (an empty one when nothing has been saved yet)"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'revision': 0, 'models': {}}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"⚠️ Unreadable model manifest {self.manifest_path}: {e}")
+            return {'revision': 0, 'models': {}}
+
+    def manifest_mtime(self) -> Optional[float]:
+        """Modification time of the manifest - a cheap change check"""
+        try:
+            return self.manifest_path.stat().st_mtime
+        except OSError:
+            return None
+
+    def active_version(self, model_name: str) -> Optional[str]:
+        """Active version of a model, or None when no artifact exists"""
+        return self.read_manifest()['models'].get(model_name, {}).get('active')
+
+    def list_versions(self, model_name: str) -> Dict[str, Dict[str, Any]]:
+        """All recorded versions of a model"""
+        return dict(self.read_manifest()['models'].get(model_name, {}).get('versions', {}))
+
+    def save_xgboost(self, model, version: Optional[str] = None, activate: bool = True) -> Dict[str, Any]:
+        """Write a fitted XGBoost classifier as UBJSON"""
+        return self._save('xgboost', version, activate, lambda path: model.save_model(str(path)))
+
+    def save_pytorch(self, model, version: Optional[str] = None, activate: bool = True) -> Dict[str, Any]:
+        """Write a PyTorch module's state_dict"""
+        import torch
+        return self._save('pytorch', version, activate, lambda path: torch.save(model.state_dict(), path))
+
+    def load_xgboost(self, model, version: Optional[str] = None):
+        """
+        Load UBJSON weights into an XGBoost classifier
+
+        XGBoost is given the path and reads the file itself (the .ubj suffix
+        selects the format), so no Python-side copy of it is made.
+        Returns the loaded version, or None when there is no artifact.
+        """
+        entry = self._resolve('xgboost', version)
+        if entry is None:
+            return None
+
+        model.load_model(str(self.root / entry['file']))
+        return entry['version']
+
+    def load_pytorch(self, model, version: Optional[str] = None):
+        """
+        Load a state_dict into a PyTorch module
+
+        Tensors are memory-mapped from the artifact and assigned directly, so
+        worker processes loading the same version share the weight pages
+        through the OS page cache. Returns the loaded version or None.
+        """
+        import torch
+
+        entry = self._resolve('pytorch', version)
+        if entry is None:
+            return None
+
+        state_dict = torch.load(self.root / entry['file'], map_location='cpu', mmap=True, weights_only=True)
+        model.load_state_dict(state_dict, assign=True)
+        return entry['version']
+
+    def activate(self, model_name: str, version: str):
+        """Point a model at an existing version"""
+        with self._lock:
+            manifest = self.read_manifest()
+            versions = manifest['models'].get(model_name, {}).get('versions', {})
+            if version not in versions:
+                raise KeyError(f"No {model_name} artifact version {version!r}")
+
+            manifest['models'][model_name]['active'] = version
+            self._write_manifest(manifest)
+
+        self.logger.info(f"✨ {model_name} artifact {version} activated")
+
+    def verify(self, model_name: str, version: Optional[str] = None) -> bool:
+        """Check an artifact's sha256 against the manifest"""
+        entry = self._resolve(model_name, version)
+        return entry is not None and self._file_digest(self.root / entry['file']) == entry['sha256']
+
+    def _resolve(self, model_name: str, version: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Manifest entry for a version (the active one by default)"""
+        record = self.read_manifest()['models'].get(model_name, {})
+        version = version or record.get('active')
+        if version is None:
+            return None
+
+        entry = record.get('versions', {}).get(version)
+        if entry is None:
+            raise KeyError(f"No {model_name} artifact version {version!r}")
+        return entry
+
+    def _save(self, model_name: str, version: Optional[str], activate: bool, write) -> Dict[str, Any]:
+        """Write an artifact file, then record it in the manifest"""
+        artifact_format = ARTIFACT_FORMATS[model_name]
+        version = version or time.strftime('v%Y%m%d-%H%M%S')
+        relative = Path(model_name) / f"{version}{ARTIFACT_SUFFIXES[artifact_format]}"
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write beside the target and rename, so a loader never maps a half-written file
+        tmp_path = path.with_name(f".tmp-{os.getpid()}-{path.name}")  # Keeps the suffix XGBoost keys its format on
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        entry = {
+            'version': version,
+            'file': relative.as_posix(),
+            'format': artifact_format,
+            'size_bytes': path.stat().st_size,
+            'sha256': self._file_digest(path),
+            'created_at': time.time()
+        }
+
+        with self._lock:
+            manifest = self.read_manifest()
+            record = manifest['models'].setdefault(model_name, {'active': None, 'versions': {}})
+            record['versions'][version] = entry
+            if activate or record.get('active') is None:
+                record['active'] = version
+            self._write_manifest(manifest)
+
+        self.logger.info(f"💾 Saved {model_name} artifact {version} ({entry['size_bytes']} bytes)")
+        return entry
+
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        """Atomically replace the manifest, bumping its revision"""
+        manifest['revision'] = manifest.get('revision', 0) + 1
+        manifest['updated_at'] = time.time()
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_name(f".manifest.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def _file_digest(path: Path) -> str:
+        """sha256 of a file"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
@@ -0,0 +1,267 @@
+"""
+🔱 Process Pool - Sacred Parallel Scribes
+Warm worker processes for the CPU-bound local passes, fed through shared memory
+"""
+
+import asyncio
+import atexit
+import logging
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .feature_extraction import ScrollFeatureExtractor, ScrollEncoder
+
+# Vectorizers of the current worker process, built once by _warm_worker
+_vectorizers: Dict[str, Any] = {}
+
+def _warm_worker(encoder_dim: int):
+    """Worker initializer - import the analysers and build the vectorizers once"""
+    _vectorizers['features'] = ScrollFeatureExtractor()
+    _vectorizers['encode'] = ScrollEncoder(input_dim=encoder_dim)
+
+    # One throwaway pass so the first real task does not pay for lazy setup
+    for vectorizer in _vectorizers.values():
+        _vectorize(vectorizer, "import os\n\ndef warm(x):\n    return os.path.join(x, x)\n", ".py")
+
+def _vectorize(vectorizer, code_content: str, file_extension: str) -> np.ndarray:
+    if isinstance(vectorizer, ScrollEncoder):
+        return vectorizer.encode(code_content, file_extension)
+    return vectorizer.extract(code_content, file_extension)
+
+def _ping() -> int:
+    return multiprocessing.current_process().pid
+
+def _vectorize_slice(kind: str, source_name: str, output_name: str, width: int, total_rows: int,
+                     rows: List[Tuple[int, int, int, str]]) -> int:
+    """
+    Worker task - vectorize a slice of a batch
+
+    Scroll bytes are read straight out of the source segment and each
+    vector is written into its row of the output segment, so neither the
+    scrolls nor the matrix are pickled through the pool's pipes.
+    """
+    vectorizer = _vectorizers[kind]
+    source = shared_memory.SharedMemory(name=source_name)
+    output = shared_memory.SharedMemory(name=output_name)
+    try:
+        matrix = np.ndarray((total_rows, width), dtype=np.float32, buffer=output.buf)
+        for row, offset, length, file_extension in rows:
+            code_content = str(source.buf[offset:offset + length], 'utf-8')
+            matrix[row] = _vectorize(vectorizer, code_content, file_extension)
+        del matrix
+        return len(rows)
+    finally:
+        source.close()
+        output.close()
+
+class ScrollProcessPool:
+    """
+    🏭 Process-pool backend for feature extraction and encoding
+
+    AST parsing and tokenization hold the GIL, so the DataFlowManager
+    workers serialize on them in-process. The pool runs them in
+    ``workers`` warm processes instead: a batch's scrolls are packed into
+    one shared-memory segment, split into contiguous slices (one per
+    worker), and every worker writes its rows into a shared output matrix.
+    Batches under ``min_batch_bytes`` stay in-process, where the IPC round
+    trip would cost more than it saves, as does everything after the pool
+    breaks.
+    """
+
+    def __init__(self, workers: int, encoder_dim: int = 1000, min_batch_bytes: int = 16384,
+                 start_method: str = 'spawn'):
+        self.logger = logging.getLogger(__name__)
+        self.workers = workers
+        self.encoder_dim = encoder_dim
+        self.min_batch_bytes = min_batch_bytes
+        self.start_method = start_method
+
+        self._local = {
+            'features': ScrollFeatureExtractor(),
+            'encode': ScrollEncoder(input_dim=encoder_dim)
+        }
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._start_lock = threading.Lock()
+        self._broken = False
+
+        self._metrics_lock = threading.Lock()
+        self.metrics = {
+            'pool_batches': 0,
+            'pool_scrolls': 0,
+            'pool_bytes': 0,
+            'inline_batches': 0,
+            'inline_scrolls': 0,
+            'pool_failures': 0
+        }
+        self.warm_seconds: Optional[float] = None
+
+        atexit.register(self.shutdown)
+
+    def width(self, kind: str) -> int:
+        """Vector width produced for ``kind`` ('features' or 'encode')"""
+        vectorizer = self._local[kind]
+        return vectorizer.input_dim if isinstance(vectorizer, ScrollEncoder) else vectorizer.width
+
+    def start(self, wait: bool = False):
+        """Spawn and warm the workers - submit() does this for the first batch of ``min_batch_bytes`` or more"""
+        with self._start_lock:
+            if self._executor is not None or self._broken:
+                return
+
+            start_time = time.perf_counter()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_warm_worker,
+                initargs=(self.encoder_dim,)
+            )
+            # The executor starts processes lazily - one ping per worker brings them all up
+            pings = [self._executor.submit(_ping) for _ in range(self.workers)]
+
+        def record_warm():
+            try:
+                pids = {ping.result() for ping in pings}
+            except Exception as e:
+                self.logger.error(f"💀 Process pool failed to start, vectorizing in-process: {e}")
+                self._broken = True
+                return
+            self.warm_seconds = time.perf_counter() - start_time
+            self.logger.info(f"🏭 {len(pids)} warm analysis workers ready in {self.warm_seconds:.2f}s")
+
+        if wait:
+            record_warm()
+        else:
+            threading.Thread(target=record_warm, name="process-pool-warmup", daemon=True).start()
+
+    async def vectorize(self, kind: str, code_contents: Sequence[str],
+                        file_extensions: Optional[Sequence[str]] = None) -> np.ndarray:
+        """(n_scrolls x width) matrix of scroll features or encodings"""
+        return await asyncio.wrap_future(self.submit(kind, code_contents, file_extensions))
+
+    def submit(self, kind: str, code_contents: Sequence[str],
+               file_extensions: Optional[Sequence[str]] = None) -> Future:
+        """Thread-safe Future for a vectorized batch"""
+        file_extensions = file_extensions or [".py"] * len(code_contents)
+        encoded = [code_content.encode('utf-8') for code_content in code_contents]
+        total_bytes = sum(len(data) for data in encoded)
+
+        if self._broken or self.workers <= 0 or total_bytes < self.min_batch_bytes or not encoded:
+            return self._inline(kind, code_contents, file_extensions)
+
+        self.start()
+        try:
+            return self._dispatch(kind, encoded, file_extensions, total_bytes)
+        except (BrokenProcessPool, RuntimeError, OSError) as e:
+            self._mark_broken(e)
+            return self._inline(kind, code_contents, file_extensions)
+
+    def _inline(self, kind: str, code_contents: Sequence[str], file_extensions: Sequence[str]) -> Future:
+        future = Future()
+        vectorizer = self._local[kind]
+        matrix = np.zeros((len(code_contents), self.width(kind)), dtype=np.float32)
+        try:
+            for row, (code_content, file_extension) in enumerate(zip(code_contents, file_extensions)):
+                matrix[row] = _vectorize(vectorizer, code_content, file_extension)
+        except Exception as e:
+            future.set_exception(e)
+            return future
+
+        with self._metrics_lock:
+            self.metrics['inline_batches'] += 1
+            self.metrics['inline_scrolls'] += len(code_contents)
+        future.set_result(matrix)
+        return future
+
+    def _dispatch(self, kind: str, encoded: List[bytes], file_extensions: Sequence[str],
+                  total_bytes: int) -> Future:
+        """Pack a batch into shared memory and fan it out, one contiguous slice per worker"""
+        width = self.width(kind)
+        rows = len(encoded)
+        source = shared_memory.SharedMemory(create=True, size=max(1, total_bytes))
+        output = shared_memory.SharedMemory(create=True, size=rows * width * 4)
+
+        layout = []
+        offset = 0
+        for row, (data, file_extension) in enumerate(zip(encoded, file_extensions)):
+            source.buf[offset:offset + len(data)] = data
+            layout.append((row, offset, len(data), file_extension))
+            offset += len(data)
+
+        slice_size = math.ceil(rows / min(self.workers, rows))
+        try:
+            tasks = [
+                self._executor.submit(_vectorize_slice, kind, source.name, output.name, width, rows,
+                                      layout[start:start + slice_size])
+                for start in range(0, rows, slice_size)
+            ]
+        except BaseException:
+            self._release(source, output)
+            raise
+
+        result = Future()
+        pending = [len(tasks)]
+        pending_lock = threading.Lock()
+
+        def task_done(task: Future):
+            with pending_lock:
+                pending[0] -= 1
+                finished = pending[0] == 0
+            if not finished:
+                return
+
+            errors = [t.exception() for t in tasks if t.exception() is not None]
+            if errors:
+                self._release(source, output)
+                if isinstance(errors[0], BrokenProcessPool):
+                    self._mark_broken(errors[0])
+                result.set_exception(errors[0])
+                return
+
+            matrix = np.ndarray((rows, width), dtype=np.float32, buffer=output.buf).copy()
+            self._release(source, output)
+            with self._metrics_lock:
+                self.metrics['pool_batches'] += 1
+                self.metrics['pool_scrolls'] += rows
+                self.metrics['pool_bytes'] += total_bytes
+            result.set_result(matrix)
+
+        for task in tasks:
+            task.add_done_callback(task_done)
+        return result
+
+    @staticmethod
+    def _release(*segments: shared_memory.SharedMemory):
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+    def _mark_broken(self, error: BaseException):
+        self.logger.error(f"💀 Process pool broke, vectorizing in-process from now on: {error}")
+        with self._metrics_lock:
+            self.metrics['pool_failures'] += 1
+        self._broken = True
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._start_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            return {
+                **self.metrics,
+                'workers': self.workers,
+                'started': self._executor is not None,
+                'broken': self._broken,
+                'warm_seconds': self.warm_seconds
+            }
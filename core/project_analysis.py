@@ -0,0 +1,268 @@
+"""
+🔱 Project Analysis - Sacred Survey of Whole Codebases
+Walks a directory or archive and runs every scroll through the hybrid engine
+"""
+
+import asyncio
+import logging
+import tarfile
+import threading
+import time
+import zipfile
+from collections import Counter
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+
+@dataclass
+class ProjectFile:
+    """One scroll of a project, read only when its turn comes"""
+    path: str  # Relative, '/'-separated
+    file_extension: str
+    size: int
+    read: Callable[[], bytes] = field(repr=False)
+
+@dataclass
+class ProjectReport:
+    """Consolidated outcome of a project run"""
+    source: str
+    task_type: str
+    files: List[Dict[str, Any]] = field(default_factory=list)
+    skipped: List[Dict[str, Any]] = field(default_factory=list)
+    started_at: float = field(default_factory=time.time)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def files_per_minute(self) -> float:
+        return len(self.files) / self.elapsed_seconds * 60 if self.elapsed_seconds else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        analysed = [f for f in self.files if 'error' not in f]
+        return {
+            'files_analysed': len(analysed),
+            'files_failed': len(self.files) - len(analysed),
+            'files_skipped': len(self.skipped),
+            'elapsed_seconds': self.elapsed_seconds,
+            'files_per_minute': self.files_per_minute,
+            'mean_confidence': sum(f['confidence'] for f in analysed) / len(analysed) if analysed else 0.0,
+            'by_model': dict(Counter(f['model_type'] for f in analysed)),
+            'cache_hits': sum(1 for f in analysed if f.get('cache') == 'hit'),
+            'tokens_used': sum(f.get('tokens_used', 0) for f in analysed)
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'source': self.source,
+            'task_type': self.task_type,
+            'started_at': self.started_at,
+            'summary': self.summary(),
+            'files': self.files,
+            'skipped': self.skipped
+        }
+
+    def render(self) -> str:
+        """Human-readable report: totals first, then every file's findings"""
+        summary = self.summary()
+        lines = [
+            f"📦 {self.task_type.title()} report for {self.source}",
+            f"• {summary['files_analysed']} analysed, {summary['files_failed']} failed, "
+            f"{summary['files_skipped']} skipped in {summary['elapsed_seconds']:.1f}s "
+            f"({summary['files_per_minute']:.1f} files/min)",
+            "• Models: " + ", ".join(f"{model} {count}" for model, count in sorted(summary['by_model'].items())),
+            f"• Mean confidence {summary['mean_confidence']:.0%}, {summary['cache_hits']} cache hit(s)"
+        ]
+        for entry in sorted(self.files, key=lambda f: f['path']):
+            lines.append(f"\n### {entry['path']}")
+            if 'error' in entry:
+                lines.append(f"💀 {entry['error']}")
+            else:
+                lines.append(f"({entry['model_type']}, {entry['confidence']:.0%})\n{entry['result']}")
+        if self.skipped:
+            lines.append("\n### Skipped")
+            lines.extend(f"• {entry['path']}: {entry['reason']}" for entry in self.skipped)
+        return "\n".join(lines)
+
+class ProjectAnalyzer:
+    """
+    📦 Batch analysis of a directory or archive
+
+    Files are filtered by extension and by the tier's upload size limit,
+    then streamed through ``process_code_scroll`` by ``max_concurrent_files``
+    workers. Each worker reads its next file off the event loop only when it
+    is free, so a large project is never held in memory at once. The
+    engine's per-model limits cap how many of those reach each model at
+    once. ``on_progress`` receives one event when the run starts, one per
+    finished file and one at the end.
+    """
+
+    def __init__(self, engine, extensions: Sequence[str], max_concurrent_files: int = 8,
+                 skip_dirs: Sequence[str] = (), max_files: int = 5000):
+        self.logger = logging.getLogger(__name__)
+        self.engine = engine
+        self.extensions = tuple(extension.lower() for extension in extensions)
+        self.max_concurrent_files = max_concurrent_files
+        self.skip_dirs = frozenset(skip_dirs)
+        self.max_files = max_files
+
+    def collect(self, entries: Sequence[Tuple[str, int, Callable[[], bytes]]],
+                max_file_bytes: float) -> Tuple[List[ProjectFile], List[Dict[str, Any]]]:
+        """Pick the project's eligible files without reading them; returns (files, skipped)"""
+        files, skipped = [], []
+        for path, size, read in entries:
+            posix = PurePosixPath(path)
+            if any(part in self.skip_dirs or part.startswith('.') for part in posix.parts[:-1]):
+                continue
+            extension = posix.suffix.lower()
+            if extension not in self.extensions:
+                continue
+
+            if size > max_file_bytes:
+                skipped.append({'path': path, 'reason': f"{size / 1024:.0f} KB exceeds the tier's upload limit"})
+                continue
+            if len(files) >= self.max_files:
+                skipped.append({'path': path, 'reason': f"project exceeds {self.max_files} files"})
+                continue
+
+            files.append(ProjectFile(path, extension, size, read))
+
+        return files, skipped
+
+    @staticmethod
+    def _open(source: Path, stack: ExitStack) -> List[Tuple[str, int, Callable[[], bytes]]]:
+        """
+        (relative path, size, reader) for every regular file of a directory or archive
+
+        Archives stay open on ``stack`` until the run ends. Their readers
+        share one file handle, so they take turns.
+        """
+        name = source.name.lower()
+        if source.is_dir():
+            return [
+                (path.relative_to(source).as_posix(), path.stat().st_size, path.read_bytes)
+                for path in sorted(source.rglob('*')) if path.is_file()
+            ]
+
+        lock = threading.Lock()
+        if name.endswith('.zip'):
+            archive = stack.enter_context(zipfile.ZipFile(source))
+
+            def read_zip(info: zipfile.ZipInfo) -> bytes:
+                with lock:
+                    return archive.read(info)
+
+            return [
+                (info.filename, info.file_size, lambda info=info: read_zip(info))
+                for info in archive.infolist() if not info.is_dir()
+            ]
+        if name.endswith(ARCHIVE_SUFFIXES):
+            archive = stack.enter_context(tarfile.open(source))
+
+            def read_tar(member: tarfile.TarInfo) -> bytes:
+                with lock:
+                    return archive.extractfile(member).read()
+
+            return [
+                (member.name, member.size, lambda member=member: read_tar(member))
+                for member in archive.getmembers() if member.isfile()
+            ]
+        raise ValueError(f"{source} is neither a directory nor a supported archive ({', '.join(ARCHIVE_SUFFIXES)})")
+
+    @staticmethod
+    def _load(project_file: ProjectFile) -> str:
+        """Read and decode one file (runs in a worker thread)"""
+        return project_file.read().decode('utf-8')
+
+    async def analyze(self, source: Path, task_type: str, max_file_bytes: float, user_id: Optional[str] = None,
+                      on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> ProjectReport:
+        """Analyse every eligible file and consolidate the results"""
+        source = Path(source)
+        report = ProjectReport(source=str(source), task_type=task_type)
+        with ExitStack() as stack:
+            entries = await asyncio.to_thread(self._open, source, stack)
+            files, report.skipped = self.collect(entries, max_file_bytes)
+            await self._analyze_files(source, task_type, files, report, user_id, on_progress)
+        return report
+
+    async def _analyze_files(self, source: Path, task_type: str, files: List[ProjectFile], report: ProjectReport,
+                             user_id: Optional[str], on_progress: Optional[Callable[[Dict[str, Any]], None]]):
+        """Stream the files through at most ``max_concurrent_files`` workers, each reading one when it is free"""
+        start_time = time.perf_counter()
+        dropped = 0  # Found unreadable or empty only once read
+
+        def emit(event: str, **data):
+            if on_progress is None:
+                return
+            elapsed = time.perf_counter() - start_time
+            try:
+                on_progress({
+                    'event': event,
+                    'source': str(source),
+                    'task_type': task_type,
+                    'completed': len(report.files),
+                    'total': len(files) - dropped,
+                    'skipped': len(report.skipped),
+                    'elapsed_seconds': elapsed,
+                    'files_per_minute': len(report.files) / elapsed * 60 if elapsed else 0.0,
+                    **data
+                })
+            except Exception as e:
+                self.logger.warning(f"⚠️ Project progress callback failed: {e}")
+
+        self.logger.info(f"📦 Analysing {len(files)} files from {source} ({len(report.skipped)} skipped)")
+        emit('started')
+
+        async def analyse(project_file: ProjectFile):
+            nonlocal dropped
+            try:
+                code_content = await asyncio.to_thread(self._load, project_file)
+            except (UnicodeDecodeError, OSError, tarfile.TarError, zipfile.BadZipFile) as e:
+                reason = "not UTF-8 text" if isinstance(e, UnicodeDecodeError) else f"unreadable: {e}"
+                report.skipped.append({'path': project_file.path, 'reason': reason})
+                dropped += 1
+                return
+            if not code_content.strip():
+                dropped += 1
+                return
+
+            try:
+                result = await self.engine.process_code_scroll(
+                    code_content, task_type, project_file.file_extension,
+                    user_id=user_id, filename=f"{source.name}/{project_file.path}"
+                )
+                entry = {
+                    'path': project_file.path,
+                    'model_type': result.model_type.value,
+                    'confidence': result.confidence,
+                    'execution_time': result.execution_time,
+                    'result': result.result,
+                    'tokens_used': result.metadata.get('tokens_used', 0),
+                    'cache': result.metadata.get('cache')
+                }
+                if 'error' in result.metadata:
+                    entry['error'] = result.metadata['error']
+            except Exception as e:
+                self.logger.error(f"💀 {project_file.path} failed: {e}")
+                entry = {'path': project_file.path, 'error': str(e)}
+
+            report.files.append(entry)
+            emit('file_done', path=project_file.path, model_type=entry.get('model_type'),
+                 confidence=entry.get('confidence'), failed='error' in entry)
+
+        # Workers pull from one shared iterator, so only the files being analysed are in memory
+        pending = iter(files)
+
+        async def worker():
+            for project_file in pending:
+                await analyse(project_file)
+
+        await asyncio.gather(*(worker() for _ in range(min(self.max_concurrent_files, len(files)))))
+
+        report.elapsed_seconds = time.perf_counter() - start_time
+        self.logger.info(
+            f"📦 {source.name}: {len(report.files)} files in {report.elapsed_seconds:.1f}s "
+            f"({report.files_per_minute:.1f} files/min)"
+        )
+        emit('completed', report=report.to_dict(), rendered=report.render())
@@ -0,0 +1,348 @@
+"""
+🔱 Prompt Compactor - Sacred Scroll Distiller
+Strips what DeepSeek does not need from a scroll while keeping original line numbers
+"""
+
+import ast
+import io
+import re
+import tokenize
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .scroll_chunker import PYTHON_EXTENSIONS, estimate_tokens
+
+# Bumped whenever compaction output changes, so cached answers are not reused
+COMPACTOR_VERSION = 1
+
+# What each task keeps: comments, and docstrings as 'keep', 'summary' (first line) or 'drop'
+TASK_POLICIES = {
+    'optimize': {'comments': False, 'docstrings': 'summary'},
+    'cleanse': {'comments': False, 'docstrings': 'drop'},
+    'inspect': {'comments': False, 'docstrings': 'drop'},
+    'explain': {'comments': True, 'docstrings': 'keep'}
+}
+
+_LICENSE_MARKERS = re.compile(r'licen[cs]e|copyright|spdx-license-identifier|all rights reserved', re.IGNORECASE)
+_LONG_LITERAL = re.compile(r'(["\'`])(?:\\.|(?!\1)[^\\\n]){40,}\1')
+_DATA_TOKEN = re.compile(
+    r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|[-+]?\.?\d[\w.+\-]*|\b(?:True|False|None|true|false|null)\b'
+)
+
+@dataclass
+class CompactionPlan:
+    """
+    📐 Per-line edits for one scroll
+
+    Built once from the whole file, then applied to the whole file or to any
+    excerpt of it (such as a chunk), always keyed by original line number.
+    """
+    dropped: Set[int] = field(default_factory=set)
+    replaced: Dict[int, str] = field(default_factory=dict)
+    placeholders: Dict[int, str] = field(default_factory=dict)
+    stats: Dict[str, int] = field(default_factory=lambda: {
+        'license_lines': 0, 'comment_lines': 0, 'inline_comments': 0, 'docstring_lines': 0,
+        'literals_deduped': 0, 'data_lines_elided': 0, 'long_lines_truncated': 0
+    })
+
+    def apply(self, numbered_lines: Iterable[Tuple[int, str]]) -> List[Tuple[int, str]]:
+        """Surviving (original line number, text) pairs with blank runs collapsed"""
+        kept: List[Tuple[int, str]] = []
+        previous_blank = True  # Also drops leading blank lines
+
+        for line_number, line in numbered_lines:
+            if line_number in self.placeholders:
+                kept.append((line_number, self.placeholders[line_number]))
+                previous_blank = False
+                continue
+            if line_number in self.dropped:
+                continue
+
+            text = self.replaced.get(line_number, line).rstrip()
+            if not text.strip():
+                if previous_blank:
+                    continue
+                previous_blank = True
+            else:
+                previous_blank = False
+            kept.append((line_number, text))
+
+        while kept and not kept[-1][1].strip():
+            kept.pop()
+        return kept
+
+@dataclass
+class CompactedScroll:
+    """A compacted scroll, its source map and what was saved"""
+    lines: List[Tuple[int, str]]
+    total_lines: int
+    original_tokens: int
+    stats: Dict[str, int]
+
+    @property
+    def source_map(self) -> List[int]:
+        """Original line number of every compacted line"""
+        return [line_number for line_number, _ in self.lines]
+
+    def render_prompt(self) -> str:
+        """
+        Compacted code tagged with original line numbers
+
+        Only lines that follow a gap carry a ``N|`` tag - a full margin on
+        every line would cost more tokens than compaction saves.
+        """
+        body = []
+        previous = None
+        for line_number, text in self.lines:
+            tagged = previous is None or line_number != previous + 1
+            body.append(f"{line_number}|{text}" if tagged else text)
+            previous = line_number
+
+        return (
+            f"Compacted view of a {self.total_lines}-line file; comments, docstrings and bulky data "
+            "may be elided. A line starting with `N|` is original line N and untagged lines continue "
+            "from the line above - cite original line numbers.\n\n" + "\n".join(body)
+        )
+
+class PromptCompactor:
+    """
+    🗜️ Shrinks scroll prompts before they are sent to DeepSeek
+
+    Per task type, comments and docstrings are stripped or collapsed to their
+    first line; license headers are always dropped. Repeated long literals
+    point back to their first occurrence, runs of data-only lines (lookup
+    tables, fixtures) are elided with a placeholder, and minified or
+    base64-style lines are truncated. Every kept line retains its original
+    line number, so answers cite the file as the user sees it.
+    """
+
+    def __init__(self, table_min_lines: int = 12, max_line_chars: int = 1000):
+        self.table_min_lines = table_min_lines
+        self.max_line_chars = max_line_chars
+
+    def compact(self, code_content: str, task_type: str, file_extension: str = ".py") -> CompactedScroll:
+        """Compact a whole scroll"""
+        plan = self.plan(code_content, task_type, file_extension)
+        lines = code_content.splitlines()
+        return CompactedScroll(
+            lines=plan.apply(enumerate(lines, 1)),
+            total_lines=len(lines),
+            original_tokens=estimate_tokens(code_content),
+            stats=dict(plan.stats)
+        )
+
+    def plan(self, code_content: str, task_type: str, file_extension: str = ".py") -> CompactionPlan:
+        """Work out the per-line edits for a scroll"""
+        policy = TASK_POLICIES.get(task_type, TASK_POLICIES['optimize'])
+        is_python = file_extension.lower() in PYTHON_EXTENSIONS
+        lines = code_content.splitlines()
+        plan = CompactionPlan()
+
+        self._drop_license_header(lines, is_python, plan)
+
+        if is_python:
+            tree = self._parse(code_content)
+            if not policy['comments']:
+                self._strip_python_comments(code_content, lines, plan)
+            if tree is not None:
+                self._compact_docstrings(tree, lines, policy['docstrings'], plan)
+        elif not policy['comments']:
+            self._strip_javascript_comments(lines, plan)
+
+        self._dedupe_literals(lines, plan)
+        self._elide_data_tables(lines, '#' if is_python else '//', plan)
+        self._truncate_long_lines(lines, plan)
+        return plan
+
+    @staticmethod
+    def _parse(code_content: str) -> Optional[ast.AST]:
+        try:
+            return ast.parse(code_content)
+        except (SyntaxError, ValueError):
+            return None
+
+    @staticmethod
+    def _text(lines: List[str], plan: CompactionPlan, line_number: int) -> str:
+        """Current text of a line after earlier edits"""
+        return plan.replaced.get(line_number, lines[line_number - 1])
+
+    def _drop_license_header(self, lines: List[str], is_python: bool, plan: CompactionPlan):
+        """Drop a leading comment block or docstring that carries license text"""
+        header: List[int] = []
+        in_block = False
+        quote = None
+
+        for line_number, line in enumerate(lines, 1):
+            stripped = line.strip()
+            if quote is not None:
+                header.append(line_number)
+                if quote in stripped:
+                    quote = None
+                continue
+            if in_block:
+                header.append(line_number)
+                in_block = '*/' not in stripped
+                continue
+
+            if not stripped or stripped.startswith('#!'):
+                header.append(line_number)
+            elif is_python and stripped.startswith('#'):
+                header.append(line_number)
+            elif is_python and stripped[:3] in ('"""', "'''"):
+                header.append(line_number)
+                if stripped.count(stripped[:3]) < 2:
+                    quote = stripped[:3]
+            elif not is_python and stripped.startswith('//'):
+                header.append(line_number)
+            elif not is_python and stripped.startswith('/*'):
+                header.append(line_number)
+                in_block = '*/' not in stripped
+            else:
+                break
+
+        if header and any(_LICENSE_MARKERS.search(lines[n - 1]) for n in header):
+            plan.dropped.update(header)
+            plan.stats['license_lines'] += sum(1 for n in header if lines[n - 1].strip())
+
+    def _strip_python_comments(self, code_content: str, lines: List[str], plan: CompactionPlan):
+        """Remove comments found by the tokenizer, so '#' inside strings is left alone"""
+        try:
+            tokens = list(tokenize.generate_tokens(io.StringIO(code_content).readline))
+        except (tokenize.TokenError, IndentationError, SyntaxError):
+            # Partial or broken code - only whole-line comments are safe to spot
+            for line_number, line in enumerate(lines, 1):
+                if line.strip().startswith('#') and line_number not in plan.dropped:
+                    plan.dropped.add(line_number)
+                    plan.stats['comment_lines'] += 1
+            return
+
+        for token in tokens:
+            if token.type != tokenize.COMMENT:
+                continue
+            line_number, column = token.start
+            if line_number in plan.dropped:
+                continue
+
+            code_before = lines[line_number - 1][:column]
+            if code_before.strip():
+                plan.replaced[line_number] = code_before.rstrip()
+                plan.stats['inline_comments'] += 1
+            else:
+                plan.dropped.add(line_number)
+                plan.stats['comment_lines'] += 1
+
+    def _strip_javascript_comments(self, lines: List[str], plan: CompactionPlan):
+        """Remove whole-line // comments and block comments that start a line"""
+        in_block = False
+        for line_number, line in enumerate(lines, 1):
+            stripped = line.strip()
+            if in_block or stripped.startswith('/*'):
+                in_block = '*/' not in stripped
+                if stripped.endswith('*/') or in_block:
+                    self._drop(plan, line_number, 'comment_lines')
+            elif stripped.startswith('//'):
+                self._drop(plan, line_number, 'comment_lines')
+
+    def _compact_docstrings(self, tree: ast.AST, lines: List[str], mode: str, plan: CompactionPlan):
+        """Drop docstrings or collapse them to their first line"""
+        if mode == 'keep':
+            return
+
+        for node in ast.walk(tree):
+            if not isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            body = node.body
+            if not (body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant)
+                    and isinstance(body[0].value.value, str)):
+                continue
+
+            docstring = body[0]
+            span = range(docstring.lineno, docstring.end_lineno + 1)
+            if any(n in plan.dropped for n in span):
+                continue  # Already gone with the license header
+
+            # A docstring that is the whole body keeps one line so the definition stays well-formed
+            if mode == 'drop' and len(body) > 1:
+                for line_number in span:
+                    self._drop(plan, line_number, 'docstring_lines')
+                continue
+
+            if len(span) == 1:
+                continue
+            summary = next((part.strip() for part in docstring.value.value.splitlines() if part.strip()), '')
+            indent = lines[docstring.lineno - 1][:docstring.col_offset]
+            plan.replaced[docstring.lineno] = f'{indent}"""{summary}"""'
+            for line_number in span[1:]:
+                self._drop(plan, line_number, 'docstring_lines')
+
+    def _dedupe_literals(self, lines: List[str], plan: CompactionPlan):
+        """Replace repeats of long string literals with a pointer to the first one"""
+        first_seen: Dict[str, int] = {}
+
+        for line_number in range(1, len(lines) + 1):
+            if line_number in plan.dropped:
+                continue
+            text = self._text(lines, plan, line_number)
+
+            def substitute(match):
+                literal = match.group(0)
+                origin = first_seen.setdefault(literal, line_number)
+                if origin == line_number:
+                    return literal
+                plan.stats['literals_deduped'] += 1
+                quote = match.group(1)
+                return f"{quote}<same literal as line {origin}>{quote}"
+
+            new_text = _LONG_LITERAL.sub(substitute, text)
+            if new_text != text:
+                plan.replaced[line_number] = new_text
+
+    def _elide_data_tables(self, lines: List[str], comment_prefix: str, plan: CompactionPlan):
+        """Collapse long runs of literal-only lines, keeping a few rows as a sample"""
+        run: List[int] = []
+
+        def close_run():
+            if len(run) >= self.table_min_lines:
+                middle = run[3:-1]
+                indent = re.match(r'\s*', self._text(lines, plan, middle[0])).group(0)
+                plan.placeholders[middle[0]] = (
+                    f"{indent}{comment_prefix} ... {len(middle)} similar data lines elided "
+                    f"(lines {middle[0]}-{middle[-1]})"
+                )
+                plan.dropped.update(middle)
+                plan.stats['data_lines_elided'] += len(middle)
+            run.clear()
+
+        for line_number in range(1, len(lines) + 1):
+            if line_number in plan.dropped:
+                continue
+            if self._is_data_line(self._text(lines, plan, line_number).strip()):
+                run.append(line_number)
+            else:
+                close_run()
+        close_run()
+
+    @staticmethod
+    def _is_data_line(stripped: str) -> bool:
+        """A line made only of literals and punctuation, like a table row"""
+        if not stripped:
+            return False
+        residue = _DATA_TOKEN.sub('', stripped)
+        return residue != stripped and not residue.strip(' \t[](){},:;')
+
+    def _truncate_long_lines(self, lines: List[str], plan: CompactionPlan):
+        """Cut minified code and encoded blobs down to a recognisable prefix"""
+        keep = self.max_line_chars // 5
+        for line_number in range(1, len(lines) + 1):
+            if line_number in plan.dropped:
+                continue
+            text = self._text(lines, plan, line_number)
+            if len(text) > self.max_line_chars:
+                plan.replaced[line_number] = f"{text[:keep]} ... [{len(text) - keep} chars elided]"
+                plan.stats['long_lines_truncated'] += 1
+
+    @staticmethod
+    def _drop(plan: CompactionPlan, line_number: int, stat: str):
+        if line_number not in plan.dropped:
+            plan.dropped.add(line_number)
+            plan.stats[stat] += 1
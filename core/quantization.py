@@ -0,0 +1,100 @@
+"""
+🔱 Quantization - Sacred Compression of the Inspection Model
+Dynamic int8 quantization of Linear layers, gated by an accuracy check against fp32
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_threads_configured = False
+
+def configure_torch_threads(num_threads: int = 0, interop_threads: int = 0):
+    """
+    Cap torch's intra-op and inter-op thread pools for this process
+
+    Every engine process otherwise sizes its pools to all cores, so several
+    workers on one node oversubscribe the CPU. 0 leaves torch's default.
+    The inter-op pool can only be sized before torch first uses it, so this
+    runs once per process.
+    """
+    global _threads_configured
+    if _threads_configured:
+        return
+    _threads_configured = True
+
+    import torch
+
+    if num_threads > 0:
+        torch.set_num_threads(num_threads)
+    if interop_threads > 0:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError as e:
+            logger.warning(f"⚠️ Inter-op threads already fixed at {torch.get_num_interop_threads()}: {e}")
+
+def quantize_dynamic_int8(model):
+    """int8 weights for every Linear layer; activations are quantized on the fly per batch"""
+    import torch
+
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def save_holdout(path: Path, inputs: np.ndarray, labels: Optional[np.ndarray] = None):
+    """Write a held-out set of encoded scrolls (and optional label indices)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    arrays = {'inputs': np.asarray(inputs, dtype=np.float32)}
+    if labels is not None:
+        arrays['labels'] = np.asarray(labels, dtype=np.int64)
+    np.savez_compressed(path, **arrays)
+
+def load_holdout(path: Path) -> Optional[Tuple[np.ndarray, Optional[np.ndarray]]]:
+    """Held-out inputs and labels, or None when no set has been saved"""
+    try:
+        with np.load(path) as data:
+            labels = data['labels'] if 'labels' in data.files else None
+            return data['inputs'].astype(np.float32), labels
+    except FileNotFoundError:
+        return None
+
+def accuracy_delta(fp32_model, int8_model, inputs: np.ndarray,
+                   labels: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    """
+    Compare the quantized model with fp32 on a held-out set
+
+    With labels, ``accuracy_delta`` is fp32 accuracy minus int8 accuracy.
+    Without them the fp32 predictions are the reference, so the delta is
+    the share of scrolls whose top pattern changed.
+    """
+    import torch
+
+    def run(model):
+        start_time = time.perf_counter()
+        with torch.inference_mode():
+            probabilities = torch.softmax(model(torch.from_numpy(inputs)), dim=1).numpy()
+        return probabilities, (time.perf_counter() - start_time) * 1000
+
+    fp32_probabilities, fp32_ms = run(fp32_model)
+    int8_probabilities, int8_ms = run(int8_model)
+    fp32_top = fp32_probabilities.argmax(axis=1)
+    int8_top = int8_probabilities.argmax(axis=1)
+
+    report = {
+        'holdout_size': len(inputs),
+        'top1_agreement': float(np.mean(fp32_top == int8_top)),
+        'max_probability_delta': float(np.abs(fp32_probabilities - int8_probabilities).max()),
+        'fp32_ms': fp32_ms,
+        'int8_ms': int8_ms
+    }
+    if labels is not None:
+        report['fp32_accuracy'] = float(np.mean(fp32_top == labels))
+        report['int8_accuracy'] = float(np.mean(int8_top == labels))
+        report['accuracy_delta'] = report['fp32_accuracy'] - report['int8_accuracy']
+    else:
+        report['accuracy_delta'] = 1.0 - report['top1_agreement']
+    return report
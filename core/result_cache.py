@@ -0,0 +1,194 @@
+"""
+🔱 Scroll Result Cache - Sacred Memory of Past Invocations
+Two-tier content-addressed cache (memory LRU + disk) for hybrid engine results
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+class ScrollResultCache:
+    """
+    🗄️ Content-addressed result cache
+
+    Entries are keyed on the scroll hash plus everything that changes the
+    answer (task type, model, system prompt version). Hot entries live in an
+    in-memory LRU; every entry is also written to disk so restarts keep the
+    cache warm. Both tiers honour the TTL; the disk tier is bounded in bytes.
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = 512,
+                 max_disk_bytes: int = 256 * 1024 * 1024, ttl_seconds: float = 86400):
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._disk_index: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+        self.metrics = {
+            'hits': 0,
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load_disk_index()
+
+    @staticmethod
+    def make_key(code_content: str, task_type: str, model: str, prompt_version: str,
+                 file_extension: str = ".py") -> str:
+        """Build the content address for a scroll invocation - the same text as another language is another key"""
+        code_hash = hashlib.sha256(code_content.encode('utf-8')).hexdigest()
+        material = f"{code_hash}|{file_extension.lower()}|{task_type}|{model}|{prompt_version}"
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _load_disk_index(self):
+        """Rebuild the disk index (oldest first) from files already on disk"""
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+                entries.append((stat.st_mtime, path.stem, stat.st_size))
+            except OSError:
+                continue
+
+        for _, key, size in sorted(entries):
+            self._disk_index[key] = size
+            self._disk_bytes += size
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds > 0 and (time.time() - stored_at) > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached payload, promoting disk hits into memory"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_at, payload = entry
+                if not self._is_expired(stored_at):
+                    self._memory.move_to_end(key)
+                    self.metrics['hits'] += 1
+                    self.metrics['memory_hits'] += 1
+                    return payload
+
+                self._memory.pop(key, None)
+                self._remove_disk_entry(key)
+                self.metrics['expirations'] += 1
+
+            if key in self._disk_index:
+                record = self._read_disk_entry(key)
+                if record is not None:
+                    if not self._is_expired(record['stored_at']):
+                        self._remember(key, record['stored_at'], record['payload'])
+                        self.metrics['hits'] += 1
+                        self.metrics['disk_hits'] += 1
+                        return record['payload']
+
+                    self.metrics['expirations'] += 1
+
+                self._remove_disk_entry(key)
+
+            self.metrics['misses'] += 1
+            return None
+
+    def put(self, key: str, payload: Dict[str, Any]):
+        """Store a payload in both tiers"""
+        stored_at = time.time()
+
+        with self._lock:
+            self._remember(key, stored_at, payload)
+            self._write_disk_entry(key, stored_at, payload)
+
+    def _remember(self, key: str, stored_at: float, payload: Dict[str, Any]):
+        """Insert into the memory LRU, evicting the coldest entries"""
+        self._memory[key] = (stored_at, payload)
+        self._memory.move_to_end(key)
+
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.metrics['evictions'] += 1
+
+    def _read_disk_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.warning(f"⚠️ Unreadable cache entry {key}: {e}")
+            return None
+
+    def _write_disk_entry(self, key: str, stored_at: float, payload: Dict[str, Any]):
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            data = json.dumps({'stored_at': stored_at, 'payload': payload}, default=str)
+
+            # Write-then-rename so concurrent readers never see a partial entry
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+        except (OSError, TypeError) as e:
+            self.logger.warning(f"⚠️ Failed to persist cache entry {key}: {e}")
+            return
+
+        self._remove_from_index(key)
+        size = len(data.encode('utf-8'))
+        self._disk_index[key] = size
+        self._disk_bytes += size
+
+        while self._disk_bytes > self.max_disk_bytes and len(self._disk_index) > 1:
+            oldest_key = next(iter(self._disk_index))
+            self._remove_disk_entry(oldest_key)
+            self._memory.pop(oldest_key, None)
+            self.metrics['evictions'] += 1
+
+    def _remove_from_index(self, key: str):
+        size = self._disk_index.pop(key, None)
+        if size is not None:
+            self._disk_bytes -= size
+
+    def _remove_disk_entry(self, key: str):
+        self._remove_from_index(key)
+        try:
+            self._entry_path(key).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning(f"⚠️ Failed to remove cache entry {key}: {e}")
+
+    def clear(self):
+        """Drop every cached entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            for key in list(self._disk_index):
+                self._remove_disk_entry(key)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache counters and occupancy"""
+        with self._lock:
+            lookups = self.metrics['hits'] + self.metrics['misses']
+            return {
+                **self.metrics,
+                'hit_rate': self.metrics['hits'] / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'disk_entries': len(self._disk_index),
+                'disk_bytes': self._disk_bytes
+            }
@@ -0,0 +1,400 @@
+"""
+🔱 Scroll Chunker - Sacred Division of Large Scrolls
+Splits Python and JavaScript sources at function and class boundaries into
+token-budgeted chunks that each carry the shared import and global context
+"""
+
+import ast
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+PYTHON_EXTENSIONS = {'.py', '.pyw'}
+JAVASCRIPT_EXTENSIONS = {'.js', '.jsx', '.mjs', '.cjs', '.ts', '.tsx'}
+
+# Share of the chunk budget the import/global header may take
+CONTEXT_BUDGET_RATIO = 0.25
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for source code)"""
+    return max(1, len(text) // 4)
+
+@dataclass
+class CodeUnit:
+    """A top-level definition (or run of statements) with its original line span"""
+    name: str
+    kind: str  # 'function', 'class', 'method' or 'module'
+    start_line: int  # 1-based, inclusive
+    end_line: int
+    source: str
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.source)
+
+    @property
+    def digest(self) -> str:
+        """Content hash of the unit, independent of where it sits in the file"""
+        return hashlib.sha256(self.source.encode('utf-8')).hexdigest()
+
+@dataclass
+class ScrollChunk:
+    """A token-budgeted slice of a scroll plus its shared context"""
+    index: int
+    units: List[CodeUnit]
+    context: str = ""
+    prefix: str = ""  # Enclosing class header for split classes
+
+    @property
+    def start_line(self) -> int:
+        return self.units[0].start_line
+
+    @property
+    def end_line(self) -> int:
+        return self.units[-1].end_line
+
+    @property
+    def unit_names(self) -> List[str]:
+        return [unit.name for unit in self.units]
+
+    @property
+    def tokens(self) -> int:
+        return sum(unit.tokens for unit in self.units) + estimate_tokens(self.context + self.prefix)
+
+    def render_prompt(self, total_lines: int, compaction=None) -> str:
+        """Render the chunk with original line numbers in the margin
+
+        ``compaction`` is an optional CompactionPlan built from the whole
+        scroll; its edits are applied to this chunk's lines.
+        """
+        numbered = [
+            (unit.start_line + offset, line)
+            for unit in self.units
+            for offset, line in enumerate(unit.source.splitlines())
+        ]
+        if compaction is not None:
+            numbered = compaction.apply(numbered)
+        body = [f"{line_number:>5} | {line}" for line_number, line in numbered]
+
+        sections = [
+            f"Excerpt covering lines {self.start_line}-{self.end_line} of a {total_lines}-line file. "
+            "Cite line numbers from the left margin."
+        ]
+        if self.context:
+            sections.append(f"Shared context (imports and globals):\n{self.context}")
+        if self.prefix:
+            sections.append(f"Enclosing definition:\n{self.prefix}")
+        sections.append("\n".join(body))
+        return "\n\n".join(sections)
+
+class ScrollChunker:
+    """
+    ✂️ Splits a scroll into analysable chunks
+
+    Python is split with ``ast`` so boundaries always fall between complete
+    definitions; JavaScript uses a brace-depth scan that skips strings and
+    comments. Oversized classes are split per method and anything still too
+    large is cut into line windows.
+    """
+
+    def __init__(self, token_budget: int = 3000):
+        self.token_budget = token_budget
+
+    def split_units(self, code_content: str, file_extension: str = ".py") -> Tuple[str, List[CodeUnit]]:
+        """Return the shared context and the ordered list of code units"""
+        extension = file_extension.lower()
+        if extension in PYTHON_EXTENSIONS:
+            try:
+                return self._split_python(code_content)
+            except SyntaxError:
+                pass
+        elif extension in JAVASCRIPT_EXTENSIONS:
+            return self._split_javascript(code_content)
+
+        lines = code_content.splitlines()
+        return "", [CodeUnit("module", "module", 1, max(1, len(lines)), code_content)]
+
+    def split(self, code_content: str, file_extension: str = ".py",
+              boundary_modulus: int = 0) -> List[ScrollChunk]:
+        """Split a scroll into token-budgeted chunks
+
+        With ``boundary_modulus`` set, a chunk also ends before any unit whose
+        digest is divisible by it. Those content-defined boundaries keep an
+        edit from reshuffling every later chunk, so unchanged chunks of a
+        re-uploaded scroll come out identical.
+        """
+        context, units = self.split_units(code_content, file_extension)
+        context = self._trim_context(context)
+        unit_budget = max(1, self.token_budget - estimate_tokens(context))
+
+        chunks: List[ScrollChunk] = []
+        current: List[CodeUnit] = []
+        current_tokens = 0
+
+        def close_current():
+            nonlocal current, current_tokens
+            if current:
+                chunks.append(ScrollChunk(len(chunks), current, context))
+            current, current_tokens = [], 0
+
+        for unit in units:
+            if unit.tokens > unit_budget:
+                close_current()
+                for prefix, piece in self._split_oversized(unit, unit_budget):
+                    chunks.append(ScrollChunk(len(chunks), piece, context, prefix))
+                continue
+
+            if current and (current_tokens + unit.tokens > unit_budget
+                            or boundary_modulus and int(unit.digest[:8], 16) % boundary_modulus == 0):
+                close_current()
+            current.append(unit)
+            current_tokens += unit.tokens
+
+        close_current()
+        return chunks
+
+    def _trim_context(self, context: str) -> str:
+        """Keep the shared header within its share of the budget"""
+        max_chars = int(self.token_budget * CONTEXT_BUDGET_RATIO) * 4
+        if len(context) <= max_chars:
+            return context
+
+        kept = context[:max_chars].rsplit("\n", 1)[0]
+        omitted = context.count("\n") - kept.count("\n")
+        return f"{kept}\n# ... {omitted} more context lines omitted"
+
+    # Python
+
+    def _split_python(self, code_content: str) -> Tuple[str, List[CodeUnit]]:
+        tree = ast.parse(code_content)
+        lines = code_content.splitlines()
+
+        context_lines: List[str] = []
+        units: List[CodeUnit] = []
+        pending: List[ast.stmt] = []
+
+        def flush_pending():
+            if pending:
+                start = self._node_start(pending[0])
+                end = pending[-1].end_lineno
+                units.append(CodeUnit("module", "module", start, end, "\n".join(lines[start - 1:end])))
+                pending.clear()
+
+        for node in tree.body:
+            start = self._node_start(node)
+            source = "\n".join(lines[start - 1:node.end_lineno])
+
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                flush_pending()
+                kind = "class" if isinstance(node, ast.ClassDef) else "function"
+                units.append(CodeUnit(node.name, kind, start, node.end_lineno, source))
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                context_lines.append(source)
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)) and node.end_lineno == node.lineno:
+                # One-line globals are shared context; multi-line tables stay in the body
+                context_lines.append(source)
+            else:
+                pending.append(node)
+
+        flush_pending()
+        return "\n".join(context_lines), units
+
+    @staticmethod
+    def _node_start(node: ast.AST) -> int:
+        """First line of a node, including its decorators"""
+        decorators = getattr(node, 'decorator_list', None) or []
+        return min([node.lineno] + [d.lineno for d in decorators])
+
+    def _split_python_class(self, unit: CodeUnit) -> Optional[Tuple[str, List[CodeUnit]]]:
+        """Split a class into its header and per-method units"""
+        try:
+            tree = ast.parse(unit.source)
+        except SyntaxError:
+            return None
+
+        class_node = tree.body[0]
+        if not isinstance(class_node, ast.ClassDef) or not class_node.body:
+            return None
+
+        lines = unit.source.splitlines()
+        offset = unit.start_line - 1
+        first_body_line = self._node_start(class_node.body[0])
+        header = "\n".join(lines[:first_body_line - 1])
+
+        members = []
+        for node in class_node.body:
+            start = self._node_start(node)
+            name = getattr(node, 'name', 'statements')
+            kind = "method" if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) else "module"
+            members.append(CodeUnit(
+                f"{class_node.name}.{name}", kind, start + offset, node.end_lineno + offset,
+                "\n".join(lines[start - 1:node.end_lineno])
+            ))
+        return header, members
+
+    # JavaScript
+
+    _JS_DECLARATION = re.compile(
+        r'^(?:export\s+)?(?:default\s+)?(?:'
+        r'(?:async\s+)?function\s*\*?\s*(?P<func>[\w$]+)'
+        r'|class\s+(?P<cls>[\w$]+)'
+        r'|(?:const|let|var)\s+(?P<var>[\w$]+)\s*=\s*(?:async\s+)?(?:function\b|\([^)]*\)\s*=>|[\w$]+\s*=>|class\b)'
+        r')'
+    )
+    _JS_IMPORT = re.compile(r'^(?:import\b|(?:const|let|var)\s+.+=\s*require\()')
+
+    def _split_javascript(self, code_content: str) -> Tuple[str, List[CodeUnit]]:
+        lines = code_content.splitlines()
+        context_lines: List[str] = []
+        units: List[CodeUnit] = []
+
+        for start, end in self._javascript_statements(lines):
+            source = "\n".join(lines[start - 1:end])
+            first_line = source.lstrip()
+            match = self._JS_DECLARATION.match(first_line)
+
+            if self._JS_IMPORT.match(first_line):
+                context_lines.append(source)
+            elif match:
+                name = match.group('func') or match.group('cls') or match.group('var')
+                kind = "class" if match.group('cls') else "function"
+                units.append(CodeUnit(name, kind, start, end, source))
+            elif start == end and re.match(r'^(?:export\s+)?(?:const|let|var)\b', first_line):
+                context_lines.append(source)
+            elif units and units[-1].kind == "module" and units[-1].end_line >= start - 1:
+                previous = units[-1]
+                units[-1] = CodeUnit("module", "module", previous.start_line, end,
+                                     "\n".join(lines[previous.start_line - 1:end]))
+            else:
+                units.append(CodeUnit("module", "module", start, end, source))
+
+        return "\n".join(context_lines), units
+
+    @staticmethod
+    def _javascript_statements(lines: List[str]) -> List[Tuple[int, int]]:
+        """Group lines into top-level statements by tracking brace depth"""
+        statements = []
+        depth = 0
+        start = None
+        in_block_comment = False
+        quote = None
+
+        for number, line in enumerate(lines, start=1):
+            stripped = line.strip()
+            if start is None:
+                if not stripped or (depth == 0 and not in_block_comment and stripped.startswith('//')):
+                    continue
+                start = number
+
+            i = 0
+            while i < len(line):
+                char = line[i]
+                pair = line[i:i + 2]
+
+                if in_block_comment:
+                    if pair == '*/':
+                        in_block_comment = False
+                        i += 1
+                elif quote:
+                    if char == '\\':
+                        i += 1
+                    elif char == quote:
+                        quote = None
+                elif pair == '//':
+                    break
+                elif pair == '/*':
+                    in_block_comment = True
+                    i += 1
+                elif char in '"\'`':
+                    quote = char
+                elif char in '{([':
+                    depth += 1
+                elif char in '})]':
+                    depth = max(0, depth - 1)
+                i += 1
+
+            # Plain strings end at the line break; template literals may span lines
+            if quote in ('"', "'"):
+                quote = None
+
+            if depth == 0 and not in_block_comment and quote is None:
+                statements.append((start, number))
+                start = None
+
+        if start is not None:
+            statements.append((start, len(lines)))
+        return statements
+
+    _JS_METHOD = re.compile(r'^(?:static\s+)?(?:async\s+)?(?:get\s+|set\s+)?\*?\s*(?P<name>[\w$#]+)\s*\(')
+
+    def _split_javascript_class(self, unit: CodeUnit) -> Optional[Tuple[str, List[CodeUnit]]]:
+        """Split a JavaScript class into its header and per-member units"""
+        lines = unit.source.splitlines()
+        if len(lines) < 3 or not lines[0].rstrip().endswith('{') or lines[-1].strip() != '}':
+            return None
+
+        members = []
+        for start, end in self._javascript_statements(lines[1:-1]):
+            source = "\n".join(lines[start:end + 1])
+            match = self._JS_METHOD.match(source.lstrip())
+            name = match.group('name') if match else 'statements'
+            members.append(CodeUnit(
+                f"{unit.name}.{name}", "method" if match else "module",
+                unit.start_line + start, unit.start_line + end, source
+            ))
+        return lines[0], members
+
+    # Oversized units
+
+    def _split_oversized(self, unit: CodeUnit, unit_budget: int) -> List[Tuple[str, List[CodeUnit]]]:
+        """Split a unit that does not fit the budget on its own"""
+        if unit.kind == "class":
+            split_class = self._split_python_class(unit) or self._split_javascript_class(unit)
+            if split_class is not None:
+                header, members = split_class
+                pieces: List[Tuple[str, List[CodeUnit]]] = []
+                current: List[CodeUnit] = []
+                budget = max(1, unit_budget - estimate_tokens(header))
+
+                for member in members:
+                    if member.tokens > budget:
+                        if current:
+                            pieces.append((header, current))
+                            current = []
+                        pieces.extend((header, [window]) for window in self._line_windows(member, budget))
+                        continue
+                    if current and sum(m.tokens for m in current) + member.tokens > budget:
+                        pieces.append((header, current))
+                        current = []
+                    current.append(member)
+
+                if current:
+                    pieces.append((header, current))
+                return pieces
+
+        return [("", [window]) for window in self._line_windows(unit, unit_budget)]
+
+    @staticmethod
+    def _line_windows(unit: CodeUnit, unit_budget: int) -> List[CodeUnit]:
+        """Cut a unit into consecutive line windows that fit the budget"""
+        windows = []
+        lines = unit.source.splitlines() or [""]
+        max_chars = unit_budget * 4
+        start_index = 0
+
+        while start_index < len(lines):
+            end_index = start_index
+            size = 0
+            while end_index < len(lines) and (end_index == start_index or size + len(lines[end_index]) + 1 <= max_chars):
+                size += len(lines[end_index]) + 1
+                end_index += 1
+
+            windows.append(CodeUnit(
+                f"{unit.name}[{len(windows) + 1}]", unit.kind,
+                unit.start_line + start_index, unit.start_line + end_index - 1,
+                "\n".join(lines[start_index:end_index])
+            ))
+            start_index = end_index
+
+        return windows
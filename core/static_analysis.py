@@ -0,0 +1,545 @@
+"""
+🔱 Static Analysis - Sacred Import Cleanser
+Deterministic import findings from Python scope tables and a JavaScript tokenizer
+"""
+
+import ast
+import bisect
+import re
+import symtable
+import time
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .scroll_chunker import PYTHON_EXTENSIONS, JAVASCRIPT_EXTENSIONS
+
+# Bumped whenever findings change, so cached cleanse answers are not reused
+IMPORT_ANALYZER_VERSION = 1
+
+# Modules whose import alone costs noticeable start-up time or memory
+COSTLY_PYTHON_MODULES = frozenset({
+    'torch', 'tensorflow', 'keras', 'jax', 'transformers', 'pandas', 'scipy', 'sklearn',
+    'matplotlib', 'seaborn', 'plotly', 'cv2', 'nltk', 'spacy', 'sympy', 'xgboost',
+    'lightgbm', 'numba', 'pyspark', 'dask'
+})
+COSTLY_JAVASCRIPT_MODULES = frozenset({
+    'lodash', 'moment', 'rxjs', 'jquery', 'three', 'chart.js', 'aws-sdk', 'd3',
+    '@tensorflow/tfjs', '@mui/material', '@mui/icons-material', 'antd'
+})
+
+FINDING_KINDS = ('unused_import', 'duplicate_import', 'shadowed_import', 'star_import', 'costly_import')
+
+def scope_tables(top) -> Dict[Tuple[str, str, int], Any]:
+    """Every symbol table under ``top``, keyed by (type, name, line) to match ast nodes"""
+    tables = {}
+    pending = [top]
+    while pending:
+        table = pending.pop()
+        tables[(table.get_type(), table.get_name(), table.get_lineno())] = table
+        pending.extend(table.get_children())
+    return tables
+
+def is_used(table, name: str) -> bool:
+    """Whether a binding in ``table`` is read there or in a nested scope that resolves to it"""
+    if table.lookup(name).is_referenced():
+        return True
+    if table.get_type() == 'class':
+        return False  # Class-level names are invisible to nested scopes
+    return any(_used_below(child, name, table.get_type()) for child in table.get_children())
+
+def _used_below(table, name: str, owner_type: str) -> bool:
+    try:
+        symbol = table.lookup(name)
+    except KeyError:
+        symbol = None
+
+    if symbol is not None:
+        resolves = symbol.is_global() if owner_type == 'module' else symbol.is_free()
+        if resolves and symbol.is_referenced():
+            return True
+        if not resolves and table.get_type() != 'class':
+            return False  # A local of the same name hides the binding below here
+    return any(_used_below(child, name, owner_type) for child in table.get_children())
+
+@dataclass
+class StaticFinding:
+    """One deterministic finding about a scroll"""
+    kind: str
+    line: int
+    name: str
+    message: str
+    suggestion: str
+    severity: str = "warning"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+@dataclass
+class StaticReport:
+    """Findings of one analyser run"""
+    language: str
+    findings: List[StaticFinding]
+    elapsed_ms: float
+    confidence: float
+    cached: bool = False
+
+    def counts(self) -> Dict[str, int]:
+        return dict(Counter(finding.kind for finding in self.findings))
+
+@dataclass
+class _PythonImport:
+    """One name bound by an import statement"""
+    name: str
+    source: str
+    statement: str
+    line: int
+    table: Any
+    node: ast.AST
+    conditional: bool
+    type_checking: bool
+    reexported: bool
+
+class ImportAnalyzer:
+    """
+    🧹 Unused, duplicate, shadowed, star and costly imports without a model
+
+    Python scrolls are resolved against ``symtable``'s scope tables, so a
+    name counts as used only where it really resolves to the import - a
+    parameter or local of the same name hides it. JavaScript and TypeScript
+    get a tokenizer pass over ES ``import`` statements and ``require``
+    declarations, which skips comments, strings and property accesses.
+    ``analyze`` returns None for other languages and for scrolls that do
+    not parse, leaving those to the learned models.
+    """
+
+    def supports(self, file_extension: str) -> bool:
+        extension = file_extension.lower()
+        return extension in PYTHON_EXTENSIONS or extension in JAVASCRIPT_EXTENSIONS
+
+    def analyze(self, code_content: str, file_extension: str = ".py") -> Optional[StaticReport]:
+        """Import findings for a scroll, ordered by line"""
+        start_time = time.perf_counter()
+        extension = file_extension.lower()
+
+        if extension in PYTHON_EXTENSIONS:
+            findings = self._analyze_python(code_content)
+            language, confidence = "python", 0.95
+        elif extension in JAVASCRIPT_EXTENSIONS:
+            findings = self._analyze_javascript(code_content)
+            language, confidence = "javascript", 0.8  # Token-level, so no block scopes
+        else:
+            return None
+
+        if findings is None:
+            return None
+        findings.sort(key=lambda finding: (finding.line, FINDING_KINDS.index(finding.kind)))
+        return StaticReport(language, findings, (time.perf_counter() - start_time) * 1000, confidence)
+
+    @staticmethod
+    def render(report: StaticReport) -> str:
+        """Human-readable cleanse verdict"""
+        if not report.findings:
+            return f"✨ Imports are pure - nothing to cleanse ({report.elapsed_ms:.1f} ms)"
+
+        lines = [f"🧹 Import cleanse: {len(report.findings)} finding(s) in {report.elapsed_ms:.1f} ms"]
+        for finding in report.findings:
+            lines.append(f"• L{finding.line} {finding.message} - {finding.suggestion}")
+        return "\n".join(lines)
+
+    # Python
+
+    def _analyze_python(self, code_content: str) -> Optional[List[StaticFinding]]:
+        try:
+            tree = ast.parse(code_content)
+            top = symtable.symtable(code_content, "<scroll>", "exec")
+        except (SyntaxError, ValueError):
+            return None
+
+        imports = list(self._python_imports(tree, top, scope_tables(top)))
+        exported = self._dunder_all(tree)
+        annotated = self._string_annotation_names(tree)
+
+        findings = []
+        seen: Dict[Tuple[int, str, str], _PythonImport] = {}
+        for binding in imports:
+            if binding.name == '*':
+                findings.append(StaticFinding(
+                    'star_import', binding.line, binding.source,
+                    f"star import from `{binding.source}`",
+                    "import the names it provides explicitly"
+                ))
+                continue
+
+            key = (id(binding.table), binding.name, binding.source)
+            first = seen.setdefault(key, binding)
+            if first is not binding and not (first.conditional or binding.conditional):
+                findings.append(StaticFinding(
+                    'duplicate_import', binding.line, binding.name,
+                    f"`{binding.name}` already imported on line {first.line}",
+                    f"remove `{binding.statement}`"
+                ))
+                continue
+
+            findings.extend(self._python_binding_findings(binding, imports, exported, annotated))
+
+        return findings
+
+    def _python_binding_findings(self, binding: _PythonImport, imports: List[_PythonImport],
+                                 exported: Set[str], annotated: Set[str]) -> Iterator[StaticFinding]:
+        table = binding.table
+        symbol = table.lookup(binding.name)
+        is_module = table.get_type() == 'module'
+
+        used = (binding.reexported or (is_module and binding.name in exported)
+                or binding.name in annotated or is_used(table, binding.name))
+        if not used:
+            siblings = sum(1 for other in imports if other.node is binding.node)
+            yield StaticFinding(
+                'unused_import', binding.line, binding.name,
+                f"unused import `{binding.name}`",
+                f"remove `{binding.statement}`" if siblings == 1 else
+                f"drop `{binding.name}` from the import on line {binding.line}"
+            )
+
+        if symbol.is_assigned() and not binding.conditional:
+            yield StaticFinding(
+                'shadowed_import', binding.line, binding.name,
+                f"`{binding.name}` is also assigned in this scope, overwriting the import",
+                "rename the import or the assigned name"
+            )
+
+        hiding = sorted(set(self._hiding_scopes(table, binding.name)))
+        if hiding:
+            yield StaticFinding(
+                'shadowed_import', binding.line, binding.name,
+                f"`{binding.name}` is shadowed by a local or parameter in {', '.join(f'`{s}`' for s in hiding)}",
+                "rename the inner name so the import stays reachable"
+            )
+
+        root = binding.source.split('.')[0].split(':')[0]
+        if is_module and not binding.type_checking and root in COSTLY_PYTHON_MODULES and used:
+            deferrable = not self._used_at_import_time(table, binding.name)
+            yield StaticFinding(
+                'costly_import', binding.line, binding.name,
+                f"`{root}` is costly to import at module load",
+                "move the import into the functions that use it" if deferrable else
+                "keep it only in entry points that need it, or import it lazily",
+                severity="info"
+            )
+
+    def _python_imports(self, tree: ast.Module, top, tables) -> Iterator[_PythonImport]:
+        """Every imported name with its scope table and guarding context"""
+        branch_types = (ast.If, ast.Try, getattr(ast, 'TryStar', ast.Try), getattr(ast, 'Match', ast.If))
+        # (node, symbol table, inside a branch, inside `if TYPE_CHECKING:`)
+        stack = [(tree, top, False, False)]
+        while stack:
+            node, table, conditional, type_checking = stack.pop()
+            for child in ast.iter_child_nodes(node):
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    kind = 'class' if isinstance(child, ast.ClassDef) else 'function'
+                    child_table = tables.get((kind, child.name, child.lineno))
+                    if child_table is not None:
+                        stack.append((child, child_table, False, False))
+                elif isinstance(child, (ast.Import, ast.ImportFrom)):
+                    yield from self._bindings(child, table, conditional, type_checking)
+                else:
+                    guarded = isinstance(child, ast.If) and self._is_type_checking(child.test)
+                    stack.append((child, table, conditional or isinstance(child, branch_types),
+                                  type_checking or guarded))
+
+    @staticmethod
+    def _bindings(node, table, conditional: bool, type_checking: bool) -> Iterator[_PythonImport]:
+        if isinstance(node, ast.ImportFrom):
+            module = '.' * node.level + (node.module or '')
+            if module == '__future__':
+                return
+            for alias in node.names:
+                statement = f"from {module} import {alias.name}" + (f" as {alias.asname}" if alias.asname else "")
+                yield _PythonImport(
+                    name=alias.asname or alias.name,
+                    source=module if alias.name == '*' else f"{module}:{alias.name}",
+                    statement=statement, line=node.lineno, table=table, node=node,
+                    conditional=conditional, type_checking=type_checking,
+                    reexported=alias.asname is not None and alias.asname == alias.name
+                )
+        else:
+            for alias in node.names:
+                statement = f"import {alias.name}" + (f" as {alias.asname}" if alias.asname else "")
+                yield _PythonImport(
+                    name=alias.asname or alias.name.split('.')[0],
+                    source=alias.name,
+                    statement=statement, line=node.lineno, table=table, node=node,
+                    conditional=conditional, type_checking=type_checking,
+                    reexported=alias.asname is not None and alias.asname == alias.name
+                )
+
+    def _hiding_scopes(self, table, name: str) -> Iterator[str]:
+        """Functions whose own local or parameter shadows a binding of ``table``"""
+        if table.get_type() == 'class':
+            return
+        for child in table.get_children():
+            try:
+                symbol = child.lookup(name)
+            except KeyError:
+                symbol = None
+            if (symbol is not None and child.get_type() == 'function'
+                    and (symbol.is_parameter() or symbol.is_local()) and not symbol.is_global()):
+                yield child.get_name()
+                continue
+            yield from self._hiding_scopes(child, name)
+
+    @staticmethod
+    def _used_at_import_time(table, name: str) -> bool:
+        """Whether the module body (or a class body in it) reads the name while importing"""
+        pending = [table]
+        while pending:
+            current = pending.pop()
+            try:
+                if current.lookup(name).is_referenced():
+                    return True
+            except KeyError:
+                pass
+            pending.extend(child for child in current.get_children() if child.get_type() == 'class')
+        return False
+
+    @staticmethod
+    def _is_type_checking(test: ast.AST) -> bool:
+        return ((isinstance(test, ast.Name) and test.id == 'TYPE_CHECKING')
+                or (isinstance(test, ast.Attribute) and test.attr == 'TYPE_CHECKING'))
+
+    @staticmethod
+    def _dunder_all(tree: ast.Module) -> Set[str]:
+        """Names re-exported through a module-level ``__all__``"""
+        names = set()
+        for node in tree.body:
+            if isinstance(node, (ast.Assign, ast.AugAssign, ast.AnnAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                if any(isinstance(t, ast.Name) and t.id == '__all__' for t in targets) and node.value is not None:
+                    names.update(element.value for element in ast.walk(node.value)
+                                 if isinstance(element, ast.Constant) and isinstance(element.value, str))
+        return names
+
+    @staticmethod
+    def _string_annotation_names(tree: ast.Module) -> Set[str]:
+        """Names referenced only from quoted annotations (typically TYPE_CHECKING imports)"""
+        annotations = []
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.returns is not None:
+                annotations.append(node.returns)
+            elif isinstance(node, ast.arg) and node.annotation is not None:
+                annotations.append(node.annotation)
+            elif isinstance(node, ast.AnnAssign):
+                annotations.append(node.annotation)
+
+        names = set()
+        for annotation in annotations:
+            for node in ast.walk(annotation):
+                if not (isinstance(node, ast.Constant) and isinstance(node.value, str)):
+                    continue
+                try:
+                    parsed = ast.parse(node.value, mode='eval')
+                except SyntaxError:
+                    continue
+                names.update(name.id for name in ast.walk(parsed) if isinstance(name, ast.Name))
+        return names
+
+    # JavaScript
+
+    _JS_TOKEN = re.compile(
+        r'(?P<comment>//[^\n]*|/\*.*?\*/)'
+        r'|(?P<string>"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')'
+        r'|(?P<template>`(?:\\.|[^`\\])*`)'
+        r'|(?P<name>[A-Za-z_$][\w$]*)'
+        r'|(?P<number>\d[\w.]*)'
+        r'|(?P<symbol>\S)',
+        re.DOTALL
+    )
+    _JS_TEMPLATE_EXPRESSION = re.compile(r'\$\{([^}]*)\}')
+    _JS_NAME = re.compile(r'[A-Za-z_$][\w$]*')
+    _JS_DECLARATIONS = frozenset({'const', 'let', 'var', 'function', 'class'})
+
+    def _tokenize_javascript(self, code_content: str) -> List[Tuple[str, str, int]]:
+        """(kind, text, line) tokens, comments dropped"""
+        newlines = [i for i, char in enumerate(code_content) if char == '\n']
+        tokens = []
+        for match in self._JS_TOKEN.finditer(code_content):
+            kind = match.lastgroup
+            if kind == 'comment':
+                continue
+            line = bisect.bisect_left(newlines, match.start()) + 1
+            if kind == 'template':
+                # Interpolated expressions reference names like any other code
+                for expression in self._JS_TEMPLATE_EXPRESSION.findall(match.group()):
+                    tokens.extend(('name', name, line) for name in self._JS_NAME.findall(expression))
+                kind = 'string'
+            tokens.append((kind, match.group(), line))
+        return tokens
+
+    def _analyze_javascript(self, code_content: str) -> List[StaticFinding]:
+        tokens = self._tokenize_javascript(code_content)
+        # (local name, source module, imported name, line, statement kind)
+        bindings: List[Tuple[str, str, str, int, str]] = []
+        consumed: Set[int] = set()
+        depth = 0
+
+        i = 0
+        while i < len(tokens):
+            kind, text, line = tokens[i]
+            if kind == 'symbol':
+                depth += text == '{'
+                depth -= text == '}'
+            previous = tokens[i - 1][1] if i else ''
+            if kind == 'name' and text == 'import' and previous != '.':
+                end = self._parse_es_import(tokens, i, bindings)
+            elif kind == 'name' and text in ('const', 'let', 'var') and depth == 0:
+                end = self._parse_require(tokens, i, bindings)
+            else:
+                end = None
+
+            if end is None:
+                i += 1
+                continue
+            consumed.update(range(i, end))
+            i = end
+
+        findings = []
+        references: Counter = Counter()
+        declared: Dict[str, int] = {}
+        for index, (kind, text, line) in enumerate(tokens):
+            if kind != 'name' or index in consumed:
+                continue
+            previous = tokens[index - 1][1] if index else ''
+            before = tokens[index - 2][1] if index > 1 else ''
+            if previous == '.' and before != '.':
+                continue  # Property access, not a reference
+            if previous in self._JS_DECLARATIONS:
+                declared.setdefault(text, line)
+                continue
+            references[text] += 1
+
+        seen_sources: Dict[Tuple[str, str], int] = {}
+        seen_names: Dict[str, int] = {}
+        for name, source, imported, line, statement in bindings:
+            if (source, imported) in seen_sources or name in seen_names:
+                first = seen_sources.get((source, imported), seen_names.get(name))
+                findings.append(StaticFinding(
+                    'duplicate_import', line, name,
+                    f"`{name}` already imported on line {first}",
+                    f"remove the second import of `{imported}` from '{source}'"
+                ))
+                continue
+            seen_sources[(source, imported)] = line
+            seen_names[name] = line
+
+            if name in declared:
+                findings.append(StaticFinding(
+                    'shadowed_import', line, name,
+                    f"`{name}` is redeclared on line {declared[name]}, shadowing the import",
+                    "rename the declaration or the import"
+                ))
+
+            if not references[name]:
+                findings.append(StaticFinding(
+                    'unused_import', line, name,
+                    f"unused import `{name}` from '{source}'",
+                    f"drop `{name}` from the {statement}"
+                ))
+            elif source in COSTLY_JAVASCRIPT_MODULES and imported in ('default', '*'):
+                findings.append(StaticFinding(
+                    'costly_import', line, name,
+                    f"`{name}` pulls in all of '{source}'",
+                    "import only the members you use, or load it with a dynamic import()",
+                    severity="info"
+                ))
+
+        return findings
+
+    @staticmethod
+    def _parse_es_import(tokens, start: int, bindings: List) -> Optional[int]:
+        """Bindings of one ES import (or `export * from`) statement; index after it"""
+        i = start + 1
+        if i >= len(tokens) or tokens[i][1] in ('(', '.'):
+            return None  # Dynamic import() or import.meta
+        line = tokens[start][2]
+
+        def text(index):
+            return tokens[index][1] if index < len(tokens) else ''
+
+        if tokens[i][0] == 'string':
+            return i + 1  # Side-effect import, binds nothing
+        if text(i) == 'type' and tokens[i + 1][0] in ('name', 'symbol') and text(i + 1) != 'from':
+            i += 1
+
+        names = []
+        while i < len(tokens) and text(i) != 'from':
+            if text(i) == '*' and text(i + 1) == 'as':
+                names.append((text(i + 2), '*'))
+                i += 3
+            elif text(i) == '{':
+                i += 1
+                while i < len(tokens) and text(i) != '}':
+                    if text(i) == 'type':
+                        i += 1
+                    imported = text(i)
+                    if text(i + 1) == 'as':
+                        names.append((text(i + 2), imported))
+                        i += 3
+                    else:
+                        names.append((imported, imported))
+                        i += 1
+                    if text(i) == ',':
+                        i += 1
+                i += 1
+            elif tokens[i][0] == 'name':
+                names.append((text(i), 'default'))
+                i += 1
+            elif text(i) == ',':
+                i += 1
+            else:
+                return None
+
+        if text(i) != 'from' or i + 1 >= len(tokens) or tokens[i + 1][0] != 'string':
+            return None
+        source = text(i + 1)[1:-1]
+        bindings.extend((name, source, imported, line, "import") for name, imported in names)
+        return i + 2
+
+    @staticmethod
+    def _parse_require(tokens, start: int, bindings: List) -> Optional[int]:
+        """Bindings of a top-level `const x = require('m')` declaration; index after it"""
+        def text(index):
+            return tokens[index][1] if index < len(tokens) else ''
+
+        line = tokens[start][2]
+        i = start + 1
+        names = []
+        if text(i) == '{':
+            i += 1
+            while i < len(tokens) and text(i) != '}':
+                imported = text(i)
+                if text(i + 1) == ':':
+                    names.append((text(i + 2), imported))
+                    i += 3
+                else:
+                    names.append((imported, imported))
+                    i += 1
+                if text(i) == ',':
+                    i += 1
+            i += 1
+        elif tokens[i][0] == 'name':
+            names.append((text(i), 'default'))
+            i += 1
+        else:
+            return None
+
+        if not (text(i) == '=' and text(i + 1) == 'require' and text(i + 2) == '('
+                and i + 3 < len(tokens) and tokens[i + 3][0] == 'string' and text(i + 4) == ')'):
+            return None
+        source = text(i + 3)[1:-1]
+        end = i + 5
+        if text(end) == '.' and names == [(names[0][0], 'default')]:
+            names = [(names[0][0], text(end + 1))]  # const x = require('m').member
+            end += 2
+        bindings.extend((name, source, imported, line, "require") for name, imported in names)
+        return end
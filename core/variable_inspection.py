@@ -0,0 +1,418 @@
+"""
+🔱 Variable Inspection - Sacred Watch over Names
+Deterministic variable findings from Python scope tables, cached per scroll
+"""
+
+import ast
+import builtins
+import hashlib
+import symtable
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .scroll_chunker import PYTHON_EXTENSIONS
+from .static_analysis import StaticFinding, StaticReport, scope_tables, is_used
+
+# Bumped whenever findings change, so cached inspect answers are not reused
+VARIABLE_INSPECTOR_VERSION = 1
+
+# Finding kinds share their names with the PyTorch model's INSPECTION_LABELS
+INSPECTION_KINDS = ('unused_variable', 'shadowed_builtin', 'global_mutation', 'loop_closure', 'type_inconsistency')
+
+# Interactive helpers site.py adds to builtins - rebinding them is harmless
+BUILTIN_NAMES = frozenset(
+    name for name in dir(builtins) if not name.startswith('_')
+) - {'copyright', 'credits', 'license', 'exit', 'quit', 'help'}
+
+# Methods that change their receiver in place
+MUTATING_METHODS = frozenset({
+    'append', 'extend', 'insert', 'update', 'add', 'pop', 'popitem', 'remove', 'discard',
+    'setdefault', 'clear', 'sort', 'reverse', 'appendleft', 'extendleft', 'popleft'
+})
+
+# Callables that consume a key/predicate before the loop moves on
+IMMEDIATE_CALLS = frozenset({
+    'sorted', 'sort', 'min', 'max', 'filter', 'map', 'any', 'all', 'sum', 'reduce', 'groupby', 'sub'
+})
+
+_SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda,
+                ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+_LOOP_NODES = (ast.For, ast.AsyncFor, ast.While)
+_CONSTRUCTOR_TYPES = {'int': 'number', 'float': 'number', 'complex': 'number', 'str': 'str', 'bytes': 'bytes',
+                      'bool': 'bool', 'list': 'list', 'dict': 'dict', 'set': 'set', 'tuple': 'tuple',
+                      'frozenset': 'frozenset'}
+
+class VariableInspector:
+    """
+    👁️ Unused locals, shadowed builtins, globals mutated in loops, closures
+    capturing loop variables and type-inconsistent reassignments
+
+    Scopes come from ``symtable`` and line numbers from ``ast``. Reports are
+    kept in an LRU keyed by the scroll's content hash, so a file inspected
+    again (a re-run, a project sweep, a local fallback) costs one lookup.
+    Non-Python scrolls and scrolls that do not parse return None.
+    """
+
+    def __init__(self, cache_entries: int = 1024):
+        self.cache_entries = cache_entries
+        self._cache: "OrderedDict[str, StaticReport]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.metrics = {'inspections': 0, 'cache_hits': 0, 'unparsed': 0}
+
+    def supports(self, file_extension: str) -> bool:
+        return file_extension.lower() in PYTHON_EXTENSIONS
+
+    def analyze(self, code_content: str, file_extension: str = ".py") -> Optional[StaticReport]:
+        """Variable findings for a scroll, ordered by line"""
+        if not self.supports(file_extension):
+            return None
+
+        key = hashlib.sha256(code_content.encode('utf-8')).hexdigest()
+        with self._lock:
+            report = self._cache.get(key)
+            if report is not None:
+                self._cache.move_to_end(key)
+                self.metrics['cache_hits'] += 1
+                return replace(report, cached=True)
+
+        start_time = time.perf_counter()
+        findings = self._inspect(code_content)
+        if findings is None:
+            with self._lock:
+                self.metrics['unparsed'] += 1
+            return None
+        findings.sort(key=lambda finding: (finding.line, INSPECTION_KINDS.index(finding.kind)))
+        report = StaticReport("python", findings, (time.perf_counter() - start_time) * 1000, 0.9)
+
+        with self._lock:
+            self.metrics['inspections'] += 1
+            if self.cache_entries > 0:
+                self._cache[key] = report
+                while len(self._cache) > self.cache_entries:
+                    self._cache.popitem(last=False)
+        return report
+
+    @staticmethod
+    def render(report: StaticReport) -> str:
+        """Human-readable inspection verdict"""
+        if not report.findings:
+            return f"✨ Variables are in harmony - nothing to report ({report.elapsed_ms:.1f} ms)"
+
+        lines = [f"👁️ Variable inspection: {len(report.findings)} finding(s) in {report.elapsed_ms:.1f} ms"]
+        for finding in report.findings:
+            lines.append(f"• L{finding.line} {finding.message} - {finding.suggestion}")
+        return "\n".join(lines)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.metrics['inspections'] + self.metrics['cache_hits']
+            return {
+                **self.metrics,
+                'cached_reports': len(self._cache),
+                'cache_hit_rate': self.metrics['cache_hits'] / lookups if lookups else 0.0
+            }
+
+    def _inspect(self, code_content: str) -> Optional[List[StaticFinding]]:
+        try:
+            tree = ast.parse(code_content)
+            top = symtable.symtable(code_content, "<scroll>", "exec")
+        except (SyntaxError, ValueError):
+            return None
+
+        tables = scope_tables(top)
+        scope_nodes, loop_nodes, parents = self._index_scopes(tree)
+
+        findings = []
+        for scope, nodes in scope_nodes.items():
+            if scope is tree:
+                table = top
+            elif isinstance(scope, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                table = tables.get(('function', scope.name, scope.lineno))
+                if table is None:
+                    continue
+            else:
+                continue  # Class bodies, lambdas and comprehensions
+
+            bindings, loop_targets = self._bindings(scope, nodes)
+            findings.extend(self._shadowed_builtins(table, bindings))
+            findings.extend(self._type_inconsistencies(nodes))
+            if scope is not tree:
+                findings.extend(self._unused_variables(nodes, table, bindings, loop_targets))
+                findings.extend(self._global_mutations(scope, loop_nodes.get(scope, ()), table, top))
+        findings.extend(self._loop_closures(scope_nodes, parents))
+        return findings
+
+    @staticmethod
+    def _index_scopes(tree: ast.Module):
+        """
+        One pass over the tree: the nodes evaluated in each scope (a nested
+        scope appears in its parent only as its own node), the subset inside
+        loops, and every node's parent
+        """
+        scope_nodes: Dict[ast.AST, List[ast.AST]] = {tree: []}
+        loop_nodes: Dict[ast.AST, List[ast.AST]] = {}
+        parents: Dict[ast.AST, ast.AST] = {}
+
+        # (node, its scope, inside a loop of that scope)
+        pending = [(tree, tree, False)]
+        while pending:
+            node, scope, in_loop = pending.pop()
+            child_in_loop = in_loop or isinstance(node, _LOOP_NODES)
+            for child in ast.iter_child_nodes(node):
+                parents[child] = node
+                scope_nodes[scope].append(child)
+                if child_in_loop:
+                    loop_nodes.setdefault(scope, []).append(child)
+                if isinstance(child, _SCOPE_NODES):
+                    scope_nodes[child] = []
+                    pending.append((child, child, False))
+                else:
+                    pending.append((child, scope, child_in_loop))
+
+        return scope_nodes, loop_nodes, parents
+
+    @staticmethod
+    def _bindings(scope: ast.AST, nodes: List[ast.AST]) -> Tuple[Dict[str, int], Set[str]]:
+        """First binding line of every name in a scope, and the names bound only as loop targets"""
+        bindings: Dict[str, int] = {}
+        loop_targets: Set[str] = set()
+        other_targets: Set[str] = set()
+
+        if isinstance(scope, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            arguments = scope.args
+            for arg in (arguments.posonlyargs + arguments.args + arguments.kwonlyargs
+                        + [a for a in (arguments.vararg, arguments.kwarg) if a is not None]):
+                bindings[arg.arg] = arg.lineno
+
+        for node in nodes:
+            names = []
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+                names.append(node.id)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                names.append(node.name)
+            elif isinstance(node, ast.ExceptHandler) and node.name:
+                names.append(node.name)
+            elif isinstance(node, (ast.For, ast.AsyncFor)):
+                loop_targets.update(n.id for n in ast.walk(node.target) if isinstance(n, ast.Name))
+            elif isinstance(node, (ast.Assign, ast.AugAssign, ast.AnnAssign, ast.With, ast.AsyncWith)):
+                targets = (node.targets if isinstance(node, ast.Assign) else
+                           [item.optional_vars for item in node.items if item.optional_vars is not None]
+                           if isinstance(node, (ast.With, ast.AsyncWith)) else [node.target])
+                other_targets.update(n.id for t in targets for n in ast.walk(t) if isinstance(n, ast.Name))
+
+            for name in names:
+                line = node.lineno
+                if name not in bindings or line < bindings[name]:
+                    bindings[name] = line
+
+        return bindings, loop_targets - other_targets
+
+    @staticmethod
+    def _shadowed_builtins(table, bindings: Dict[str, int]) -> Iterator[StaticFinding]:
+        for name, line in bindings.items():
+            if name not in BUILTIN_NAMES:
+                continue
+            try:
+                symbol = table.lookup(name)
+            except KeyError:
+                continue
+            if symbol.is_global() and table.get_type() != 'module':
+                continue  # Declared global - reported where the module binds it
+            yield StaticFinding(
+                'shadowed_builtin', line, name,
+                f"`{name}` shadows the builtin of the same name",
+                f"rename it (e.g. `{name}_`) so the builtin stays reachable"
+            )
+
+    @staticmethod
+    def _unused_variables(nodes: List[ast.AST], table, bindings: Dict[str, int],
+                          loop_targets: Set[str]) -> Iterator[StaticFinding]:
+        # locals()/vars() can read any name, so nothing is provably unused
+        for node in nodes:
+            if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                    and node.func.id in ('locals', 'vars') and not node.args):
+                return
+
+        for name, line in bindings.items():
+            if name.startswith('_') or name in loop_targets:
+                continue
+            try:
+                symbol = table.lookup(name)
+            except KeyError:
+                continue
+            if (not symbol.is_local() or symbol.is_parameter() or symbol.is_namespace()
+                    or symbol.is_imported() or is_used(table, name)):
+                continue
+            yield StaticFinding(
+                'unused_variable', line, name,
+                f"local `{name}` is assigned but never read",
+                "remove the assignment or rename it to `_`"
+            )
+
+    @staticmethod
+    def _global_mutations(scope: ast.AST, loop_nodes: Sequence[ast.AST], table, top) -> Iterator[StaticFinding]:
+        """Module-level names rebound or mutated inside a function's loops"""
+        reported = set()
+
+        def module_name(node: ast.AST) -> Optional[str]:
+            while isinstance(node, (ast.Attribute, ast.Subscript)):
+                node = node.value
+            if not isinstance(node, ast.Name):
+                return None
+            try:
+                symbol = table.lookup(node.id)
+                bound = top.lookup(node.id)
+            except KeyError:
+                return None
+            if symbol.is_global() and (bound.is_assigned() or bound.is_imported()):
+                return node.id
+            return None
+
+        for node in loop_nodes:
+            name = how = None
+            if isinstance(node, (ast.Assign, ast.AugAssign, ast.AnnAssign)):
+                for target in (node.targets if isinstance(node, ast.Assign) else [node.target]):
+                    if isinstance(target, ast.Name) and table.lookup(target.id).is_declared_global():
+                        name, how = target.id, "rebinds"
+                    elif isinstance(target, (ast.Attribute, ast.Subscript)):
+                        name, how = module_name(target), "writes into"
+                    if name:
+                        break
+            elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                  and node.func.attr in MUTATING_METHODS):
+                name, how = module_name(node.func.value), f"calls .{node.func.attr}() on"
+
+            if name and name not in reported:
+                reported.add(name)
+                yield StaticFinding(
+                    'global_mutation', node.lineno, name,
+                    f"loop in `{scope.name}` {how} global `{name}`",
+                    "accumulate into a local and publish it once after the loop"
+                )
+
+    def _loop_closures(self, scope_nodes: Dict[ast.AST, List[ast.AST]],
+                       parents: Dict[ast.AST, ast.AST]) -> Iterator[StaticFinding]:
+        """Lambdas and defs inside loops or comprehensions that read the loop variable late"""
+        for closure in scope_nodes:
+            if not isinstance(closure, (ast.Lambda, ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+
+            # Variables of every loop or comprehension whose body encloses the closure
+            loop_vars = set()
+            child, node = closure, parents.get(closure)
+            while node is not None:
+                if isinstance(node, (ast.For, ast.AsyncFor)) and child is not node.iter:
+                    loop_vars.update(n.id for n in ast.walk(node.target) if isinstance(n, ast.Name))
+                elif (isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp))
+                      and not isinstance(child, ast.comprehension)):
+                    loop_vars.update(n.id for g in node.generators for n in ast.walk(g.target)
+                                     if isinstance(n, ast.Name))
+                child, node = node, parents.get(node)
+            if not loop_vars or not self._escapes(closure, parents):
+                continue
+
+            captured = sorted(loop_vars & self._free_names(closure))
+            if captured:
+                names = ", ".join(f"`{name}`" for name in captured)
+                yield StaticFinding(
+                    'loop_closure', closure.lineno, captured[0],
+                    f"closure captures loop variable {names}, which is read after the loop moves on",
+                    "bind it as a default argument (e.g. `lambda {0}={0}: ...`)".format(captured[0])
+                )
+
+    def _escapes(self, closure: ast.AST, parents: Dict[ast.AST, ast.AST]) -> bool:
+        """Whether a closure can outlive the iteration that created it"""
+        if isinstance(closure, ast.Lambda):
+            return not self._consumed(closure, parents)
+
+        loop = parents.get(closure)
+        while loop is not None and not isinstance(loop, _LOOP_NODES):
+            loop = parents.get(loop)
+        references = [node for node in ast.walk(loop) if isinstance(node, ast.Name)
+                      and node.id == closure.name and isinstance(node.ctx, ast.Load)]
+        return any(not self._consumed(reference, parents) for reference in references)
+
+    @staticmethod
+    def _consumed(node: ast.AST, parents: Dict[ast.AST, ast.AST]) -> bool:
+        """Whether a closure is called on the spot or handed to a call that uses it before returning"""
+        parent = parents.get(node)
+        if isinstance(parent, ast.keyword):
+            parent = parents.get(parent)
+        if not isinstance(parent, ast.Call):
+            return False
+        if parent.func is node:
+            return True
+        func = parent.func
+        name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+        return name in IMMEDIATE_CALLS
+
+    @staticmethod
+    def _free_names(closure: ast.AST) -> Set[str]:
+        """Names a closure reads without binding them itself"""
+        arguments = closure.args
+        bound = {arg.arg for arg in arguments.posonlyargs + arguments.args + arguments.kwonlyargs}
+        bound.update(a.arg for a in (arguments.vararg, arguments.kwarg) if a is not None)
+
+        body = [closure.body] if isinstance(closure, ast.Lambda) else closure.body
+        loaded = set()
+        for statement in body:
+            for node in ast.walk(statement):
+                if isinstance(node, ast.Name):
+                    (bound if isinstance(node.ctx, ast.Store) else loaded).add(node.id)
+        return loaded - bound
+
+    def _type_inconsistencies(self, nodes: List[ast.AST]) -> Iterator[StaticFinding]:
+        """Names reassigned a literal or constructor of a different type"""
+        assignments = []
+        for node in nodes:
+            if isinstance(node, ast.Assign):
+                targets = [t.id for t in node.targets if isinstance(t, ast.Name)]
+            elif isinstance(node, ast.AnnAssign) and node.value is not None and isinstance(node.target, ast.Name):
+                targets = [node.target.id]
+            else:
+                continue
+            value_type = self._literal_type(node.value)
+            if value_type is not None:
+                assignments.extend((node.lineno, node.col_offset, name, value_type) for name in targets)
+
+        first_types: Dict[str, Tuple[str, int]] = {}
+        reported = set()
+        for line, _, name, value_type in sorted(assignments):
+            first = first_types.setdefault(name, (value_type, line))
+            if first[0] != value_type and name not in reported:
+                reported.add(name)
+                yield StaticFinding(
+                    'type_inconsistency', line, name,
+                    f"`{name}` was a {first[0]} on line {first[1]} and is reassigned a {value_type}",
+                    "use a separate name for each type"
+                )
+
+    @staticmethod
+    def _literal_type(value: ast.AST) -> Optional[str]:
+        """Type of a literal or builtin-constructor expression; None when unknown or None itself"""
+        if isinstance(value, ast.UnaryOp) and isinstance(value.op, (ast.USub, ast.UAdd)):
+            value = value.operand
+        if isinstance(value, ast.Constant):
+            if value.value is None or value.value is Ellipsis:
+                return None
+            if isinstance(value.value, bool):
+                return 'bool'
+            if isinstance(value.value, (int, float, complex)):
+                return 'number'
+            return type(value.value).__name__
+        if isinstance(value, ast.JoinedStr):
+            return 'str'
+        if isinstance(value, (ast.List, ast.ListComp)):
+            return 'list'
+        if isinstance(value, (ast.Dict, ast.DictComp)):
+            return 'dict'
+        if isinstance(value, (ast.Set, ast.SetComp)):
+            return 'set'
+        if isinstance(value, ast.Tuple):
+            return 'tuple'
+        if isinstance(value, ast.Call) and isinstance(value.func, ast.Name):
+            return _CONSTRUCTOR_TYPES.get(value.func.id)
+        return None
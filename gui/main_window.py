@@ -16,6 +16,7 @@ from ..config.settings import OracleConfig, enforce_tier_limits, AVATARS, CHANT_
 from ..core.hybrid_engine import HybridEngineCore
 from ..api.supabase_client import SupabaseClient
 from ..api.payment_gateway import PaymentGateway
+from ..utils.data_flow_manager import data_flow_manager, send_code_analysis, send_project_analysis, DataFlowType
 
 class TierBadge(QWidget):
     """Sacred tier badge display widget"""
@@ -177,6 +178,9 @@ class MainWindow(QMainWindow):
         self.current_tier = "Bronze"
         self.current_avatar = "Valkarion"
 
+        # Streamed answers by request packet - deltas can arrive out of order from concurrent workers
+        self.stream_buffers: Dict[str, Dict] = {}
+
         self.init_ui()
         self.init_connections()
 
@@ -326,6 +330,10 @@ class MainWindow(QMainWindow):
         self.explain_button.clicked.connect(self.explain_fix)
         layout.addWidget(self.explain_button)
 
+        self.project_button = ActionButton("ANALYZE PROJECT", "📦")
+        self.project_button.clicked.connect(self.analyze_project)
+        layout.addWidget(self.project_button)
+
         # Promo code section
         promo_layout = QHBoxLayout()
         self.promo_input = QLineEdit()
@@ -460,6 +468,9 @@ class MainWindow(QMainWindow):
         self.usage_timer.timeout.connect(self.update_usage_display)
         self.usage_timer.start(60000)  # Update every minute
 
+        # Engine results (including streamed deltas) arrive over the data flow bus
+        data_flow_manager.data_received.connect(self.handle_data_flow_update)
+
     # Action Methods
     def upload_file(self):
         """Handle file upload"""
@@ -491,6 +502,22 @@ class MainWindow(QMainWindow):
         """Sacred explanation invocation"""
         self.perform_action("explain", "🧙‍♂️ SUMMONING WISDOM...")
 
+    def analyze_project(self):
+        """Sacred project-wide invocation over a whole directory"""
+        project_path = QFileDialog.getExistingDirectory(self, "Select Project Directory")
+        if not project_path:
+            return
+
+        task_type, ok = QInputDialog.getItem(
+            self, "Project Analysis", "Task:", ["cleanse", "inspect", "optimize", "explain"], 0, False
+        )
+        if not ok:
+            return
+
+        self.status_label.setText(f"📦 ANALYZING {Path(project_path).name}...")
+        self.results_text.append(f"\n📦 Project analysis of {project_path} ({task_type})")
+        send_project_analysis(self.current_user or "guest", project_path, task_type, self.current_tier)
+
     def perform_action(self, action_type: str, status_message: str):
         """Perform sacred action with the hybrid engine"""
         if not hasattr(self, 'current_file_path'):
@@ -501,26 +528,97 @@ class MainWindow(QMainWindow):
         limits = enforce_tier_limits(self.current_tier)
         # TODO: Implement usage tracking
 
+        with open(self.current_file_path, 'r', encoding='utf-8') as f:
+            code_content = f.read()
+
         self.status_label.setText(status_message)
         self.results_text.append(f"\n{status_message}")
 
-        # TODO: Implement async call to hybrid engine
-        # For now, simulate processing
-        QTimer.singleShot(2000, lambda: self.show_mock_result(action_type))
-
-    def show_mock_result(self, action_type: str):
-        """Show mock result (replace with real hybrid engine call)"""
-        mock_results = {
-            "optimize": "✨ Sacred optimization complete! Found 3 performance improvements.",
-            "cleanse": "🔮 Import purification successful! Removed 2 unused imports.",
-            "inspect": "👁️ Variable mysteries revealed! Found 1 scope optimization.",
-            "explain": "🧙‍♂️ Divine wisdom dispensed! Code patterns explained."
-        }
+        # Stream the answer so the first tokens show up while DeepSeek is still writing
+        send_code_analysis(
+            self.current_user or "guest",
+            code_content,
+            action_type,
+            Path(self.current_file_path).suffix,
+            stream=True,
+            filename=str(self.current_file_path)
+        )
 
-        result = mock_results.get(action_type, "Sacred invocation complete!")
-        self.results_text.append(f"\n{result}")
+    def handle_data_flow_update(self, packet):
+        """Render engine results, appending streamed deltas as they arrive"""
+        if packet.flow_type == DataFlowType.PROJECT_PROGRESS:
+            self.handle_project_progress(packet.data)
+            return
+        if packet.flow_type != DataFlowType.ML_RESULT:
+            return
+
+        analysis = packet.data['analysis_result']
+        stream = packet.data.get('stream', {})
+
+        if stream:
+            buffer = self.stream_buffers.setdefault(
+                packet.data['original_packet_id'], {'next': 0, 'deltas': {}, 'final': None}
+            )
+            if stream.get('delta'):
+                buffer['deltas'][stream['sequence']] = analysis['result']
+            else:
+                buffer['final'] = (stream, analysis)
+            self.drain_stream(packet.data['original_packet_id'])
+            return
+
+        if packet.data.get('provisional'):
+            self.results_text.append(
+                f"\n⏳ Local answer ({analysis['confidence']:.0%} confidence) - consulting DeepSeek...\n"
+                f"{analysis['result']}"
+            )
+            return
+
+        self.show_final_result(analysis, streamed=False)
+
+    def drain_stream(self, request_id: str):
+        """Append a stream's deltas in sequence order, then its summary once every delta is on screen"""
+        buffer = self.stream_buffers[request_id]
+        while buffer['next'] in buffer['deltas']:
+            if buffer['next'] == 0:
+                self.results_text.append("\n📜 ")
+            self.results_text.moveCursor(QTextCursor.End)
+            self.results_text.insertPlainText(buffer['deltas'].pop(buffer['next']))
+            self.results_text.ensureCursorVisible()
+            buffer['next'] += 1
+
+        if buffer['final'] is None:
+            return
+        stream, analysis = buffer['final']
+        # The final packet's sequence is the number of deltas sent before it
+        if stream.get('streamed') and buffer['next'] < stream['sequence']:
+            return
+        del self.stream_buffers[request_id]
+        self.show_final_result(analysis, streamed=stream.get('streamed', False))
+
+    def show_final_result(self, analysis: Dict, streamed: bool):
+        """Show a finished answer - streamed answers are already on screen, so only the summary is left"""
+        if not streamed:
+            self.results_text.append(f"\n📜 {analysis['result']}")
+
+        self.results_text.append(
+            f"\n✨ {analysis['model_type']} | confidence {analysis['confidence']:.0%} | "
+            f"{analysis['execution_time']:.2f}s"
+        )
         self.status_label.setText("🔮 Ready for divine invocation")
 
+    def handle_project_progress(self, progress: Dict):
+        """Show per-file progress of a project run, then its consolidated report"""
+        if progress['event'] == 'started':
+            self.results_text.append(f"📦 {progress['total']} files queued, {progress['skipped']} skipped")
+        elif progress['event'] == 'file_done':
+            self.status_label.setText(
+                f"📦 {progress['completed']}/{progress['total']} files "
+                f"({progress['files_per_minute']:.1f} files/min)"
+            )
+        elif progress['event'] == 'completed':
+            self.results_text.append(f"\n{progress['rendered']}")
+            self.status_label.setText("🔮 Ready for divine invocation")
+
     def redeem_promo(self):
         """Redeem promo code"""
         promo_code = self.promo_input.text().strip()
@@ -19,8 +19,10 @@ Features:
 import sys
 import argparse
 import asyncio
+import json
 import logging
 from pathlib import Path
+from typing import Optional
 from PyQt5.QtWidgets import QApplication, QSplashScreen, QLabel
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QPixmap, QFont
@@ -62,9 +64,12 @@ class OracleApplication:
             # Check PyQt5
             from PyQt5.QtWidgets import QApplication
 
-            # Check ML libraries
-            import xgboost
-            import torch
+            # Check ML libraries without importing them - the engine loads
+            # them lazily and torch alone costs seconds of startup
+            import importlib.util
+            for module_name in ('xgboost', 'torch'):
+                if importlib.util.find_spec(module_name) is None:
+                    raise ImportError(f"No module named '{module_name}'")
 
             # Check API libraries
             import supabase
@@ -283,28 +288,33 @@ class OracleApplication:
         while True:
             print("\n📜 Sacred Commands:")
             print("1. 📁 Analyze code file")
-            print("2. 🎟️ Generate promo code")
-            print("3. 🔍 Check tier limits")
-            print("4. 📊 View system metrics")
-            print("5. 🔐 Encryption tools")
-            print("6. 🧪 Test data flow")
-            print("7. 🚪 Exit")
+            print("2. 📦 Analyze project (directory or archive)")
+            print("3. 🎟️ Generate promo code")
+            print("4. 🔍 Check tier limits")
+            print("5. 📊 View system metrics")
+            print("6. 🔐 Encryption tools")
+            print("7. 🧪 Test data flow")
+            print("8. 🚪 Exit")
 
-            choice = input("\nSelect command (1-7): ").strip()
+            choice = input("\nSelect command (1-8): ").strip()
 
             if choice == "1":
                 await self.cli_analyze_code()
             elif choice == "2":
-                await self.cli_generate_promo()
+                project_path = input("Enter directory or archive path: ").strip()
+                task_type = input("Task type (optimize/cleanse/inspect/explain): ").strip() or "cleanse"
+                await self.cli_analyze_project(project_path, task_type)
             elif choice == "3":
-                self.cli_check_limits()
+                await self.cli_generate_promo()
             elif choice == "4":
-                self.cli_show_metrics()
+                self.cli_check_limits()
             elif choice == "5":
-                self.cli_encryption_tools()
+                self.cli_show_metrics()
             elif choice == "6":
-                await self.cli_test_data_flow()
+                self.cli_encryption_tools()
             elif choice == "7":
+                await self.cli_test_data_flow()
+            elif choice == "8":
                 print("🌟 May your code be forever optimized!")
                 break
             else:
@@ -338,6 +348,38 @@ class OracleApplication:
         print("✅ Analysis request sent through data flow system")
         print("In GUI mode, results would appear in the interface")
 
+    async def cli_analyze_project(self, project_path: str, task_type: str, tier: str = "Bronze",
+                                  report_path: Optional[str] = None) -> int:
+        """CLI project-wide batch analysis with live progress"""
+        if not Path(project_path).exists():
+            print("❌ Project not found!")
+            return 1
+
+        from script_oracle.utils.data_flow_manager import data_flow_manager
+
+        def show_progress(event):
+            if event['event'] == 'started':
+                print(f"📦 {event['total']} files to analyse ({event['skipped']} skipped)")
+            elif event['event'] == 'file_done':
+                status = "💀" if event['failed'] else "✅"
+                print(f"   [{event['completed']}/{event['total']}] {status} {event['path']} "
+                      f"({event['files_per_minute']:.1f} files/min)")
+
+        try:
+            report = await data_flow_manager.run_project_analysis(
+                "cli_user", project_path, task_type, tier, on_progress=show_progress
+            )
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+
+        print("\n" + report.render())
+        if report_path:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report.to_dict(), f, indent=2)
+            print(f"\n💾 Report written to {report_path}")
+        return 0
+
     async def cli_generate_promo(self):
         """CLI promo generation"""
         from script_oracle.rituals.promo_generator import PromoGenerator
@@ -402,6 +444,38 @@ class OracleApplication:
         print("\n🔄 Queue Status:")
         for queue_name, size in metrics['queue_sizes'].items():
             print(f"   {queue_name.title()} Queue: {size} packets")
+        flow_control = metrics['flow_control']
+        print(f"   Rejected: {flow_control['rejected']} | Shed: {flow_control['shed']} "
+              f"| Degraded: {flow_control['degraded']} | Waited: {flow_control['waited']}")
+
+        cache_metrics = metrics['engine']['result_cache']
+        if cache_metrics:
+            print("\n📜 Result Cache:")
+            print(f"   Hits: {cache_metrics['hits']} | Misses: {cache_metrics['misses']} | Evictions: {cache_metrics['evictions']}")
+            print(f"   Hit Rate: {cache_metrics['hit_rate']:.1%}")
+
+        fix_index_metrics = metrics['engine']['fix_index']
+        if fix_index_metrics:
+            print("\n🗂️ Fix Index:")
+            print(f"   Entries: {fix_index_metrics['entries']} | Answers: {metrics['engine']['fix_index_answers']} "
+                  f"| Seeds: {metrics['engine']['fix_index_seeds']}")
+            if fix_index_metrics['search_p95_ms'] is not None:
+                print(f"   Search Latency: p50 {fix_index_metrics['search_p50_ms']:.2f}ms, "
+                      f"p95 {fix_index_metrics['search_p95_ms']:.2f}ms")
+
+        transport_metrics = metrics['engine']['transport']
+        print("\n🌐 OpenRouter Transport:")
+        print(f"   Retries: {transport_metrics['retries']} | Hedges: {transport_metrics['hedges_sent']} "
+              f"({transport_metrics['hedge_wins']} won) | Circuit Rejections: {transport_metrics['circuit_rejections']}")
+        for endpoint, circuit in transport_metrics['circuits'].items():
+            print(f"   Circuit {endpoint}: {circuit['state']} (opened {circuit['opens']}x)")
+        print(f"   Local Fallbacks: {metrics['engine']['local_fallbacks']}")
+
+        router_metrics = metrics['engine']['router']
+        print("\n🧭 Adaptive Router:")
+        print(f"   Decisions: {router_metrics['decisions']} | Overrides: {router_metrics['overrides']} | Explorations: {router_metrics['explorations']}")
+        print(f"   Cascade Escalations: {router_metrics['escalations']}")
+        print(f"   Estimated Savings: {router_metrics['estimated_savings']:.2f} cost units")
 
     def cli_encryption_tools(self):
         """CLI encryption utilities"""
@@ -501,6 +575,7 @@ Examples:
   python main.py                    # Launch integrated GUI
   python main.py --cli              # Enhanced CLI mode
   python main.py --check-env        # Verify configuration
+  python main.py --project src/ --task cleanse --report report.json
 
 🔱 May your code be forever optimized! 🔱
         """
@@ -509,6 +584,12 @@ Examples:
     parser.add_argument('--cli', action='store_true', help='Run in enhanced CLI mode')
     parser.add_argument('--check-env', action='store_true', help='Check environment setup')
     parser.add_argument('--debug', action='store_true', help='Enable debug mode')
+    parser.add_argument('--project', metavar='PATH', help='Analyze a whole directory or archive and exit')
+    parser.add_argument('--task', default='cleanse', choices=['optimize', 'cleanse', 'inspect', 'explain'],
+                        help='Task for --project (default: cleanse)')
+    parser.add_argument('--tier', default='Bronze', choices=list(OracleConfig.TIER_LIMITS),
+                        help='Tier whose upload size limit filters --project files (default: Bronze)')
+    parser.add_argument('--report', metavar='FILE', help='Write the --project report as JSON')
 
     args = parser.parse_args()
 
@@ -528,6 +609,9 @@ Examples:
                 print("⚠️ Environment has some issues. See messages above.")
                 return 1
 
+        elif args.project:
+            return asyncio.run(oracle_app.cli_analyze_project(args.project, args.task, args.tier, args.report))
+
         elif args.cli:
             return asyncio.run(oracle_app.run_cli())
 
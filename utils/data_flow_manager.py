@@ -6,68 +6,21 @@ Efficient data transfer loop connecting all Script Oracle modules
 import asyncio
 import json
 import logging
+import threading
+import time
 from typing import Dict, Any, Optional, List, Union
 from datetime import datetime
-from dataclasses import dataclass, asdict
-from enum import Enum
-import queue
-import threading
 from PyQt5.QtCore import QObject, pyqtSignal, QThread, QTimer
 
 from ..config.settings import OracleConfig
-from ..utils.encryption import sacred_encryption
+from ..utils.data_packet import DataFlowType, DataPacket
+from ..utils.packet_scheduler import PacketScheduler, PacketWorkerPool
 from ..core.hybrid_engine import HybridEngineCore, InvocationResult
+from ..core.project_analysis import ProjectAnalyzer, ProjectReport
 from ..api.supabase_client import SupabaseClient
 from ..api.payment_gateway import PaymentGateway
 from ..rituals.promo_generator import PromoGenerator
 
-class DataFlowType(Enum):
-    """Types of data flowing through the system"""
-    USER_ACTION = "user_action"
-    ML_RESULT = "ml_result"
-    PAYMENT_EVENT = "payment_event"
-    PROMO_EVENT = "promo_event"
-    TIER_UPDATE = "tier_update"
-    USAGE_UPDATE = "usage_update"
-    SYSTEM_EVENT = "system_event"
-    ERROR_EVENT = "error_event"
-
-@dataclass
-class DataPacket:
-    """Universal data packet for inter-module communication"""
-    packet_id: str
-    flow_type: DataFlowType
-    source_module: str
-    target_module: Optional[str]
-    data: Dict[str, Any]
-    timestamp: str
-    encrypted: bool = False
-    priority: int = 0  # 0=normal, 1=high, 2=critical
-
-    def encrypt_data(self):
-        """Encrypt sensitive data in packet"""
-        if not self.encrypted and self.contains_sensitive_data():
-            self.data = {"encrypted_payload": sacred_encryption.encrypt_data(self.data)}
-            self.encrypted = True
-
-    def decrypt_data(self):
-        """Decrypt data if encrypted"""
-        if self.encrypted and "encrypted_payload" in self.data:
-            self.data = sacred_encryption.decrypt_data(self.data["encrypted_payload"])
-            self.encrypted = False
-
-    def contains_sensitive_data(self) -> bool:
-        """Check if packet contains sensitive information"""
-        sensitive_keys = [
-            'payment', 'transaction', 'email', 'password', 'api_key',
-            'personal_info', 'financial_data', 'user_data'
-        ]
-        return any(key in str(self.data).lower() for key in sensitive_keys)
-
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization"""
-        return asdict(self)
-
 class DataFlowManager(QObject):
     """🌟 Central data flow orchestrator for all modules"""
 
@@ -76,6 +29,14 @@ class DataFlowManager(QObject):
     error_occurred = pyqtSignal(str, str)  # error_message, source_module
     status_updated = pyqtSignal(str)  # status_message
 
+    PRIORITY_NAMES = {2: 'critical', 1: 'high', 0: 'normal'}
+
+    # Requests entering the system - the only packets held to the queue capacities
+    INGRESS_FLOWS = (DataFlowType.USER_ACTION,)
+
+    # Normal-priority flows dropped first to make room for a request when a queue is full
+    SHEDDABLE_FLOWS = (DataFlowType.SYSTEM_EVENT,)
+
     def __init__(self):
         super().__init__()
         self.config = OracleConfig()
@@ -86,11 +47,23 @@ class DataFlowManager(QObject):
         self.supabase_client = SupabaseClient()
         self.payment_gateway = PaymentGateway()
         self.promo_generator = PromoGenerator()
+        self.project_analyzer = ProjectAnalyzer(
+            self.hybrid_engine,
+            extensions=self.config.PROJECT_EXTENSIONS,
+            max_concurrent_files=self.config.PROJECT_MAX_CONCURRENT_FILES,
+            skip_dirs=self.config.PROJECT_SKIP_DIRS,
+            max_files=self.config.PROJECT_MAX_FILES
+        )
 
-        # Data queues for different priority levels
-        self.critical_queue = queue.PriorityQueue()
-        self.high_queue = queue.PriorityQueue()
-        self.normal_queue = queue.PriorityQueue()
+        # One weighted-fair queue across the critical, high and normal classes
+        self.scheduler = PacketScheduler(
+            self.config.DATA_FLOW_PRIORITY_WEIGHTS,
+            aging_seconds=self.config.DATA_FLOW_AGING_MS / 1000,
+            names=self.PRIORITY_NAMES,
+            capacities=self.config.DATA_FLOW_QUEUE_CAPACITY,
+            aging_interval=self.config.DATA_FLOW_AGING_INTERVAL
+        )
+        self.worker_pool: Optional[PacketWorkerPool] = None
 
         # Event handlers registry
         self.event_handlers: Dict[DataFlowType, List[callable]] = {}
@@ -105,6 +78,7 @@ class DataFlowManager(QObject):
             'avg_processing_time': 0.0,
             'last_processed': None
         }
+        self.flow_control = {'rejected': 0, 'shed': 0, 'degraded': 0, 'waited': 0}
 
         self.setup_event_handlers()
         self.start_processing_workers()
@@ -119,6 +93,7 @@ class DataFlowManager(QObject):
         self.register_handler(DataFlowType.USAGE_UPDATE, self.handle_usage_update)
         self.register_handler(DataFlowType.SYSTEM_EVENT, self.handle_system_event)
         self.register_handler(DataFlowType.ERROR_EVENT, self.handle_error_event)
+        self.register_handler(DataFlowType.PROJECT_PROGRESS, self.handle_project_progress)
 
     def register_handler(self, flow_type: DataFlowType, handler: callable):
         """Register event handler for specific flow type"""
@@ -132,97 +107,169 @@ class DataFlowManager(QObject):
                      data: Dict[str, Any],
                      target_module: Optional[str] = None,
                      priority: int = 0) -> DataPacket:
-        """Create new data packet with unique ID"""
-        import uuid
-
-        packet = DataPacket(
-            packet_id=str(uuid.uuid4()),
-            flow_type=flow_type,
-            source_module=source_module,
-            target_module=target_module,
-            data=data,
-            timestamp=datetime.utcnow().isoformat(),
-            priority=priority
-        )
-
-        # Auto-encrypt sensitive data
-        packet.encrypt_data()
-
-        return packet
-
-    def send_data(self, packet: DataPacket):
-        """Send data packet through the flow system"""
+        """Create new data packet with unique ID - it stays unencrypted until seal()ed at a boundary"""
+        return DataPacket.create(flow_type, source_module, data, target_module=target_module, priority=priority)
+
+    def send_data(self, packet: DataPacket) -> bool:
+        """
+        Send data packet through the flow system
+
+        Returns False when an incoming request's priority class is full and
+        it was rejected. In 'wait' backpressure mode a caller on a plain
+        thread first blocks up to DATA_FLOW_SEND_TIMEOUT_MS for room; code
+        running on an event loop should await send_data_async instead.
+        Packets derived from work under way are never refused.
+        """
         try:
-            # Add to active flows tracking
-            self.active_flows[packet.packet_id] = packet
-
-            # Route to appropriate queue based on priority
-            if packet.priority == 2:  # Critical
-                self.critical_queue.put((0, packet))
-            elif packet.priority == 1:  # High
-                self.high_queue.put((1, packet))
-            else:  # Normal
-                self.normal_queue.put((2, packet))
-
-            self.logger.debug(f"📤 Packet sent: {packet.packet_id} from {packet.source_module}")
+            if self._admit(packet) != 'full':
+                return True
+
+            if self.config.DATA_FLOW_BACKPRESSURE == 'wait' and not self._on_event_loop():
+                room = threading.Event()
+                deadline = time.monotonic() + self.config.DATA_FLOW_SEND_TIMEOUT_MS / 1000
+                self.flow_control['waited'] += 1
+                try:
+                    while time.monotonic() < deadline:
+                        room.clear()
+                        if self._admit(packet, waker=room.set) != 'full':
+                            return True
+                        room.wait(deadline - time.monotonic())
+                finally:
+                    self.scheduler.forget(room.set)
+
+            return self._reject(packet)
 
         except Exception as e:
             self.logger.error(f"💀 Failed to send packet: {e}")
             self.error_occurred.emit(str(e), packet.source_module)
+            return False
 
-    def start_processing_workers(self):
-        """Start background workers for processing data packets"""
-        # Critical queue processor
-        self.critical_worker = threading.Thread(
-            target=self._process_queue_worker, 
-            args=(self.critical_queue, "critical"),
-            daemon=True
-        )
-        self.critical_worker.start()
-
-        # High priority queue processor  
-        self.high_worker = threading.Thread(
-            target=self._process_queue_worker,
-            args=(self.high_queue, "high"),
-            daemon=True
-        )
-        self.high_worker.start()
+    async def send_data_async(self, packet: DataPacket) -> bool:
+        """send_data for handlers and other coroutines - 'wait' mode awaits room instead of blocking"""
+        try:
+            if self._admit(packet) != 'full':
+                return True
+
+            if self.config.DATA_FLOW_BACKPRESSURE == 'wait':
+                loop = asyncio.get_running_loop()
+                room = asyncio.Event()
+
+                def waker():
+                    try:
+                        loop.call_soon_threadsafe(room.set)
+                    except RuntimeError:
+                        pass  # Loop closed at shutdown
+
+                deadline = loop.time() + self.config.DATA_FLOW_SEND_TIMEOUT_MS / 1000
+                self.flow_control['waited'] += 1
+                try:
+                    while loop.time() < deadline:
+                        room.clear()
+                        if self._admit(packet, waker=waker) != 'full':
+                            return True
+                        try:
+                            await asyncio.wait_for(room.wait(), deadline - loop.time())
+                        except asyncio.TimeoutError:
+                            break
+                finally:
+                    self.scheduler.forget(waker)
+
+            return self._reject(packet)
 
-        # Normal queue processor
-        self.normal_worker = threading.Thread(
-            target=self._process_queue_worker,
-            args=(self.normal_queue, "normal"),
-            daemon=True
-        )
-        self.normal_worker.start()
+        except Exception as e:
+            self.logger.error(f"💀 Failed to send packet: {e}")
+            self.error_occurred.emit(str(e), packet.source_module)
+            return False
+
+    def _admit(self, packet: DataPacket, waker: Optional[callable] = None) -> str:
+        """
+        Queue a packet, making room for a request when its class is full
+
+        Only requests (INGRESS_FLOWS) are held to the class capacities.
+        Results, stream deltas, progress events and usage counts derive from
+        work already under way - often a DeepSeek call already paid for - so
+        they always get in; while their class is over capacity a usage
+        count is merged into one already queued for the same user instead.
+        A request facing a full class makes the oldest queued sheddable
+        packet of the class go first.
+
+        Returns 'queued', 'folded' or - for a request only - 'full'.
+        """
+        if packet.flow_type not in self.INGRESS_FLOWS:
+            if self.scheduler.at_capacity(packet.priority) and self._fold_usage(packet):
+                return 'folded'
+            self.active_flows[packet.packet_id] = packet
+            self.scheduler.put(packet, packet.priority, bounded=False)
+            self.logger.debug(f"📤 Packet sent: {packet.packet_id} from {packet.source_module}")
+            return 'queued'
 
-    def _process_queue_worker(self, data_queue: queue.PriorityQueue, queue_name: str):
-        """Worker thread for processing data packets"""
-        while True:
-            try:
-                # Get packet from queue (blocking)
-                priority, packet = data_queue.get(timeout=1)
+        self.active_flows[packet.packet_id] = packet
+        if self.scheduler.put(packet, packet.priority):
+            self.logger.debug(f"📤 Packet sent: {packet.packet_id} from {packet.source_module}")
+            return 'queued'
 
-                # Process the packet
-                asyncio.run(self._process_packet(packet))
+        victim = self.scheduler.shed(packet.priority, self._is_sheddable)
+        if victim is not None:
+            self.active_flows.pop(victim.packet_id, None)
+            self.flow_control['shed'] += 1
+            self.logger.debug(f"🍂 Packet shed: {victim.packet_id} ({victim.flow_type.value})")
 
-                # Mark task as done
-                data_queue.task_done()
+        if self.scheduler.put(packet, packet.priority, waker=waker):
+            self.logger.debug(f"📤 Packet sent: {packet.packet_id} from {packet.source_module}")
+            return 'queued'
+
+        self.active_flows.pop(packet.packet_id, None)
+        return 'full'
+
+    def _is_sheddable(self, packet: DataPacket) -> bool:
+        return packet.priority <= 0 and packet.flow_type in self.SHEDDABLE_FLOWS
+
+    def _fold_usage(self, packet: DataPacket) -> bool:
+        """Merge a usage count into a queued update for the same user - False when it is not one or there is none"""
+        def is_usage_count(candidate: DataPacket) -> bool:
+            return (candidate.flow_type == DataFlowType.USAGE_UPDATE
+                    and 'bonus_uses' not in candidate.data
+                    and candidate.data.get('user_id') == packet.data.get('user_id'))
+
+        def merge(queued: DataPacket, extra: DataPacket):
+            queued.data['count'] = queued.data.get('count', 1) + extra.data.get('count', 1)
+
+        if is_usage_count(packet) and self.scheduler.fold(packet, packet.priority, is_usage_count, merge):
+            self.flow_control['degraded'] += 1
+            return True
+        return False
+
+    def _reject(self, packet: DataPacket) -> bool:
+        self.flow_control['rejected'] += 1
+        queue_name = self.PRIORITY_NAMES[self.scheduler.priority_class(packet.priority)]
+        self.logger.warning(f"🚧 Packet rejected, {queue_name} queue full: {packet.packet_id} from {packet.source_module}")
+        self.error_occurred.emit(f"Data flow {queue_name} queue is full - request rejected", packet.source_module)
+        return False
+
+    @staticmethod
+    def _on_event_loop() -> bool:
+        try:
+            asyncio.get_running_loop()
+            return True
+        except RuntimeError:
+            return False
 
-            except queue.Empty:
-                continue
-            except Exception as e:
-                self.logger.error(f"💀 Queue worker error ({queue_name}): {e}")
+    def start_processing_workers(self):
+        """Start the worker pool that drains the scheduler"""
+        self.worker_pool = PacketWorkerPool(
+            self.scheduler,
+            self._process_packet,
+            workers=self.config.DATA_FLOW_WORKERS,
+            concurrency=self.config.DATA_FLOW_WORKER_CONCURRENCY,
+            name="data-flow-worker"
+        )
+        self.worker_pool.start()
 
     async def _process_packet(self, packet: DataPacket):
         """Process individual data packet"""
         start_time = datetime.utcnow()
 
         try:
-            # Decrypt if needed
-            if packet.encrypted:
-                packet.decrypt_data()
-
             # Get handlers for this flow type
             handlers = self.event_handlers.get(packet.flow_type, [])
 
@@ -267,7 +314,7 @@ class DataFlowManager(QObject):
                 'original_packet_id': packet.packet_id,
                 'error_message': str(error),
                 'error_type': type(error).__name__,
-                'failed_packet': packet.to_dict()
+                'failed_packet': packet.seal()  # Logged to the database - sensitive fields stay sealed
             },
             priority=1
         )
@@ -298,48 +345,168 @@ class DataFlowManager(QObject):
             code_content = action_data.get('code_content')
             task_type = action_data.get('task_type', 'optimize')
             file_extension = action_data.get('file_extension', '.py')
+            filename = action_data.get('filename')
+
+            if action_data.get('stream'):
+                await self._stream_analysis_results(
+                    packet, user_id, code_content, task_type, file_extension, filename
+                )
+            else:
+                # Process through ML engine - a local answer is shown while DeepSeek refines it.
+                # The engine calls back synchronously; a result packet is never refused, so send_data does not block
+                result = await self.hybrid_engine.process_code_scroll(
+                    code_content, task_type, file_extension,
+                    on_local_result=lambda local: self.send_data(self._analysis_result_packet(
+                        packet, user_id, local, provisional=True
+                    )),
+                    user_id=user_id,
+                    filename=filename
+                )
+                await self._send_analysis_result(packet, user_id, result)
 
-            # Process through ML engine
-            result = await self.hybrid_engine.process_code_scroll(
-                code_content, task_type, file_extension
-            )
-
-            # Send result back
-            result_packet = self.create_packet(
-                flow_type=DataFlowType.ML_RESULT,
-                source_module="hybrid_engine",
-                target_module=packet.source_module,
+            # Log usage
+            usage_packet = self.create_packet(
+                flow_type=DataFlowType.USAGE_UPDATE,
+                source_module="data_flow_manager",
                 data={
                     'user_id': user_id,
-                    'original_packet_id': packet.packet_id,
-                    'analysis_result': {
-                        'model_type': result.model_type.value,
-                        'result': result.result,
-                        'confidence': result.confidence,
-                        'execution_time': result.execution_time,
-                        'metadata': result.metadata
-                    }
+                    'action_type': task_type,
+                    'timestamp': datetime.utcnow().isoformat()
                 }
             )
-            self.send_data(result_packet)
+            await self.send_data_async(usage_packet)
 
-            # Log usage
+        elif action_type == 'project_analysis':
+            task_type = action_data.get('task_type', 'cleanse')
+            report = await self.run_project_analysis(
+                user_id, action_data.get('project_path'), task_type, action_data.get('tier', 'Bronze')
+            )
+
+            # One usage entry per analysed file
             usage_packet = self.create_packet(
                 flow_type=DataFlowType.USAGE_UPDATE,
                 source_module="data_flow_manager",
                 data={
                     'user_id': user_id,
                     'action_type': task_type,
+                    'count': report.summary()['files_analysed'],
                     'timestamp': datetime.utcnow().isoformat()
                 }
             )
-            self.send_data(usage_packet)
+            await self.send_data_async(usage_packet)
+
+    async def run_project_analysis(self, user_id: str, project_path: str, task_type: str, tier: str = 'Bronze',
+                                   on_progress: Optional[callable] = None) -> ProjectReport:
+        """
+        📦 Analyse a whole directory or archive
+
+        Every progress event (run started, each file finished, consolidated
+        report) goes out on the bus as a PROJECT_PROGRESS packet; files above
+        the tier's upload limit are skipped.
+        """
+        if tier not in self.config.TIER_LIMITS:
+            raise ValueError(f"Unknown tier {tier!r} - expected one of {', '.join(self.config.TIER_LIMITS)}")
+        max_file_bytes = self.config.TIER_LIMITS[tier]['upload_limit_kb'] * 1024
+
+        def publish(event: Dict[str, Any]):
+            # Called synchronously by the analyzer; progress packets are never refused, so this does not block
+            self.send_data(self.create_packet(
+                flow_type=DataFlowType.PROJECT_PROGRESS,
+                source_module="project_analyzer",
+                data={'user_id': user_id, **event}
+            ))
+            if on_progress is not None:
+                on_progress(event)
+
+        return await self.project_analyzer.analyze(
+            project_path, task_type, max_file_bytes, user_id=user_id, on_progress=publish
+        )
+
+    async def _send_analysis_result(self, packet: DataPacket, user_id: str, result: InvocationResult,
+                                    stream: Optional[Dict[str, Any]] = None, provisional: bool = False):
+        """Send an engine result back to the requesting module"""
+        await self.send_data_async(self._analysis_result_packet(packet, user_id, result, stream, provisional))
+
+    def _analysis_result_packet(self, packet: DataPacket, user_id: str, result: InvocationResult,
+                                stream: Optional[Dict[str, Any]] = None, provisional: bool = False) -> DataPacket:
+        """ML_RESULT packet carrying an engine result for the requesting module"""
+        data = {
+            'user_id': user_id,
+            'original_packet_id': packet.packet_id,
+            'analysis_result': result.to_dict()
+        }
+        if stream is not None:
+            data['stream'] = stream
+        if provisional:
+            data['provisional'] = True
+
+        return self.create_packet(
+            flow_type=DataFlowType.ML_RESULT,
+            source_module="hybrid_engine",
+            target_module=packet.source_module,
+            data=data
+        )
+
+    async def _stream_analysis_results(self, packet: DataPacket, user_id: str,
+                                       code_content: str, task_type: str, file_extension: str,
+                                       filename: Optional[str] = None):
+        """Forward streamed engine output as ML_RESULT deltas
+
+        The first token is sent immediately; later tokens are coalesced into
+        one delta per STREAM_FLUSH_INTERVAL_MS so the bus is not flooded with
+        a packet per token.
+        """
+        flush_interval = self.config.STREAM_FLUSH_INTERVAL_MS / 1000
+        pending: List[str] = []
+        last_partial = None
+        last_flush = 0.0
+        sequence = 0
+
+        async def flush():
+            nonlocal sequence, last_flush
+            delta = InvocationResult(
+                model_type=last_partial.model_type,
+                result="".join(pending),
+                confidence=last_partial.confidence,
+                execution_time=last_partial.execution_time,
+                metadata=last_partial.metadata
+            )
+            await self._send_analysis_result(packet, user_id, delta, stream={'delta': True, 'sequence': sequence})
+            pending.clear()
+            sequence += 1
+            last_flush = time.monotonic()
+
+        async for partial in self.hybrid_engine.stream_code_scroll(code_content, task_type, file_extension,
+                                                                     user_id=user_id, filename=filename):
+            if partial.metadata.get('done'):
+                if pending:
+                    await flush()
+                await self._send_analysis_result(
+                    packet, user_id, partial,
+                    stream={'delta': False, 'sequence': sequence, 'streamed': sequence > 0}
+                )
+                break
+
+            if partial.metadata.get('provisional'):
+                # Local cascade answer, shown whole while DeepSeek streams the refinement
+                await self._send_analysis_result(packet, user_id, partial, provisional=True)
+                continue
+
+            pending.append(partial.result)
+            last_partial = partial
+            if sequence == 0 or time.monotonic() - last_flush >= flush_interval:
+                await flush()
 
     async def handle_ml_result(self, packet: DataPacket):
         """Handle ML processing results"""
         result_data = packet.data
         user_id = result_data.get('user_id')
 
+        # Stream deltas and provisional answers go straight to the GUI - only the final result is stored
+        if result_data.get('stream', {}).get('delta') or result_data.get('provisional'):
+            self.data_received.emit(packet)
+            return
+
         # Store result in database
         await self.supabase_client.log_invocation(
             user_id=user_id,
@@ -378,7 +545,7 @@ class DataFlowManager(QObject):
                 },
                 priority=1
             )
-            self.send_data(tier_packet)
+            await self.send_data_async(tier_packet)
 
         # Emit signal for GUI update
         self.data_received.emit(packet)
@@ -409,7 +576,7 @@ class DataFlowManager(QObject):
                         },
                         priority=1
                     )
-                    self.send_data(tier_packet)
+                    await self.send_data_async(tier_packet)
 
                 elif result.get('bonus_uses'):
                     usage_packet = self.create_packet(
@@ -421,7 +588,7 @@ class DataFlowManager(QObject):
                             'promo_code': promo_code
                         }
                     )
-                    self.send_data(usage_packet)
+                    await self.send_data_async(usage_packet)
 
         # Emit signal for GUI update
         self.data_received.emit(packet)
@@ -447,7 +614,7 @@ class DataFlowManager(QObject):
                     'tier': new_tier
                 }
             )
-            self.send_data(avatar_packet)
+            await self.send_data_async(avatar_packet)
 
         # Emit signal for GUI update
         self.data_received.emit(packet)
@@ -463,8 +630,8 @@ class DataFlowManager(QObject):
             # This would update user's bonus usage counter
             pass
         else:
-            # Regular usage increment
-            await self.supabase_client.increment_usage_count(user_id)
+            # Regular usage increment - a project analysis or a folded update carries several uses
+            await self.supabase_client.increment_usage_count(user_id, usage_data.get('count', 1))
 
         # Check usage limits
         limits_check = await self.supabase_client.check_usage_limits(user_id)
@@ -481,7 +648,7 @@ class DataFlowManager(QObject):
                 },
                 priority=1
             )
-            self.send_data(limit_packet)
+            await self.send_data_async(limit_packet)
 
         # Emit signal for GUI update
         self.data_received.emit(packet)
@@ -505,6 +672,20 @@ class DataFlowManager(QObject):
         # Emit signal for system updates
         self.status_updated.emit(f"System event: {event_type}")
 
+    async def handle_project_progress(self, packet: DataPacket):
+        """Handle project batch progress - the consolidated report is stored"""
+        progress_data = packet.data
+
+        if progress_data.get('event') == 'completed':
+            await self.supabase_client.log_invocation(
+                user_id=progress_data.get('user_id'),
+                action_type="project_analysis",
+                result=progress_data['report']
+            )
+
+        # Emit signal for GUI progress display
+        self.data_received.emit(packet)
+
     async def handle_error_event(self, packet: DataPacket):
         """Handle error events"""
         error_data = packet.data
@@ -527,7 +708,7 @@ class DataFlowManager(QObject):
 
     # Utility methods for external access
 
-    def send_user_action(self, user_id: str, action_type: str, action_data: Dict[str, Any]):
+    def send_user_action(self, user_id: str, action_type: str, action_data: Dict[str, Any]) -> bool:
         """Convenient method to send user actions"""
         packet = self.create_packet(
             flow_type=DataFlowType.USER_ACTION,
@@ -538,9 +719,9 @@ class DataFlowManager(QObject):
                 **action_data
             }
         )
-        self.send_data(packet)
+        return self.send_data(packet)
 
-    def send_payment_event(self, user_id: str, payment_data: Dict[str, Any]):
+    def send_payment_event(self, user_id: str, payment_data: Dict[str, Any]) -> bool:
         """Convenient method to send payment events"""
         packet = self.create_packet(
             flow_type=DataFlowType.PAYMENT_EVENT,
@@ -551,9 +732,9 @@ class DataFlowManager(QObject):
             },
             priority=1  # High priority for payments
         )
-        self.send_data(packet)
+        return self.send_data(packet)
 
-    def send_promo_event(self, user_id: str, promo_data: Dict[str, Any]):
+    def send_promo_event(self, user_id: str, promo_data: Dict[str, Any]) -> bool:
         """Convenient method to send promo events"""
         packet = self.create_packet(
             flow_type=DataFlowType.PROMO_EVENT,
@@ -563,7 +744,7 @@ class DataFlowManager(QObject):
                 **promo_data
             }
         )
-        self.send_data(packet)
+        return self.send_data(packet)
 
     def get_metrics(self) -> Dict[str, Any]:
         """Get current performance metrics"""
@@ -571,25 +752,46 @@ class DataFlowManager(QObject):
             **self.metrics,
             'active_flows': len(self.active_flows),
             'queue_sizes': {
-                'critical': self.critical_queue.qsize(),
-                'high': self.high_queue.qsize(),
-                'normal': self.normal_queue.qsize()
-            }
+                name: self.scheduler.qsize(priority) for priority, name in self.PRIORITY_NAMES.items()
+            },
+            'flow_control': dict(self.flow_control),
+            'scheduler': self.scheduler.get_metrics(),
+            'workers': self.worker_pool.get_metrics() if self.worker_pool else {},
+            'engine': self.hybrid_engine.get_metrics()
         }
 
 # Global instance for system-wide access
 data_flow_manager = DataFlowManager()
 
 # Convenience functions for common operations
-def send_code_analysis(user_id: str, code_content: str, task_type: str, file_extension: str = '.py'):
-    """Send code for analysis through the data flow system"""
+def send_code_analysis(user_id: str, code_content: str, task_type: str, file_extension: str = '.py',
+                       stream: bool = False, filename: Optional[str] = None):
+    """Send code for analysis through the data flow system
+
+    ``filename`` lets the engine track revisions of the scroll, so a
+    re-upload only re-analyses what changed.
+    """
     data_flow_manager.send_user_action(
         user_id=user_id,
         action_type='code_analysis',
         action_data={
             'code_content': code_content,
             'task_type': task_type,
-            'file_extension': file_extension
+            'file_extension': file_extension,
+            'stream': stream,
+            'filename': filename
+        }
+    )
+
+def send_project_analysis(user_id: str, project_path: str, task_type: str, tier: str = 'Bronze'):
+    """Send a directory or archive for batch analysis through the data flow system"""
+    data_flow_manager.send_user_action(
+        user_id=user_id,
+        action_type='project_analysis',
+        action_data={
+            'project_path': str(project_path),
+            'task_type': task_type,
+            'tier': tier
         }
     )
 
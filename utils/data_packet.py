@@ -0,0 +1,117 @@
+"""
+🔱 Data Packet - Sacred Message Envelope
+The packet every module sends through the data flow, and which of its fields are sealed
+
+Packets are never encrypted while they stay in this process - handlers read
+them as created. Sensitive fields are sealed only when a packet leaves it
+(stored, logged to the database or sent over the wire), via ``seal()``, and
+``from_sealed()`` restores such a packet on the way back in.
+"""
+
+import uuid
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Any, FrozenSet, List, Optional
+
+from ..utils.encryption import sacred_encryption
+
+class DataFlowType(Enum):
+    """Types of data flowing through the system"""
+    USER_ACTION = "user_action"
+    ML_RESULT = "ml_result"
+    PAYMENT_EVENT = "payment_event"
+    PROMO_EVENT = "promo_event"
+    TIER_UPDATE = "tier_update"
+    USAGE_UPDATE = "usage_update"
+    SYSTEM_EVENT = "system_event"
+    ERROR_EVENT = "error_event"
+    PROJECT_PROGRESS = "project_progress"
+
+# Credentials and personal data - sealed whichever flow carries them
+COMMON_SENSITIVE_FIELDS = frozenset({
+    'email', 'password', 'api_key', 'personal_info', 'financial_data', 'user_data'
+})
+
+# 🗝️ Top-level keys each flow type seals at a boundary, on top of the common
+# ones. Anything not listed - code scrolls, analysis results, progress
+# events - stays in the clear, so classifying a packet costs one set lookup
+# per key.
+SENSITIVE_FIELDS: Dict[DataFlowType, FrozenSet[str]] = {
+    DataFlowType.USER_ACTION: COMMON_SENSITIVE_FIELDS,
+    DataFlowType.ML_RESULT: COMMON_SENSITIVE_FIELDS,
+    DataFlowType.PAYMENT_EVENT: COMMON_SENSITIVE_FIELDS | {
+        'payment', 'payment_id', 'transaction', 'transaction_id', 'amount', 'currency',
+        'payer_email', 'approval_url'
+    },
+    DataFlowType.PROMO_EVENT: COMMON_SENSITIVE_FIELDS,
+    DataFlowType.TIER_UPDATE: COMMON_SENSITIVE_FIELDS | {'transaction_id'},
+    DataFlowType.USAGE_UPDATE: COMMON_SENSITIVE_FIELDS,
+    DataFlowType.SYSTEM_EVENT: COMMON_SENSITIVE_FIELDS,
+    DataFlowType.ERROR_EVENT: COMMON_SENSITIVE_FIELDS,
+    DataFlowType.PROJECT_PROGRESS: COMMON_SENSITIVE_FIELDS,
+}
+
+@dataclass
+class DataPacket:
+    """Universal data packet for inter-module communication"""
+    packet_id: str
+    flow_type: DataFlowType
+    source_module: str
+    target_module: Optional[str]
+    data: Dict[str, Any]
+    timestamp: str
+    encrypted: bool = False  # Only ever True in seal() output
+    priority: int = 0  # 0=normal, 1=high, 2=critical
+
+    @classmethod
+    def create(cls, flow_type: DataFlowType, source_module: str, data: Dict[str, Any],
+               target_module: Optional[str] = None, priority: int = 0) -> "DataPacket":
+        """New in-memory packet with a unique ID - nothing is encrypted"""
+        return cls(
+            packet_id=str(uuid.uuid4()),
+            flow_type=flow_type,
+            source_module=source_module,
+            target_module=target_module,
+            data=data,
+            timestamp=datetime.utcnow().isoformat(),
+            priority=priority
+        )
+
+    def seal(self) -> Dict[str, Any]:
+        """
+        🔐 The packet as it may leave the process
+
+        A plain dict (flow type by value) whose sensitive fields are moved
+        into one encrypted_payload; the packet itself is left untouched.
+        """
+        sealed = self.to_dict()
+        sealed['flow_type'] = self.flow_type.value
+        fields = self.sensitive_fields()
+        if fields:
+            data = {key: value for key, value in self.data.items() if key not in fields}
+            data["encrypted_payload"] = sacred_encryption.encrypt_data({key: self.data[key] for key in fields})
+            sealed['data'] = data
+            sealed['encrypted'] = True
+        return sealed
+
+    @classmethod
+    def from_sealed(cls, sealed: Dict[str, Any]) -> "DataPacket":
+        """🔓 Rebuild an in-memory packet from ``seal()`` output"""
+        data = dict(sealed['data'])
+        if sealed.get('encrypted') and "encrypted_payload" in data:
+            data.update(sacred_encryption.decrypt_data(data.pop("encrypted_payload")))
+        return cls(**{**sealed, 'flow_type': DataFlowType(sealed['flow_type']), 'data': data, 'encrypted': False})
+
+    def sensitive_fields(self) -> List[str]:
+        """Keys of this packet's data that its flow type's schema marks sensitive"""
+        schema = SENSITIVE_FIELDS.get(self.flow_type, COMMON_SENSITIVE_FIELDS)
+        return [key for key in self.data if key in schema]
+
+    def contains_sensitive_data(self) -> bool:
+        """Check if packet contains sensitive information"""
+        return bool(self.sensitive_fields())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization"""
+        return asdict(self)
@@ -0,0 +1,312 @@
+"""
+🔱 Packet Scheduler - Sacred Weighted-Fair Dispatch
+One queue for every priority class, drained by a pool of event-loop workers
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+def _percentile(values, fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+class PacketScheduler:
+    """
+    ⚖️ Weighted-fair queue across priority classes
+
+    Classes are served by stride scheduling: each dequeue advances the
+    chosen class's pass by 1/weight and the lowest pass goes next, so with
+    every class backlogged a weight-8 class gets eight turns for each turn
+    of a weight-1 class, and an idle class's share goes to the busy ones. A
+    class that was idle rejoins at the current virtual time rather than
+    with credit saved up. Within a class packets leave in send order
+    (sequence number).
+
+    Aging is a bounded boost: a head that has waited ``aging_seconds`` or
+    more jumps the stride order, but at most once in every
+    ``aging_interval`` dequeues. Under overload every head is old, and
+    unbounded aging would turn the scheduler into one global FIFO; bounded,
+    the oldest work gets at most 1/``aging_interval`` of the dequeues on top
+    of its weighted share, and the weights keep ordering the rest.
+
+    A class with a capacity refuses a bounded ``put`` once that many items
+    are queued - unbounded puts always get in, and count towards the depth
+    the bounded ones see. ``shed`` and ``fold`` let the caller make room by
+    dropping or merging queued items.
+
+    Thread-safe, and nothing blocks: an empty ``get`` registers the
+    caller's waker for the next ``put``, and a refused ``put`` registers it
+    for the next ``get`` from that class.
+    """
+
+    WAIT_SAMPLES = 1024
+
+    def __init__(self, weights: Dict[int, float], aging_seconds: float,
+                 names: Optional[Dict[int, str]] = None, capacities: Optional[Dict[int, int]] = None,
+                 aging_interval: int = 4):
+        if not weights:
+            raise ValueError("At least one priority class is required")
+        self.weights = {priority: max(float(weight), 1e-6) for priority, weight in weights.items()}
+        self.priorities = sorted(self.weights, reverse=True)
+        self.aging_seconds = aging_seconds
+        self.aging_interval = max(1, aging_interval)
+        self.names = {priority: (names or {}).get(priority, str(priority)) for priority in self.priorities}
+        self.capacities = {priority: (capacities or {}).get(priority, 0) for priority in self.priorities}  # 0 = unbounded
+
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._queues: Dict[int, deque] = {priority: deque() for priority in self.priorities}
+        self._pass: Dict[int, float] = {priority: 0.0 for priority in self.priorities}
+        self._virtual_time = 0.0
+        self._since_aged = self.aging_interval  # Dequeues since the last aged one
+        self._wakers: "OrderedDict[Callable[[], None], None]" = OrderedDict()
+        self._space_wakers: Dict[int, "OrderedDict[Callable[[], None], None]"] = {
+            priority: OrderedDict() for priority in self.priorities
+        }
+
+        self._stats = {
+            priority: {'enqueued': 0, 'dequeued': 0, 'aged': 0, 'max_depth': 0,
+                       'refused': 0, 'shed': 0, 'folded': 0}
+            for priority in self.priorities
+        }
+        self._waits: Dict[int, deque] = {
+            priority: deque(maxlen=self.WAIT_SAMPLES) for priority in self.priorities
+        }
+
+    def priority_class(self, priority: int) -> int:
+        """The configured class a packet priority falls in - unknown values go to the nearest class below"""
+        lower = [known for known in self.priorities if known <= priority]
+        return lower[0] if lower else self.priorities[-1]
+
+    def put(self, item: Any, priority: int = 0, waker: Optional[Callable[[], None]] = None,
+            bounded: bool = True) -> bool:
+        """
+        Queue ``item`` and wake one idle worker
+
+        Returns False when ``bounded`` and the class is at capacity; with a
+        ``waker``, the refusal also registers it to be called when a slot
+        frees up.
+        """
+        priority = self.priority_class(priority)
+        with self._lock:
+            entries = self._queues[priority]
+            capacity = self.capacities[priority]
+            if bounded and capacity and len(entries) >= capacity:
+                self._stats[priority]['refused'] += 1
+                if waker is not None:
+                    self._space_wakers[priority][waker] = None
+                return False
+
+            if not entries:
+                self._pass[priority] = max(self._pass[priority], self._virtual_time)
+            entries.append((next(self._sequence), time.monotonic(), item))
+
+            stats = self._stats[priority]
+            stats['enqueued'] += 1
+            stats['max_depth'] = max(stats['max_depth'], len(entries))
+
+            waker = self._wakers.popitem(last=False)[0] if self._wakers else None
+
+        if waker is not None:
+            waker()
+        return True
+
+    def get(self, waker: Optional[Callable[[], None]] = None) -> Optional[Any]:
+        """
+        Next item by weight, (bounded) age and sequence, or None when nothing is queued
+
+        With a ``waker``, an empty queue registers it (once) to be called by
+        the next ``put`` - checked and registered under one lock, so a packet
+        sent in between cannot be missed.
+        """
+        with self._lock:
+            backlogged = [priority for priority in self.priorities if self._queues[priority]]
+            if not backlogged:
+                if waker is not None:
+                    self._wakers[waker] = None
+                return None
+
+            now = time.monotonic()
+            aged = []
+            if self._since_aged >= self.aging_interval:
+                aged = [priority for priority in backlogged
+                        if now - self._queues[priority][0][1] >= self.aging_seconds]
+            if aged:
+                priority = min(aged, key=lambda known: self._queues[known][0][0])
+                self._stats[priority]['aged'] += 1
+                self._since_aged = 1
+            else:
+                self._since_aged += 1
+                # Lowest pass goes next; the higher priority wins a tie
+                priority = min(backlogged, key=lambda known: (self._pass[known], -known))
+
+            sequence, enqueued_at, item = self._queues[priority].popleft()
+            self._virtual_time = max(self._virtual_time, self._pass[priority])
+            self._pass[priority] += 1.0 / self.weights[priority]
+
+            self._stats[priority]['dequeued'] += 1
+            self._waits[priority].append((now - enqueued_at) * 1000)
+
+            space_wakers = self._space_wakers[priority]
+            space_waker = space_wakers.popitem(last=False)[0] if space_wakers else None
+
+        if space_waker is not None:
+            space_waker()
+        return item
+
+    def forget(self, waker: Callable[[], None]):
+        """Drop a waker its owner no longer waits on, so a wake-up is not wasted on it"""
+        with self._lock:
+            self._wakers.pop(waker, None)
+            for space_wakers in self._space_wakers.values():
+                space_wakers.pop(waker, None)
+
+    def shed(self, priority: int, match: Callable[[Any], bool]) -> Optional[Any]:
+        """Remove and return the oldest queued item of a class that ``match`` accepts"""
+        priority = self.priority_class(priority)
+        with self._lock:
+            entries = self._queues[priority]
+            for index, (sequence, enqueued_at, item) in enumerate(entries):
+                if match(item):
+                    del entries[index]
+                    self._stats[priority]['shed'] += 1
+                    return item
+            return None
+
+    def fold(self, item: Any, priority: int, match: Callable[[Any], bool],
+             merge: Callable[[Any, Any], None]) -> bool:
+        """
+        Merge ``item`` into the newest queued item of its class that ``match``
+        accepts, instead of queueing it - False when there is none
+        """
+        priority = self.priority_class(priority)
+        with self._lock:
+            for sequence, enqueued_at, queued in reversed(self._queues[priority]):
+                if match(queued):
+                    merge(queued, item)
+                    self._stats[priority]['folded'] += 1
+                    return True
+            return False
+
+    def at_capacity(self, priority: int) -> bool:
+        """Whether a bounded put to this class would be refused right now"""
+        priority = self.priority_class(priority)
+        with self._lock:
+            capacity = self.capacities[priority]
+            return bool(capacity) and len(self._queues[priority]) >= capacity
+
+    def qsize(self, priority: Optional[int] = None) -> int:
+        """Queued items in one class, or in all of them"""
+        with self._lock:
+            if priority is not None:
+                return len(self._queues[self.priority_class(priority)])
+            return sum(len(entries) for entries in self._queues.values())
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Depth, throughput and queue wait per priority class"""
+        with self._lock:
+            metrics = {}
+            for priority in self.priorities:
+                waits = list(self._waits[priority])
+                metrics[self.names[priority]] = {
+                    **self._stats[priority],
+                    'depth': len(self._queues[priority]),
+                    'capacity': self.capacities[priority],
+                    'weight': self.weights[priority],
+                    'wait_p50_ms': _percentile(waits, 0.5),
+                    'wait_p95_ms': _percentile(waits, 0.95),
+                    'wait_max_ms': max(waits) if waits else None
+                }
+            return metrics
+
+class PacketWorkerPool:
+    """
+    🧵 Worker threads draining a PacketScheduler
+
+    Each thread owns one event loop for its whole life and runs up to
+    ``concurrency`` items at once as tasks, so items waiting on the network
+    do not hold up the rest of the queue. An idle worker sleeps on an
+    asyncio.Event that the scheduler's ``put`` sets from whichever thread
+    sent the item.
+    """
+
+    def __init__(self, scheduler: PacketScheduler, handler: Callable[[Any], Awaitable[Any]],
+                 workers: int, concurrency: int, name: str = "packet-worker"):
+        self.scheduler = scheduler
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.concurrency = max(1, concurrency)
+        self.name = name
+        self.logger = logging.getLogger(__name__)
+
+        self.threads = []
+        self.metrics: Dict[str, Dict[str, int]] = {}
+
+    def start(self):
+        """Start the worker threads"""
+        for index in range(self.workers):
+            worker_name = f"{self.name}-{index}"
+            thread = threading.Thread(target=self._run, args=(worker_name,), name=worker_name, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def _run(self, worker_name: str):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._serve(worker_name))
+        finally:
+            loop.close()
+
+    async def _serve(self, worker_name: str):
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+
+        def waker():
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:
+                pass  # Loop closed at shutdown
+
+        slots = asyncio.Semaphore(self.concurrency)
+        running = set()
+        counters = self.metrics.setdefault(worker_name, {'in_flight': 0, 'peak_in_flight': 0, 'processed': 0})
+
+        while True:
+            await slots.acquire()
+            while True:
+                # Cleared before asking, so a put that lands in between still wakes us
+                wake.clear()
+                item = self.scheduler.get(waker)
+                if item is not None:
+                    break
+                await wake.wait()
+
+            counters['in_flight'] += 1
+            counters['peak_in_flight'] = max(counters['peak_in_flight'], counters['in_flight'])
+            task = loop.create_task(self._handle(item, worker_name, slots))
+            running.add(task)
+            task.add_done_callback(running.discard)
+
+    async def _handle(self, item: Any, worker_name: str, slots: asyncio.Semaphore):
+        """Run the handler on one item and give its slot back"""
+        counters = self.metrics[worker_name]
+        try:
+            await self.handler(item)
+        except Exception as e:
+            self.logger.error(f"💀 Worker error ({worker_name}): {e}")
+        finally:
+            counters['in_flight'] -= 1
+            counters['processed'] += 1
+            slots.release()
+
+    def get_metrics(self) -> Dict[str, Dict[str, int]]:
+        """In-flight, peak and processed counts per worker"""
+        return {worker_name: dict(counters) for worker_name, counters in self.metrics.items()}